@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 
@@ -8,18 +9,50 @@ from fastapi import FastAPI  # noqa: E402
 from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
 from .routers import api_router  # noqa: E402
 from .database import Base, engine  # noqa: E402
+from .services.classification import (  # noqa: E402
+    close_classification_pool,
+    get_classification_pool,
+    preload_predictors,
+)
+from .services.classification_jobs import get_job_runner  # noqa: E402
 
 _raw = os.environ.get("CORS_ORIGINS")
 if not _raw:
     raise RuntimeError("CORS_ORIGINS env var is required. See .env.example for format.")
 CORS_ORIGINS = [o.strip() for o in _raw.split(",")]
 
+# Preload before fork: models named in PRELOAD_MODELS are loaded while this
+# module is imported, i.e. once in the parent of a pre-forking server. No
+# prediction runs here, so numba's threads only start in the workers.
+preload_predictors(
+    [
+        name.strip()
+        for name in os.environ.get("PRELOAD_MODELS", "").split(",")
+        if name.strip()
+    ]
+)
 
-app = FastAPI()
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Classification jobs interrupted by a restart continue from their last
+    # stored batch once their lease expires; on shutdown they stop after the
+    # current one. The runner (and numba's threads) start here, not on import.
+    job_runner = get_job_runner()
+    job_runner.resume(engine)
+    # Start classification worker processes (if configured) before requests.
+    get_classification_pool()
+    yield
+    job_runner.stop()
+    close_classification_pool()
+
+
+app = FastAPI(lifespan=lifespan)
+
 # Include routers
 app.include_router(api_router)
 
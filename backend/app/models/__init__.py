@@ -1,3 +1,4 @@
 from .user import User  # noqa: F401
 from .classification import Classification  # noqa: F401
 from .refresh_token import RefreshToken  # noqa: F401
+from .classification_job import ClassificationJob, ClassificationJobResult  # noqa: F401
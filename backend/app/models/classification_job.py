@@ -0,0 +1,63 @@
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    func,
+)
+from ..database import Base
+from ..utils.sql_type_decorator import PydanticJSONType
+from ..schemas.classification import ModelConfig, SequenceResult
+
+
+class ClassificationJob(Base):
+    __tablename__ = "classification_jobs"
+
+    id = Column(String(36), primary_key=True)
+    # queued -> running -> completed | failed
+    status = Column(String(16), nullable=False, default="queued", index=True)
+    source = Column(String(255), nullable=False)
+    config = Column(PydanticJSONType(ModelConfig), nullable=False)
+    # [[sequence_id, sequence], ...] in submission order
+    sequences = Column(JSON, nullable=False)
+    total_sequences = Column(Integer, nullable=False)
+    # Sequences whose results are stored; the next batch starts here.
+    completed_sequences = Column(Integer, nullable=False, default=0)
+    processing_time = Column(Float, nullable=False, default=0.0)
+    error = Column(Text, nullable=True)
+    # Worker holding the job's lease, and when it last renewed it. A job
+    # whose heartbeat is older than the lease may be claimed by another.
+    owner = Column(String(64), nullable=True, index=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return (
+            f"<ClassificationJob id={self.id} status={self.status} "
+            f"progress={self.completed_sequences}/{self.total_sequences}>"
+        )
+
+
+class ClassificationJobResult(Base):
+    __tablename__ = "classification_job_results"
+
+    job_id = Column(
+        String(36),
+        ForeignKey("classification_jobs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    position = Column(Integer, primary_key=True)
+    prediction = Column(String(16), nullable=False)
+    result = Column(PydanticJSONType(SequenceResult), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<ClassificationJobResult job_id={self.job_id} position={self.position}>"
+        )
@@ -1,12 +1,35 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from itertools import chain
+from typing import Iterator, Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from data_processing.parsers import iter_sequence_records
+
 # Import models and logic
 from ..database import get_db
-from ..services.classification import run_classification
+from ..services.classification import (
+    STREAM_MEDIA_TYPES,
+    run_classification,
+    stream_classification,
+)
+from ..services.classification_jobs import get_job_page, get_job_runner
 from ..schemas.classification import (
     ModelConfig,
+    ClassificationJobPage,
+    ClassificationJobSubmitted,
     ClassificationRequest,
     ClassificationResponse,
     SequenceResult,
@@ -33,6 +56,117 @@ def classify(request: ClassificationRequest) -> ClassificationResponse:
     return run_classification(request.sequences, config, source)
 
 
+@router.post("/classify/stream")
+def classify_stream(
+    request: ClassificationRequest,
+    format: Literal["ndjson", "sse"] = Query("ndjson"),
+) -> StreamingResponse:
+    """Stream each SequenceResult as NDJSON lines or server-sent events as
+    soon as its batch is classified, then a summary with the counts."""
+    if not request.sequences:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST, detail="No sequences provided."
+        )
+
+    config = request.config or ModelConfig()
+    source = request.source or f"{len(request.sequences)}_sequences"
+    pairs = ((seq.id, seq.sequence) for seq in request.sequences)
+
+    return StreamingResponse(
+        stream_classification(pairs, config, source, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+    )
+
+
+# Bytes read from an uploaded file at a time.
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+def _iter_upload(file: UploadFile) -> Iterator[bytes]:
+    while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+@router.post("/classify/upload")
+def classify_upload(
+    file: UploadFile = File(...),
+    config: Optional[str] = Form(None),
+    source: Optional[str] = Form(None),
+    format: Literal["ndjson", "sse"] = Query("ndjson"),
+) -> StreamingResponse:
+    """Classify a FASTA/FASTQ file (optionally gzipped) and stream the
+    results like ``/classify/stream``. ``config`` is a ModelConfig as JSON.
+
+    The file is read in chunks and parsed record by record while batches
+    are classified, so memory grows with the batch size, not the file."""
+    try:
+        model_config = (
+            ModelConfig.model_validate_json(config) if config else ModelConfig()
+        )
+    except ValidationError as exc:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail=exc.errors(include_url=False, include_context=False),
+        ) from exc
+
+    records = iter_sequence_records(_iter_upload(file))
+    try:
+        first = next(records, None)
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if first is None:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST, detail="No sequences provided."
+        )
+
+    return StreamingResponse(
+        stream_classification(
+            chain([first], records),
+            model_config,
+            source or file.filename or "upload",
+            format,
+        ),
+        media_type=STREAM_MEDIA_TYPES[format],
+    )
+
+
+@router.post(
+    "/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ClassificationJobSubmitted,
+)
+def submit_classification_job(
+    request: ClassificationRequest, db: Session = Depends(get_db)
+) -> ClassificationJobSubmitted:
+    """Queue the sequences for background classification; poll the job for
+    progress and results."""
+    if not request.sequences:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST, detail="No sequences provided."
+        )
+
+    config = request.config or ModelConfig()
+    source = request.source or f"{len(request.sequences)}_sequences"
+    job = get_job_runner().submit(db, request.sequences, config, source)
+
+    return ClassificationJobSubmitted(
+        job_id=job.id, status=job.status, total_sequences=job.total_sequences
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=ClassificationJobPage)
+def get_classification_job(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+) -> ClassificationJobPage:
+    page = get_job_page(db, job_id, offset, limit)
+    if page is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    return page
+
+
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def save_classification(
     payload: SequenceResult,
@@ -3,18 +3,36 @@ from typing import Dict, Any
 
 # Import the predictor function relevant to this router
 # Note: In a real app, 'get_predictor' might live in a shared 'services' file
-from ..services.classification import get_predictor
+from ..services.classification import (
+    cascade_counters,
+    prediction_cache,
+    reload_predictors,
+)
 
 router = APIRouter(prefix="/system", tags=["System"])
 
 
 @router.post("/reload_models")
 def reload_models() -> Dict[str, str]:
-    """Clear model cache to reload updated models."""
-    get_predictor.cache_clear()
+    """Clear model and prediction caches to reload updated models."""
+    reload_predictors()
     return {"status": "model cache cleared"}
 
 
+@router.get("/prediction_cache")
+def prediction_cache_stats() -> Dict[str, Any]:
+    """Size and hit/miss counters of the prediction cache."""
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+
+@router.get("/cascade")
+def cascade_stats() -> Dict[str, Any]:
+    """Sequences scored and decided per stage of the model cascade."""
+    return cascade_counters.stats()
+
+
 @router.get("/health")
 def health() -> Dict[str, Any]:
     from binary_classifiers.evo2_embedder import check_evo2_requirements
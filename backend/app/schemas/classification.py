@@ -1,4 +1,4 @@
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field, constr
 
 
@@ -8,6 +8,20 @@ class ModelConfig(BaseModel):
     batch_size: int = Field(64, ge=1, le=1024)
     enable_ood: bool = False
     ood_threshold: float = Field(0.99, ge=0.0, le=1.0)
+    # Sliding-window mode: set window_size to also score every window of each
+    # sequence and report viral regions. Stride defaults to half a window.
+    window_size: Optional[int] = Field(None, ge=10)
+    window_stride: Optional[int] = Field(None, ge=1)
+    # Cascade mode: the cheapest model scores every sequence and only those
+    # whose calibrated Virus/Host margin is below cascade_margin move on to
+    # the next, slower stage. Overrides the model picked from ``type``.
+    cascade: bool = False
+    cascade_margin: float = Field(0.3, ge=0.0, le=1.0)
+    # Anytime forest: the RandomForest stops evaluating trees for a sequence
+    # once its label can no longer change or, when set, once its running
+    # confidence reaches forest_confidence.
+    forest_early_stopping: bool = False
+    forest_confidence: Optional[float] = Field(None, gt=0.5, le=1.0)
 
 
 class SequenceInput(BaseModel):
@@ -21,6 +35,21 @@ class ClassificationRequest(BaseModel):
     source: Optional[str] = None
 
 
+class WindowPrediction(BaseModel):
+    start: int
+    end: int
+    virus_probability: float
+    host_probability: float
+
+
+class ViralRegion(BaseModel):
+    start: int
+    end: int
+    window_count: int
+    mean_virus_probability: float
+    max_virus_probability: float
+
+
 class SequenceResult(BaseModel):
     sequence_id: str
     length: int
@@ -36,6 +65,12 @@ class SequenceResult(BaseModel):
     ood_score: Optional[float] = None
     uncertain: Optional[bool] = False
     threshold_used: Optional[float] = None
+    window_predictions: Optional[List[WindowPrediction]] = None
+    viral_regions: Optional[List[ViralRegion]] = None
+    # Model whose probabilities decided the call (the last cascade stage run).
+    decided_by: Optional[str] = None
+    # Trees the RandomForest evaluated with forest_early_stopping.
+    trees_used: Optional[int] = None
 
 
 class ClassificationResponse(BaseModel):
@@ -44,7 +79,47 @@ class ClassificationResponse(BaseModel):
     host_count: int
     novel_count: int
     uncertain_count: int
+    # Sequences decided by each model, keyed by SequenceResult.decided_by.
+    stage_counts: Dict[str, int] = Field(default_factory=dict)
     detailed_results: List[SequenceResult]
     source: str
     timestamp: str
     processing_time: float
+
+
+class ClassificationSummary(BaseModel):
+    """``ClassificationResponse`` without ``detailed_results``; the last event
+    of a streamed classification."""
+
+    total_sequences: int
+    virus_count: int
+    host_count: int
+    novel_count: int
+    uncertain_count: int
+    stage_counts: Dict[str, int] = Field(default_factory=dict)
+    source: str
+    timestamp: str
+    processing_time: float
+
+
+class ClassificationJobSubmitted(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    total_sequences: int
+
+
+class ClassificationJobPage(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    source: str
+    total_sequences: int
+    completed_sequences: int
+    processing_time: float
+    error: Optional[str] = None
+    # Stored results per prediction label, across all pages.
+    prediction_counts: Dict[str, int] = Field(default_factory=dict)
+    offset: int
+    limit: int
+    # Offset of the next page, or None once the stored results are exhausted.
+    next_offset: Optional[int] = None
+    results: List[SequenceResult]
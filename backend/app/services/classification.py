@@ -1,62 +1,351 @@
-import math
+import json
+import os
+import threading
 import time
 from functools import lru_cache
-from typing import Any, Dict, List, Literal
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Sequence,
+    Tuple,
+    cast,
+    get_args,
+)
+
+import numpy as np
 
 # Pydantic/Data models
-from binary_classifiers.predict_class import PredictClass
+from binary_classifiers.ensemble import EnsemblePredictor
+from binary_classifiers.predict_class import (
+    BACKENDS,
+    PRECISIONS,
+    ModelName as PredictorModelName,
+    PredictClass,
+    Prediction,
+)
+from binary_classifiers.prediction_cache import PredictionCache
+from .classification_pool import ClassificationPool
 from ..schemas.classification import (
     ModelConfig,
     SequenceInput,
     SequenceResult,
     ClassificationResponse,
+    ViralRegion,
+    WindowPrediction,
 )
 
 # Helpers
 from ..utils.dna_validation import validate_dna_sequence
 from ..utils.organism_patterns import detect_organism
-from ..utils.create_response import create_classification_response
+from ..utils.create_response import ResultTally, create_classification_response
 
 # Temperature scaling parameter — values < 1.0 sharpen probabilities (reduce
 # under-confidence).  Empirically tuned for the k-mer RandomForest/SVM models
 # which tend to cluster predictions near 0.55–0.65 for ambiguous fragments.
 _TEMPERATURE: float = 0.75
 
+# Every PredictClass model, plus the weighted ensemble of ENSEMBLE_MODELS.
+ModelName = Literal[PredictorModelName, "Ensemble"]
+# Cascade stages, cheapest first. The forest runs on the compiled engine
+# when MODEL_BACKEND=compiled; Evo2 is skipped where its embedder is missing.
+CASCADE_STAGES: Tuple[ModelName, ...] = ("RandomForest", "SVM", "Evo2")
+
+
+def _prediction_cache_from_env() -> PredictionCache | None:
+    """Shared probability cache; PREDICTION_CACHE_SIZE=0 disables it."""
+    size = int(os.environ.get("PREDICTION_CACHE_SIZE", "4096"))
+    ttl = float(os.environ.get("PREDICTION_CACHE_TTL", "3600"))
+    if size <= 0:
+        return None
+    return PredictionCache(max_entries=size, ttl_seconds=ttl if ttl > 0 else None)
+
+
+def _env_choice(name: str, choices: Sequence[str], default: str) -> str:
+    """``name`` from the environment, or ``default`` when unset or empty.
+    Raises RuntimeError for values outside ``choices``."""
+    value = os.environ.get(name, "").strip() or default
+    if value not in choices:
+        raise RuntimeError(
+            f"{name} must be one of {', '.join(choices)}; got '{value}'. "
+            "See .env.example."
+        )
+    return value
+
+
+prediction_cache = _prediction_cache_from_env()
+# Inference engine for PredictClass; "compiled" runs forests on flat arrays
+# with probabilities identical to sklearn. sklearn is the default.
+MODEL_BACKEND = cast(
+    Literal["sklearn", "compiled"], _env_choice("MODEL_BACKEND", BACKENDS, "sklearn")
+)
+# MODEL_PRECISION=float32 serves the compact float32 path (validate it with
+# scripts/validate_precision.py); float64 is the default.
+MODEL_PRECISION = cast(
+    Literal["float64", "float32"],
+    _env_choice("MODEL_PRECISION", PRECISIONS, "float64"),
+)
+
+
+class CascadeCounters:
+    """Thread-safe per-stage tallies of cascade mode.
 
-@lru_cache(maxsize=3)
-def get_predictor(model_name: Literal["RandomForest", "SVM", "Evo2"]) -> PredictClass:
-    return PredictClass(model_name=model_name)
+    ``scored`` counts the sequences each stage computed probabilities for and
+    ``decided`` the ones whose call it made, so the work skipped by the slower
+    stages is ``decided[first stage]`` for every stage after the first.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.scored: Dict[str, int] = {}
+        self.decided: Dict[str, int] = {}
+
+    def record(self, stages: List[str]) -> None:
+        """Count one sequence scored by ``stages`` and decided by the last."""
+        with self._lock:
+            for name in stages:
+                self.scored[name] = self.scored.get(name, 0) + 1
+            self.decided[stages[-1]] = self.decided.get(stages[-1], 0) + 1
+
+    def add(self, scored: Dict[str, int], decided: Dict[str, int]) -> None:
+        """Add counts taken from another process's counters."""
+        with self._lock:
+            for name, count in scored.items():
+                self.scored[name] = self.scored.get(name, 0) + count
+            for name, count in decided.items():
+                self.decided[name] = self.decided.get(name, 0) + count
+
+    def drain(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Return ``(scored, decided)`` and reset them."""
+        with self._lock:
+            counts = (dict(self.scored), dict(self.decided))
+            self.scored.clear()
+            self.decided.clear()
+            return counts
+
+    def clear(self) -> None:
+        with self._lock:
+            self.scored.clear()
+            self.decided.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sequences = sum(self.decided.values())
+            first_stage = self.decided.get(CASCADE_STAGES[0], 0)
+            return {
+                "sequences": sequences,
+                "escalated": sequences - first_stage,
+                "escalation_rate": (
+                    (sequences - first_stage) / sequences if sequences else 0.0
+                ),
+                "stages": {
+                    name: {
+                        "scored": scored,
+                        "decided": self.decided.get(name, 0),
+                    }
+                    for name, scored in self.scored.items()
+                },
+            }
+
+
+cascade_counters = CascadeCounters()
 
 
-def _resolve_model_name(config: ModelConfig) -> Literal["RandomForest", "SVM", "Evo2"]:
+def _env_list(name: str, default: str) -> List[str]:
+    return [
+        value.strip()
+        for value in os.environ.get(name, default).split(",")
+        if value.strip()
+    ]
+
+
+# "Ensemble" averages these models' probabilities (equal weights by default).
+ENSEMBLE_MODELS: List[str] = _env_list("ENSEMBLE_MODELS", "RandomForest,SVM")
+ENSEMBLE_WEIGHTS: List[float] | None = [
+    float(weight) for weight in _env_list("ENSEMBLE_WEIGHTS", "")
+] or None
+
+
+# One entry per servable model, "Ensemble" included.
+@lru_cache(maxsize=len(get_args(ModelName)))
+def get_predictor(model_name: ModelName) -> PredictClass | EnsemblePredictor:
+    if model_name == "Ensemble":
+        # Members are the cached single-model predictors, so they are loaded once.
+        members = [get_predictor(name) for name in ENSEMBLE_MODELS]  # type: ignore[arg-type]
+        return EnsemblePredictor(members, weights=ENSEMBLE_WEIGHTS)  # type: ignore[arg-type]
+    return PredictClass(
+        model_name=model_name,
+        cache=prediction_cache,
+        backend=MODEL_BACKEND,
+        precision=MODEL_PRECISION,
+    )
+
+
+def preload_predictors(model_names: List[str], warm_up: bool = False) -> None:
+    """Load ``model_names``; with ``warm_up``, also run one prediction through
+    each.
+
+    Called at import time by ``app.main`` so a pre-forking server (e.g.
+    ``gunicorn --preload``) loads models once in the parent; workers inherit
+    them, and memory-mapped bundle arrays stay shared through the page cache.
+    There it must not warm up: a prediction starts numba's threads, and under
+    the GNU OpenMP layer a child forked after that aborts.
+    """
+    for name in model_names:
+        if name not in get_args(ModelName):
+            raise ValueError(f"Unknown model '{name}' in PRELOAD_MODELS")
+        predictor = get_predictor(name)  # type: ignore[arg-type]
+        if warm_up:
+            predictor.batch_predict(["ACGT" * 8])
+
+
+# CLASSIFICATION_PROCESSES > 0 classifies in that many worker processes,
+# which preload PRELOAD_MODELS; 0 (the default) classifies in-process.
+CLASSIFICATION_PROCESSES = int(os.environ.get("CLASSIFICATION_PROCESSES", "0"))
+
+
+@lru_cache(maxsize=1)
+def get_classification_pool() -> ClassificationPool | None:
+    if CLASSIFICATION_PROCESSES <= 0:
+        return None
+    return ClassificationPool(
+        CLASSIFICATION_PROCESSES, preload=_env_list("PRELOAD_MODELS", "")
+    )
+
+
+def close_classification_pool(drain: bool = False) -> None:
+    """Stop the worker processes, if started; the next request restarts them.
+
+    With ``drain``, requests already using the pool finish on it first;
+    otherwise its queued batches are cancelled.
+    """
+    if get_classification_pool.cache_info().currsize:
+        pool = get_classification_pool()
+        get_classification_pool.cache_clear()
+        if pool is None:
+            return
+        if drain:
+            pool.retire()
+        else:
+            pool.close()
+
+
+def reload_predictors() -> None:
+    """Drop loaded models and every cached prediction made with them."""
+    get_predictor.cache_clear()
+    if prediction_cache is not None:
+        prediction_cache.clear()
+    # Workers hold their own copies of the models: swap in a new pool and
+    # let the old one drain.
+    close_classification_pool(drain=True)
+    get_classification_pool()
+
+
+def _resolve_model_name(config: ModelConfig) -> ModelName:
     model_hint = config.type.lower()
+    if "ensemble" in model_hint:
+        return "Ensemble"
     if "evo" in model_hint:
         return "Evo2"
     if "random forest" in model_hint or "random_forest" in model_hint:
         return "RandomForest"
+    if "student" in model_hint or "distill" in model_hint:
+        return "Student"
+    if "bayes" in model_hint:
+        return "NaiveBayes"
+    if "approx" in model_hint or "nystroem" in model_hint:
+        return "ApproxSVM"
     if "svm" in model_hint:
-        return "SVM"
+        return "FastSVM" if "fast" in model_hint else "SVM"
     return "RandomForest"
 
 
+def _cascade_stages() -> List[ModelName]:
+    """``CASCADE_STAGES`` that load their own model; an Evo2 predictor without
+    its embedder falls back to the forest and is dropped."""
+    return [name for name in CASCADE_STAGES if get_predictor(name).model_name == name]
+
+
+def _predict_batch(
+    predictor: PredictClass | EnsemblePredictor,
+    sequences: List[str],
+    config: ModelConfig,
+) -> List[Prediction]:
+    """Score ``sequences`` with one featurisation and one model call, with
+    anytime tree evaluation for the forest when
+    ``config.forest_early_stopping`` is set."""
+    if (
+        config.forest_early_stopping
+        and isinstance(predictor, PredictClass)
+        and predictor.model_name == "RandomForest"
+    ):
+        return predictor.batch_predict_anytime(
+            sequences, confidence=config.forest_confidence
+        )
+    return predictor.batch_predict_with_probabilities(sequences)
+
+
+def _cascade_predict_batch(
+    sequences: List[str], config: ModelConfig
+) -> List[Tuple[PredictClass | EnsemblePredictor, Prediction]]:
+    """Score ``sequences`` stage by stage. A sequence leaves the cascade once
+    the temperature-scaled margin between Virus and Host reaches
+    ``config.cascade_margin``; the last stage run decides. Each stage scores
+    all sequences still pending in one batch. Returns the deciding predictor
+    and prediction of every sequence."""
+    decided: List[Tuple[PredictClass | EnsemblePredictor, Prediction] | None] = [
+        None
+    ] * len(sequences)
+    stages: List[List[str]] = [[] for _ in sequences]
+    pending = list(range(len(sequences)))
+    for name in _cascade_stages():
+        if not pending:
+            break
+        predictor = get_predictor(name)
+        predictions = _predict_batch(
+            predictor, [sequences[index] for index in pending], config
+        )
+        calibrated_batch = _apply_temperature_scaling(
+            [prediction.probabilities for prediction in predictions]
+        )
+        still_pending = []
+        for index, prediction, calibrated in zip(
+            pending, predictions, calibrated_batch
+        ):
+            stages[index].append(name)
+            decided[index] = (predictor, prediction)
+            if abs(calibrated["Virus"] - calibrated["Host"]) < config.cascade_margin:
+                still_pending.append(index)
+        pending = still_pending
+    for sequence_stages in stages:
+        cascade_counters.record(sequence_stages)
+    return [result for result in decided if result is not None]
+
+
 def _apply_temperature_scaling(
-    prob_map: Dict[Literal["Host", "Virus"], float],
+    prob_maps: Sequence[Dict[Literal["Host", "Virus"], float]],
     temperature: float = _TEMPERATURE,
-) -> Dict[Literal["Host", "Virus"], float]:
-    """Binary temperature scaling: rescale log-odds then re-normalise.
+) -> List[Dict[Literal["Host", "Virus"], float]]:
+    """Binary temperature scaling of a batch: rescale log-odds then re-normalise.
 
     For two-class problems this is equivalent to the full softmax formulation
-    but avoids log(0) by clamping probabilities away from the boundary.
+    but avoids log(0) by clamping probabilities away from the boundary. The
+    whole batch is scaled with one set of array operations.
     """
     eps = 1e-9
-    log_host = math.log(max(prob_map["Host"], eps)) / temperature
-    log_virus = math.log(max(prob_map["Virus"], eps)) / temperature
+    probs = np.array(
+        [[prob_map["Host"], prob_map["Virus"]] for prob_map in prob_maps],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    logits = np.log(np.maximum(probs, eps)) / temperature
     # Numerically stable softmax
-    max_log = max(log_host, log_virus)
-    exp_host = math.exp(log_host - max_log)
-    exp_virus = math.exp(log_virus - max_log)
-    total = exp_host + exp_virus
-    return {"Host": exp_host / total, "Virus": exp_virus / total}
+    scaled = np.exp(logits - logits.max(axis=1, keepdims=True))
+    scaled /= scaled.sum(axis=1, keepdims=True)
+    return [{"Host": host, "Virus": virus} for host, virus in scaled.tolist()]
 
 
 def _dynamic_threshold(
@@ -118,39 +407,96 @@ def _is_high_complexity_host(
     return gc_content >= 0.58 and length >= 60 and margin < 0.15
 
 
-def classify_sequence(
-    seq_id: str, sequence: str, config: ModelConfig
-) -> SequenceResult:
-    is_valid, error_msg = validate_dna_sequence(sequence, seq_id)
-    print(f"[DEBUG] Validating sequence {seq_id}: valid={is_valid}, error={error_msg}")
-    print(f"[DEBUG] Sequence preview: {sequence[:50] if sequence else 'empty'}")
-    if not is_valid:
-        return SequenceResult(
-            sequence_id=seq_id,
-            length=len(sequence),
-            gc_content=0.0,
-            prediction="Invalid",
-            confidence=0.0,
-            sequence_preview=sequence[:50] + "..." if len(sequence) > 50 else sequence,
-            full_sequence=sequence,
-            organism_name="N/A",
-            explanation=f"Invalid input data: {error_msg}. Please provide valid DNA sequences (A, T, G, C nucleotides only).",
-            uncertain=True,
-            threshold_used=config.confidence_threshold,
-            ood_score=1.0,
+def _merge_viral_windows(
+    windows: List[WindowPrediction], threshold: float
+) -> List[ViralRegion]:
+    """Merge overlapping or touching windows whose Virus probability reaches
+    ``threshold`` into viral regions."""
+    groups: List[List[WindowPrediction]] = []
+    for window in windows:
+        if window.virus_probability < threshold:
+            continue
+        if groups and window.start <= groups[-1][-1].end:
+            groups[-1].append(window)
+        else:
+            groups.append([window])
+
+    return [
+        ViralRegion(
+            start=group[0].start,
+            end=group[-1].end,
+            window_count=len(group),
+            mean_virus_probability=round(
+                sum(w.virus_probability for w in group) / len(group), 3
+            ),
+            max_virus_probability=max(w.virus_probability for w in group),
+        )
+        for group in groups
+    ]
+
+
+def _classify_windows(
+    predictor: PredictClass | EnsemblePredictor, sequence: str, config: ModelConfig
+) -> Tuple[List[WindowPrediction], List[ViralRegion]]:
+    """Score every sliding window of ``sequence`` in one batch.
+
+    Window probabilities are temperature-scaled like whole-sequence calls; a
+    window counts as viral when its Virus probability reaches the confidence
+    threshold.
+    """
+    window = config.window_size or len(sequence)
+    stride = config.window_stride or max(window // 2, 1)
+
+    scored = predictor.predict_window_probabilities(sequence, window, stride)
+    calibrated_batch = _apply_temperature_scaling(
+        [raw_probs for _, _, raw_probs in scored]
+    )
+    windows = [
+        WindowPrediction(
+            start=start,
+            end=end,
+            virus_probability=round(calibrated["Virus"], 3),
+            host_probability=round(calibrated["Host"], 3),
         )
+        for (start, end, _), calibrated in zip(scored, calibrated_batch)
+    ]
+    return windows, _merge_viral_windows(windows, config.confidence_threshold)
 
-    model_name = _resolve_model_name(config)
-    predictor = get_predictor(model_name)
 
+def _invalid_result(
+    seq_id: str, sequence: str, error_msg: str, config: ModelConfig
+) -> SequenceResult:
+    return SequenceResult(
+        sequence_id=seq_id,
+        length=len(sequence),
+        gc_content=0.0,
+        prediction="Invalid",
+        confidence=0.0,
+        sequence_preview=sequence[:50] + "..." if len(sequence) > 50 else sequence,
+        full_sequence=sequence,
+        organism_name="N/A",
+        explanation=f"Invalid input data: {error_msg}. Please provide valid DNA sequences (A, T, G, C nucleotides only).",
+        uncertain=True,
+        threshold_used=config.confidence_threshold,
+        ood_score=1.0,
+    )
+
+
+def _sequence_result(
+    seq_id: str,
+    sequence: str,
+    config: ModelConfig,
+    predictor: PredictClass | EnsemblePredictor,
+    model_prediction: Prediction,
+    calibrated: Dict[Literal["Host", "Virus"], float],
+) -> SequenceResult:
+    """Threshold and explain one scored sequence, given its temperature-scaled
+    probabilities."""
     gc_content = (sequence.upper().count("G") + sequence.upper().count("C")) / max(
         len(sequence), 1
     )
 
-    # --- 1. Get full probability map and apply temperature scaling ---------------
-    raw_probs = predictor.predict_probabilities(sequence)
-    calibrated = _apply_temperature_scaling(raw_probs)
-
+    # --- 1. Temperature scaling was applied to the whole batch by the caller ---
     # Determine label and confidence from calibrated probabilities
     if calibrated["Host"] >= calibrated["Virus"]:
         predicted_label: Literal["Host", "Virus"] = "Host"
@@ -209,8 +555,14 @@ def classify_sequence(
         "explanation": explanation,
         "uncertain": uncertain,
         "threshold_used": effective_threshold,
+        "decided_by": predictor.model_name,
+        "trees_used": model_prediction.trees_used,
     }
 
+    if config.window_size is not None:
+        windows, regions = _classify_windows(predictor, sequence, config)
+        result.update({"window_predictions": windows, "viral_regions": regions})
+
     if config.enable_ood:
         result.update(
             {
@@ -223,21 +575,142 @@ def classify_sequence(
     return SequenceResult(**result)
 
 
+def classify_sequences(
+    sequences: List[Tuple[str, str]], config: ModelConfig
+) -> List[SequenceResult]:
+    """Classify ``(seq_id, sequence)`` pairs in chunks of ``config.batch_size``.
+
+    All sequences are validated first; each chunk of valid ones is then
+    featurised and scored with one model call per (cascade) stage. Results
+    are the ones ``classify_sequence`` gives each sequence, in input order.
+    """
+    results: List[SequenceResult | None] = [None] * len(sequences)
+    valid: List[int] = []
+    for index, (seq_id, sequence) in enumerate(sequences):
+        is_valid, error_msg = validate_dna_sequence(sequence, seq_id)
+        print(
+            f"[DEBUG] Validating sequence {seq_id}: valid={is_valid}, error={error_msg}"
+        )
+        print(f"[DEBUG] Sequence preview: {sequence[:50] if sequence else 'empty'}")
+        if is_valid:
+            valid.append(index)
+        else:
+            results[index] = _invalid_result(seq_id, sequence, error_msg, config)
+
+    for start in range(0, len(valid), config.batch_size):
+        chunk = valid[start : start + config.batch_size]
+        chunk_sequences = [sequences[index][1] for index in chunk]
+        scored: List[Tuple[PredictClass | EnsemblePredictor, Prediction]]
+        if config.cascade:
+            scored = _cascade_predict_batch(chunk_sequences, config)
+        else:
+            predictor = get_predictor(_resolve_model_name(config))
+            scored = [
+                (predictor, prediction)
+                for prediction in _predict_batch(predictor, chunk_sequences, config)
+            ]
+        calibrated_batch = _apply_temperature_scaling(
+            [prediction.probabilities for _, prediction in scored]
+        )
+        for index, (predictor, prediction), calibrated in zip(
+            chunk, scored, calibrated_batch
+        ):
+            seq_id, sequence = sequences[index]
+            results[index] = _sequence_result(
+                seq_id, sequence, config, predictor, prediction, calibrated
+            )
+    return [result for result in results if result is not None]
+
+
+def classify_sequence(
+    seq_id: str, sequence: str, config: ModelConfig
+) -> SequenceResult:
+    return classify_sequences([(seq_id, sequence)], config)[0]
+
+
 def run_classification(
     sequences: List[SequenceInput], config: ModelConfig, source: str
 ) -> ClassificationResponse:
     start = time.time()
-    detailed_results: List[SequenceResult] = []
-
-    for seq in sequences:
-        result = classify_sequence(seq.id, seq.sequence, config)
-        detailed_results.append(result)
-
+    pairs = [(seq.id, seq.sequence) for seq in sequences]
+    pool = get_classification_pool()
+    if pool is None:
+        detailed_results = classify_sequences(pairs, config)
+    else:
+        detailed_results = [
+            result for batch in pool.map_batches(pairs, config) for result in batch
+        ]
     processing_time = time.time() - start
 
     return create_classification_response(detailed_results, source, processing_time)
 
 
+def iter_classification_batches(
+    sequences: Iterable[Tuple[str, str]], config: ModelConfig
+) -> Iterator[List[SequenceResult]]:
+    """Classify ``(seq_id, sequence)`` pairs lazily, ``config.batch_size`` at
+    a time, yielding each batch's results as soon as they are computed.
+
+    Only one batch is held at a time, so ``sequences`` may be a generator.
+    With a classification pool, a few batches per worker are in flight.
+    """
+    pool = get_classification_pool()
+    if pool is not None:
+        yield from pool.map_batches(sequences, config)
+        return
+    pairs = iter(sequences)
+    while batch := list(islice(pairs, config.batch_size)):
+        yield classify_sequences(batch, config)
+
+
+# Streamed response formats -> media type.
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def _stream_event(event: str, data: str, fmt: str) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {data}\n\n"
+    return f'{{"event": "{event}", "data": {data}}}\n'
+
+
+def stream_classification(
+    sequences: Iterable[Tuple[str, str]],
+    config: ModelConfig,
+    source: str,
+    fmt: str = "ndjson",
+) -> Iterator[str]:
+    """Classify ``sequences`` and render the results as a stream.
+
+    Every ``SequenceResult`` becomes a ``result`` event, written one batch
+    at a time; a final ``summary`` event carries the counts of
+    ``create_classification_response``. ``fmt`` is ``"ndjson"`` (one
+    ``{"event": ..., "data": ...}`` object per line) or ``"sse"``. An error
+    after the stream has started ends it with an ``error`` event.
+    """
+    if fmt not in STREAM_MEDIA_TYPES:
+        raise ValueError(
+            f"Unknown stream format: {fmt}. Expected one of {tuple(STREAM_MEDIA_TYPES)}"
+        )
+    start = time.time()
+    tally = ResultTally()
+    try:
+        for results in iter_classification_batches(sequences, config):
+            tally.add(results)
+            yield "".join(
+                _stream_event("result", result.model_dump_json(), fmt)
+                for result in results
+            )
+    except Exception as exc:
+        detail = json.dumps({"detail": f"{type(exc).__name__}: {exc}"})
+        yield _stream_event("error", detail, fmt)
+        return
+    summary = tally.summary(source, time.time() - start)
+    yield _stream_event("summary", summary.model_dump_json(), fmt)
+
+
 def generate_explanation(
     prediction: str, confidence: float, gc_content: float, length: int, organism: str
 ) -> str:
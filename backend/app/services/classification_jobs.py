@@ -0,0 +1,304 @@
+"""
+Persistent background classification jobs.
+
+A submitted job stores its sequences and config in ``classification_jobs``.
+A worker thread classifies them ``config.batch_size`` at a time and commits
+each batch's results (``classification_job_results``) together with the
+job's progress, so stored results and ``completed_sequences`` always agree.
+
+Every server process has its own ``JobRunner``. A runner only works on a
+job after claiming it: an atomic update that sets ``owner`` and
+``heartbeat_at`` and succeeds only while no other runner holds an unexpired
+lease. Each batch commit renews the lease, so a job is never run twice at
+once. ``JobRunner.resume`` re-queues unfinished jobs whose lease has expired
+(after a restart, and every lease interval after that, so the jobs of a
+process that died are taken over by one still running); they carry on from
+the first sequence without a stored result.
+"""
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from binary_classifiers.transformers import kmer_kernels
+
+from ..models import ClassificationJob, ClassificationJobResult
+from ..schemas.classification import (
+    ClassificationJobPage,
+    ModelConfig,
+    SequenceInput,
+)
+from .classification import classify_sequences
+
+# Worker threads shared by all jobs; each job runs on one of them.
+JOB_WORKERS = int(os.environ.get("CLASSIFICATION_JOB_WORKERS", "2"))
+# A job whose owner has not renewed its lease for this long (e.g. because its
+# process died) may be claimed by another runner.
+JOB_LEASE_SECONDS = float(os.environ.get("CLASSIFICATION_JOB_LEASE_SECONDS", "300"))
+UNFINISHED_STATUSES = ("queued", "running")
+
+
+class JobRunner:
+    """Run classification jobs on a thread pool, persisting every batch."""
+
+    def __init__(
+        self, max_workers: int = JOB_WORKERS, lease_seconds: float = JOB_LEASE_SECONDS
+    ) -> None:
+        # Jobs count k-mers on worker threads; numba's pool must already
+        # run (started here, on the creating thread: the main thread when
+        # created in the server lifespan) or exit hangs.
+        kmer_kernels.start_threads()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="classification-job"
+        )
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.lease = timedelta(seconds=lease_seconds)
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+        self._stopping = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    def submit(
+        self,
+        db: Session,
+        sequences: List[SequenceInput],
+        config: ModelConfig,
+        source: str,
+    ) -> ClassificationJob:
+        """Store a new job and queue it; returns the stored job."""
+        job = ClassificationJob(
+            id=str(uuid4()),
+            status="queued",
+            source=source,
+            config=config,
+            sequences=[[seq.id, seq.sequence] for seq in sequences],
+            total_sequences=len(sequences),
+            completed_sequences=0,
+            processing_time=0.0,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        self._schedule(job.id, db.get_bind())
+        return job
+
+    def resume(self, bind: Engine | Connection) -> List[str]:
+        """Queue every unfinished job stored in ``bind`` that no other runner
+        holds a lease on; returns their ids. Until ``stop``, the scan is
+        repeated every lease interval in the background."""
+        self._stopping.clear()
+        job_ids = self._queue_claimable(bind)
+        with self._lock:
+            if self._watcher is None or not self._watcher.is_alive():
+                self._watcher = threading.Thread(
+                    target=self._watch,
+                    args=(bind,),
+                    name="classification-job-watch",
+                    daemon=True,
+                )
+                self._watcher.start()
+        return job_ids
+
+    def _watch(self, bind: Engine | Connection) -> None:
+        while not self._stopping.wait(self.lease.total_seconds()):
+            try:
+                self._queue_claimable(bind)
+            except Exception as exc:
+                print(f"[DEBUG] Classification job scan failed: {exc}")
+
+    def _queue_claimable(self, bind: Engine | Connection) -> List[str]:
+        with Session(bind=bind) as db:
+            job_ids = list(
+                db.scalars(
+                    select(ClassificationJob.id)
+                    .where(
+                        ClassificationJob.status.in_(UNFINISHED_STATUSES),
+                        self._claimable(),
+                    )
+                    .order_by(ClassificationJob.created_at)
+                )
+            )
+        for job_id in job_ids:
+            self._schedule(job_id, bind)
+        return job_ids
+
+    def stop(self) -> None:
+        """Let running jobs stop after their current batch. They stay
+        ``running`` in the database, with their lease released, and are
+        picked up by ``resume``."""
+        self._stopping.set()
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.join()
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> None:
+        """Block until the worker for ``job_id`` (if any) returns."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+
+    def _schedule(self, job_id: str, bind: Engine | Connection) -> None:
+        with self._lock:
+            if job_id in self._futures:
+                return
+            self._futures[job_id] = self._executor.submit(self._run, job_id, bind)
+
+    def _claimable(self) -> ColumnElement[bool]:
+        """SQL condition: the job is unleased, leased by this runner, or its
+        owner's lease has expired."""
+        return or_(
+            ClassificationJob.owner.is_(None),
+            ClassificationJob.owner == self.owner,
+            ClassificationJob.heartbeat_at < datetime.now(timezone.utc) - self.lease,
+        )
+
+    def _claim(self, db: Session, job_id: str) -> bool:
+        """Atomically take the lease on an unfinished job; False if it is
+        finished or another runner holds it."""
+        claimed = db.execute(
+            update(ClassificationJob)
+            .where(
+                ClassificationJob.id == job_id,
+                ClassificationJob.status.in_(UNFINISHED_STATUSES),
+                self._claimable(),
+            )
+            .values(
+                status="running",
+                owner=self.owner,
+                heartbeat_at=datetime.now(timezone.utc),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return claimed.rowcount == 1
+
+    def _renew(self, db: Session, job_id: str) -> bool:
+        """Refresh the lease in the current transaction; False if another
+        runner has taken the job over."""
+        renewed = db.execute(
+            update(ClassificationJob)
+            .where(
+                ClassificationJob.id == job_id, ClassificationJob.owner == self.owner
+            )
+            .values(heartbeat_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return renewed.rowcount == 1
+
+    def _release(self, db: Session, job_id: str, **values: Any) -> None:
+        """Give up the lease, setting ``values`` on the job if still ours."""
+        db.execute(
+            update(ClassificationJob)
+            .where(
+                ClassificationJob.id == job_id, ClassificationJob.owner == self.owner
+            )
+            .values(owner=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    def _run(self, job_id: str, bind: Engine | Connection) -> None:
+        try:
+            with Session(bind=bind) as db:
+                if not self._claim(db, job_id):
+                    return
+                job = db.get(ClassificationJob, job_id)
+                if job is not None:
+                    self._process(db, job)
+        except Exception as exc:
+            with Session(bind=bind) as db:
+                self._release(
+                    db, job_id, status="failed", error=f"{type(exc).__name__}: {exc}"
+                )
+        finally:
+            with self._lock:
+                self._futures.pop(job_id, None)
+
+    def _process(self, db: Session, job: ClassificationJob) -> None:
+        config: ModelConfig = job.config
+        pairs = [(seq_id, sequence) for seq_id, sequence in job.sequences]
+        while job.completed_sequences < job.total_sequences:
+            if self._stopping.is_set():
+                self._release(db, job.id)
+                return
+            start = job.completed_sequences
+            batch = pairs[start : start + config.batch_size]
+            began = time.time()
+            results = classify_sequences(batch, config)
+            if not self._renew(db, job.id):
+                # Our lease expired and another runner carries on.
+                db.rollback()
+                return
+            db.add_all(
+                ClassificationJobResult(
+                    job_id=job.id,
+                    position=start + offset,
+                    prediction=result.prediction,
+                    result=result,
+                )
+                for offset, result in enumerate(results)
+            )
+            job.completed_sequences = start + len(batch)
+            job.processing_time += time.time() - began
+            db.commit()
+        self._release(db, job.id, status="completed")
+
+
+def get_job_page(
+    db: Session, job_id: str, offset: int = 0, limit: int = 100
+) -> Optional[ClassificationJobPage]:
+    """Job progress and its stored results ``offset:offset + limit``, or None
+    for an unknown job."""
+    job = db.get(ClassificationJob, job_id)
+    if job is None:
+        return None
+
+    results = list(
+        db.scalars(
+            select(ClassificationJobResult.result)
+            .where(ClassificationJobResult.job_id == job_id)
+            .order_by(ClassificationJobResult.position)
+            .offset(offset)
+            .limit(limit)
+        )
+    )
+    counts = db.execute(
+        select(ClassificationJobResult.prediction, func.count())
+        .where(ClassificationJobResult.job_id == job_id)
+        .group_by(ClassificationJobResult.prediction)
+    ).all()
+    next_offset = offset + len(results)
+    return ClassificationJobPage(
+        job_id=job.id,
+        status=job.status,
+        source=job.source,
+        total_sequences=job.total_sequences,
+        completed_sequences=job.completed_sequences,
+        processing_time=job.processing_time,
+        error=job.error,
+        prediction_counts={prediction: count for prediction, count in counts},
+        offset=offset,
+        limit=limit,
+        next_offset=next_offset if next_offset < job.total_sequences else None,
+        results=results,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_job_runner() -> JobRunner:
+    """This process's runner, created on first use (``app.main`` creates it
+    at startup)."""
+    return JobRunner()
@@ -0,0 +1,190 @@
+"""
+Process pool for CPU-bound classification.
+
+The sync routes run in the server's threadpool, so k-mer counting and model
+scoring hold the GIL that auth and chat requests need too. A
+``ClassificationPool`` runs ``classify_sequences`` in worker processes
+instead. Each worker preloads the given models when it starts. Batches are
+sent as one UTF-8 buffer of sequences and one of ids, each with an offset
+array, and results come back as one JSON document per batch, together with
+the batch's cascade stage counts, which are added to the parent's
+``cascade_counters``. Nothing is pickled per sequence.
+
+Workers are spawned rather than forked: the parent has already started
+numba's threads, which must not be copied into a forked child.
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from ..schemas.classification import ModelConfig, SequenceResult
+
+_RESULTS = TypeAdapter(List[SequenceResult])
+
+
+class EncodedBatch(NamedTuple):
+    """``(seq_id, sequence)`` pairs packed into two buffers and offsets."""
+
+    ids: bytes
+    id_offsets: np.ndarray
+    sequences: bytes
+    sequence_offsets: np.ndarray
+
+
+def _pack(values: Sequence[str]) -> Tuple[bytes, np.ndarray]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return b"".join(encoded), offsets
+
+
+def _unpack(buffer: bytes, offsets: np.ndarray) -> List[str]:
+    bounds = offsets.tolist()
+    return [buffer[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+
+
+def encode_batch(pairs: Sequence[Tuple[str, str]]) -> EncodedBatch:
+    ids, id_offsets = _pack([seq_id for seq_id, _ in pairs])
+    sequences, sequence_offsets = _pack([sequence for _, sequence in pairs])
+    return EncodedBatch(ids, id_offsets, sequences, sequence_offsets)
+
+
+def decode_batch(batch: EncodedBatch) -> List[Tuple[str, str]]:
+    return list(
+        zip(
+            _unpack(batch.ids, batch.id_offsets),
+            _unpack(batch.sequences, batch.sequence_offsets),
+        )
+    )
+
+
+class EncodedResults(NamedTuple):
+    """One batch's results as JSON, and the cascade stage counts (see
+    ``CascadeCounters``) of classifying it."""
+
+    results: bytes
+    scored: Dict[str, int]
+    decided: Dict[str, int]
+
+
+def decode_results(data: EncodedResults) -> List[SequenceResult]:
+    """The batch's results; its stage counts are added to this process's
+    ``cascade_counters``."""
+    from .classification import cascade_counters
+
+    cascade_counters.add(data.scored, data.decided)
+    return _RESULTS.validate_json(data.results)
+
+
+def _init_worker(model_names: Tuple[str, ...], threads: int) -> None:
+    # Imported here: only worker processes load models through this module.
+    from binary_classifiers.transformers import kmer_kernels
+
+    from .classification import preload_predictors
+
+    kmer_kernels.start_threads(threads)
+    # Spawned, not forked, so warming up here is safe.
+    preload_predictors(list(model_names), warm_up=True)
+
+
+def _classify_encoded(batch: EncodedBatch, config_json: str) -> EncodedResults:
+    from .classification import cascade_counters, classify_sequences
+
+    config = ModelConfig.model_validate_json(config_json)
+    results = _RESULTS.dump_json(classify_sequences(decode_batch(batch), config))
+    # A worker runs one batch at a time, so its counters hold just this one.
+    return EncodedResults(results, *cascade_counters.drain())
+
+
+class ClassificationPool:
+    """Classify sequence batches in ``processes`` worker processes."""
+
+    def __init__(self, processes: int, preload: Sequence[str] = ()) -> None:
+        if processes < 1:
+            raise ValueError(f"processes must be positive, got {processes}")
+        self.processes = processes
+        self._lock = threading.Lock()
+        self._users = 0
+        self._retired = False
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            # Split the cores between workers rather than oversubscribe them.
+            initargs=(tuple(preload), max(1, (os.cpu_count() or 1) // processes)),
+        )
+
+    def submit(
+        self, pairs: Sequence[Tuple[str, str]], config: ModelConfig
+    ) -> "Future[EncodedResults]":
+        """Queue one batch; the future's result is ``decode_results`` input."""
+        return self._executor.submit(
+            _classify_encoded, encode_batch(pairs), config.model_dump_json()
+        )
+
+    def classify(
+        self, pairs: Sequence[Tuple[str, str]], config: ModelConfig
+    ) -> List[SequenceResult]:
+        """``classify_sequences(pairs, config)``, run in a worker."""
+        with self._in_use():
+            return decode_results(self.submit(pairs, config).result())
+
+    def map_batches(
+        self, sequences: Iterable[Tuple[str, str]], config: ModelConfig
+    ) -> Iterator[List[SequenceResult]]:
+        """Like ``iter_classification_batches``, with up to two batches per
+        worker in flight so one large input keeps every worker busy."""
+        pairs = iter(sequences)
+        pending: Deque["Future[EncodedResults]"] = deque()
+        with self._in_use():
+            try:
+                while True:
+                    while len(pending) < 2 * self.processes:
+                        batch = list(islice(pairs, config.batch_size))
+                        if not batch:
+                            break
+                        pending.append(self.submit(batch, config))
+                    if not pending:
+                        return
+                    yield decode_results(pending.popleft().result())
+            finally:
+                # A closed stream (e.g. a disconnected client) drops queued
+                # work.
+                for future in pending:
+                    future.cancel()
+
+    @contextmanager
+    def _in_use(self) -> Iterator[None]:
+        with self._lock:
+            self._users += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._users -= 1
+                idle = self._retired and not self._users
+            if idle:
+                self._executor.shutdown(wait=False)
+
+    def retire(self) -> None:
+        """Stop the worker processes once the ``classify`` and
+        ``map_batches`` calls already running finish. Used to swap in a new
+        pool without failing requests in flight."""
+        with self._lock:
+            self._retired = True
+            idle = not self._users
+        if idle:
+            self._executor.shutdown(wait=False)
+
+    def close(self) -> None:
+        """Cancel queued batches and stop the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -1,32 +1,62 @@
 from datetime import datetime
-from typing import List, Any
-from ..schemas.classification import ClassificationResponse, SequenceResult
+from typing import Any, Dict, Iterable, List
+from ..schemas.classification import (
+    ClassificationResponse,
+    ClassificationSummary,
+    SequenceResult,
+)
+
+
+class ResultTally:
+    """Prediction and stage counts of the results added so far."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.predictions: Dict[str, int] = {}
+        self.stage_counts: Dict[str, int] = {}
+
+    def add(self, sequences: Iterable[SequenceResult]) -> None:
+        for seq in sequences:
+            self.total += 1
+            self.predictions[seq.prediction] = (
+                self.predictions.get(seq.prediction, 0) + 1
+            )
+            if seq.decided_by is not None:
+                self.stage_counts[seq.decided_by] = (
+                    self.stage_counts.get(seq.decided_by, 0) + 1
+                )
+
+    def summary(self, source: str = "db", ptime: Any = 0) -> ClassificationSummary:
+        return ClassificationSummary(
+            total_sequences=self.total,
+            virus_count=self.predictions.get("Virus", 0),
+            host_count=self.predictions.get("Host", 0),
+            novel_count=self.predictions.get("Novel", 0),
+            uncertain_count=self.predictions.get("Uncertain", 0),
+            stage_counts=dict(self.stage_counts),
+            source=source,
+            timestamp=datetime.now().isoformat(),
+            processing_time=ptime,
+        )
 
 
 def create_classification_response(
     sequences: List[SequenceResult], source: str = "db", ptime: Any = 0
 ) -> ClassificationResponse:
-    virus_count = host_count = novel_count = uncertain_count = 0
-
-    for seq in sequences:
-        if seq.prediction == "Virus":
-            virus_count += 1
-        elif seq.prediction == "Host":
-            host_count += 1
-        elif seq.prediction == "Novel":
-            novel_count += 1
-        elif seq.prediction == "Uncertain":
-            uncertain_count += 1
+    tally = ResultTally()
+    tally.add(sequences)
+    summary = tally.summary(source, ptime)
 
     response = ClassificationResponse(
-        total_sequences=len(sequences),
-        virus_count=virus_count,
-        host_count=host_count,
-        novel_count=novel_count,
-        uncertain_count=uncertain_count,
+        total_sequences=summary.total_sequences,
+        virus_count=summary.virus_count,
+        host_count=summary.host_count,
+        novel_count=summary.novel_count,
+        uncertain_count=summary.uncertain_count,
+        stage_counts=summary.stage_counts,
         detailed_results=sequences,
-        source=source,
-        timestamp=datetime.now().isoformat(),
-        processing_time=ptime,
+        source=summary.source,
+        timestamp=summary.timestamp,
+        processing_time=summary.processing_time,
     )
     return response
@@ -0,0 +1,206 @@
+"""
+Memory-mapped artifact bundles for multi-process serving.
+
+A bundle is a directory holding one pickle per entry (``model``,
+``vectorizer``, ...) whose large NumPy arrays are written next to it as
+uncompressed ``.npy`` files and reopened with ``mmap_mode='r'``. Every worker
+process that loads the bundle maps the same files, so support vectors, dual
+coefficients, compiled engines and vocabulary tables are shared through
+the OS page cache instead of being copied into each process.
+
+Bundles are derived from the pickled artifacts listed in
+``predict_class.MODEL_FILE_MAP`` and record a digest of those sources;
+``PredictClass`` ignores a bundle that no longer matches them. Build them
+with ``python -m binary_classifiers.artifact_bundle``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import IO, Any, Dict, List, Literal, Mapping, Optional, Sequence
+
+import numpy as np
+
+BUNDLE_SUFFIX = ".bundle"
+MANIFEST_FILE = "manifest.json"
+ARRAYS_DIR = "arrays"
+# Smaller arrays stay inline in the pickle; mapping them saves nothing.
+MIN_SHARED_BYTES = 1024
+
+MmapMode = Optional[Literal["r", "r+", "w+", "c"]]
+
+
+class _BundlePickler(pickle.Pickler):
+    def __init__(self, file: IO[bytes], arrays_dir: Path, prefix: str) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays_dir = arrays_dir
+        self.prefix = prefix
+        self.n_arrays = 0
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        if (
+            not isinstance(obj, np.ndarray)
+            or obj.dtype.hasobject
+            or obj.nbytes < MIN_SHARED_BYTES
+        ):
+            return None
+        name = f"{self.prefix}-{self.n_arrays}.npy"
+        np.save(self.arrays_dir / name, np.ascontiguousarray(obj), allow_pickle=False)
+        self.n_arrays += 1
+        return name
+
+
+class _BundleUnpickler(pickle.Unpickler):
+    def __init__(self, file: IO[bytes], arrays_dir: Path, mmap_mode: MmapMode) -> None:
+        super().__init__(file)
+        self.arrays_dir = arrays_dir
+        self.mmap_mode = mmap_mode
+
+    def persistent_load(self, pid: Any) -> Any:
+        return np.load(
+            self.arrays_dir / str(pid), mmap_mode=self.mmap_mode, allow_pickle=False
+        )
+
+
+def bundle_path(artifact_path: Path) -> Path:
+    """Bundle directory derived from a pickled model artifact."""
+    return artifact_path.with_suffix(BUNDLE_SUFFIX)
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_bundle(
+    directory: Path,
+    entries: Mapping[str, Any],
+    sources: Sequence[Path] = (),
+) -> Path:
+    """
+    Write ``entries`` as a bundle at ``directory``, replacing any existing one.
+
+    ``sources`` are the artifact files the entries were built from; their
+    digests are recorded so stale bundles can be detected.
+    """
+    staging = directory.with_name(directory.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    arrays_dir = staging / ARRAYS_DIR
+    arrays_dir.mkdir(parents=True)
+
+    for name, entry in entries.items():
+        with open(staging / f"{name}.pkl", "wb") as handle:
+            _BundlePickler(handle, arrays_dir, prefix=name).dump(entry)
+
+    manifest = {
+        "entries": sorted(entries),
+        "sources": {path.name: file_digest(path) for path in sources},
+    }
+    (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+    # Processes still mapping the old arrays keep their (unlinked) files.
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+    return directory
+
+
+def read_manifest(directory: Path) -> Dict[str, Any]:
+    manifest: Dict[str, Any] = json.loads((directory / MANIFEST_FILE).read_text())
+    return manifest
+
+
+def bundle_matches_sources(directory: Path, sources: Sequence[Path]) -> bool:
+    """True if ``directory`` is a bundle built from the current ``sources``."""
+    try:
+        recorded = read_manifest(directory)["sources"]
+        return bool(recorded == {path.name: file_digest(path) for path in sources})
+    except (OSError, KeyError, ValueError):
+        return False
+
+
+def load_bundle_entry(directory: Path, name: str, mmap_mode: MmapMode = "r") -> Any:
+    """Unpickle one entry, memory-mapping its shared arrays read-only."""
+    with open(directory / f"{name}.pkl", "rb") as handle:
+        return _BundleUnpickler(handle, directory / ARRAYS_DIR, mmap_mode).load()
+
+
+def build_model_bundle(
+    model: Any,
+    vectorizer: Any,
+    directory: Path,
+    sources: Sequence[Path] = (),
+) -> Path:
+    """
+    Bundle a model/vectorizer pair together with the structures
+    ``PredictClass`` would otherwise derive at load time: the compiled engine
+    (forest nodes, or SVM support vectors with their norms) and the k-mer
+    featurizer's vocabulary table.
+    """
+    from .artifacts import get_kmer_params
+    from .compiled_forest import compile_forest
+    from .compiled_svm import compile_svm
+    from .transformers.kmer_featurizer import KmerFeaturizer
+
+    entries: Dict[str, Any] = {"model": model, "vectorizer": vectorizer}
+    for entry, compiler in (
+        ("compiled_model", compile_forest),
+        ("compiled_svm", compile_svm),
+    ):
+        try:
+            entries[entry] = compiler(model)
+        except ValueError:
+            pass
+
+    params = get_kmer_params(vectorizer)
+    if isinstance(params["k"], int):
+        featurizer = KmerFeaturizer.from_vectorizer(
+            vectorizer, params["k"], canonical=params["canonical"]
+        )
+        if featurizer is not None:
+            entries["featurizer"] = featurizer
+    return save_bundle(directory, entries, sources)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import joblib  # type: ignore[import-untyped]
+
+    from .predict_class import MODEL_FILE_MAP
+
+    parser = argparse.ArgumentParser(
+        description="Build memory-mapped bundles for the k-mer model artifacts."
+    )
+    parser.add_argument(
+        "models",
+        nargs="*",
+        default=["RandomForest", "SVM"],
+        help="Models to bundle (default: RandomForest and SVM, whose artifacts ship)",
+    )
+    args = parser.parse_args(argv)
+
+    base_dir = Path(__file__).resolve().parent
+    for model_name in args.models:
+        model_file, vectorizer_file = MODEL_FILE_MAP[model_name]
+        if vectorizer_file is None:
+            raise SystemExit(f"{model_name} has no k-mer artifacts to bundle")
+        model_path = base_dir / "models" / model_file
+        vectorizer_path = base_dir / "transformers" / vectorizer_file
+        directory = build_model_bundle(
+            joblib.load(model_path),
+            joblib.load(vectorizer_path),
+            bundle_path(model_path),
+            sources=(model_path, vectorizer_path),
+        )
+        print(f"{model_name}: {directory}")
+
+
+if __name__ == "__main__":
+    main()
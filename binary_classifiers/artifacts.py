@@ -0,0 +1,89 @@
+"""
+Metadata for the pickled model/vectorizer artifact pairs.
+
+``PredictClass`` loads a classifier and its vectorizer from separate pickles.
+The k-mer settings they were trained with are recorded on both objects so a
+model is never paired with a vectorizer that featurises differently (e.g. a
+canonical model with a non-canonical vocabulary). ``k`` is a list for
+multi-k spectrum artifacts (``MultiKmerTransformer``).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Sequence, Union
+
+import numpy as np
+
+from .transformers.kmer_encoding import canonical_kmer, spectrum_offsets
+
+KMER_PARAMS_ATTR = "baio_kmer_params_"
+# Artifacts saved before the settings were recorded all used plain 6-mers.
+DEFAULT_KMER_PARAMS: Dict[str, Any] = {"k": 6, "canonical": False}
+
+
+def tag_kmer_params(
+    artifact: Any, k: Union[int, Sequence[int]], canonical: bool = False
+) -> None:
+    """Record the k-mer settings on a fitted model or vectorizer before saving."""
+    k_value: Union[int, list[int]] = (
+        int(k) if isinstance(k, (int, np.integer)) else [int(value) for value in k]
+    )
+    setattr(artifact, KMER_PARAMS_ATTR, {"k": k_value, "canonical": bool(canonical)})
+
+
+def get_kmer_params(artifact: Any) -> Dict[str, Any]:
+    """Return the recorded k-mer settings, defaulting for untagged artifacts."""
+    return {**DEFAULT_KMER_PARAMS, **getattr(artifact, KMER_PARAMS_ATTR, {})}
+
+
+def check_kmer_compatibility(model: Any, vectorizer: Any) -> Dict[str, Any]:
+    """
+    Verify that ``model`` and ``vectorizer`` were trained with the same k-mer
+    featurisation and return those settings.
+
+    Raises ValueError on mismatched settings, a canonical vectorizer whose
+    vocabulary holds non-canonical k-mers, or a feature count mismatch.
+    """
+    model_params = get_kmer_params(model)
+    vectorizer_params = get_kmer_params(vectorizer)
+    if model_params != vectorizer_params:
+        raise ValueError(
+            f"Model was trained with k-mer settings {model_params} but the "
+            f"vectorizer uses {vectorizer_params}"
+        )
+
+    column_offsets = getattr(vectorizer, "column_offsets_", None)
+    if column_offsets is not None:
+        expected = spectrum_offsets(
+            np.atleast_1d(vectorizer_params["k"]), vectorizer_params["canonical"]
+        )
+        if not np.array_equal(column_offsets, expected):
+            raise ValueError(
+                f"Vectorizer column offsets {list(column_offsets)} do not match "
+                f"the spectrum layout for k-mer settings {vectorizer_params}"
+            )
+        n_columns = int(column_offsets[-1])
+    else:
+        vocabulary = getattr(vectorizer, "vocabulary_", None)
+        if vocabulary is None:
+            return vectorizer_params
+        if vectorizer_params["canonical"]:
+            non_canonical = [
+                token
+                for token in vocabulary
+                if canonical_kmer(token.upper()) != token.upper()
+            ]
+            if non_canonical:
+                raise ValueError(
+                    "Vectorizer is tagged canonical but its vocabulary contains "
+                    f"non-canonical k-mers such as '{non_canonical[0]}'"
+                )
+        n_columns = len(vocabulary)
+
+    n_features = getattr(model, "n_features_in_", None)
+    if n_features is not None and n_features != n_columns:
+        raise ValueError(
+            f"Model expects {n_features} features but the vectorizer produces "
+            f"{n_columns}"
+        )
+    return vectorizer_params
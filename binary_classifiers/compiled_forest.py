@@ -0,0 +1,280 @@
+"""
+Flat-array inference engine for fitted random forests.
+
+``compile_forest`` copies every tree of a fitted ``RandomForestClassifier``
+(or ``ExtraTreesClassifier``) into contiguous NumPy arrays: split feature,
+threshold, child pointers and leaf class distributions for all nodes of
+all trees. ``CompiledForest.predict_proba`` then walks all trees for all rows at
+once, reading the k-mer CSR rows directly, without sklearn's per-call input
+validation, per-tree dispatch and thread pool.
+
+Probabilities are bit-identical to ``predict_proba`` of the source forest:
+feature values are compared as float32 like sklearn's tree code and leaf
+values are summed in estimator order (sklearn's serial order) before dividing
+by the number of trees. ``predict_proba_anytime`` evaluates trees in blocks
+and stops a row early once its predicted class can no longer change.
+``CompiledForest.compact`` halves the node arrays: int32 indices, float32
+thresholds rounded so every split routes exactly as before, and float32
+leaf values, whose sums differ from the float64 ones by ~1e-7.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Tuple
+
+import numpy as np
+import sklearn  # type: ignore[import-untyped]
+from scipy import sparse  # type: ignore[import-untyped]
+from sklearn.utils.fixes import parse_version  # type: ignore[import-untyped]
+
+from .artifacts import KMER_PARAMS_ATTR
+
+LEAF = -1
+# Since scikit-learn 1.4 classifier trees store class fractions and
+# predict_proba returns them as is; before that, leaf counts were normalised.
+_TREES_STORE_FRACTIONS = parse_version(sklearn.__version__) >= parse_version("1.4")
+
+
+class CompiledForest:
+    """
+    A fitted forest flattened into node arrays.
+
+    Node ``i`` (numbered across all trees) splits on ``feature[i]`` at
+    ``threshold[i]`` into ``left[i]``/``right[i]``; leaves have ``left[i] ==
+    LEAF`` and hold their class distribution in ``values[i]``. ``roots`` holds
+    the first node of each tree. Exposes the ``predict``/``predict_proba``/
+    ``classes_`` surface ``PredictClass`` uses.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        missing_go_to_left: np.ndarray,
+        values: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        classes: np.ndarray,
+        n_features_in: int,
+    ) -> None:
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_go_to_left = missing_go_to_left
+        self.values = values
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.n_features_in_ = n_features_in
+
+        # Only the features some tree splits on are ever read; rows are
+        # densified into just those columns.
+        self.used_features = np.unique(feature[left != LEAF])
+        local = np.full(n_features_in, LEAF, dtype=left.dtype)
+        local[self.used_features] = np.arange(len(self.used_features))
+        self.local_column = local
+        self.local_feature = np.where(left != LEAF, local[np.maximum(feature, 0)], 0)
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @property
+    def is_compact(self) -> bool:
+        return bool(self.values.dtype == np.float32)
+
+    def compact(self) -> "CompiledForest":
+        """
+        Copy with int32 node indices, float32 thresholds and float32 leaf
+        values. Split values are float32 already, so each threshold is
+        rounded down to the nearest float32: ``x <= t`` then holds for exactly
+        the same float32 ``x`` and every row reaches the same leaves.
+        """
+        if self.is_compact:
+            return self
+        index_dtype = np.int32 if len(self.left) < 2**31 else np.int64
+        threshold = self.threshold.astype(np.float32)
+        rounded_up = threshold.astype(np.float64) > self.threshold
+        threshold[rounded_up] = np.nextafter(threshold[rounded_up], np.float32(-np.inf))
+        compact = CompiledForest(
+            feature=self.feature.astype(index_dtype),
+            threshold=threshold,
+            left=self.left.astype(index_dtype),
+            right=self.right.astype(index_dtype),
+            missing_go_to_left=self.missing_go_to_left,
+            values=self.values.astype(np.float32),
+            roots=self.roots.astype(index_dtype),
+            max_depth=self.max_depth,
+            classes=self.classes_,
+            n_features_in=self.n_features_in_,
+        )
+        if hasattr(self, KMER_PARAMS_ATTR):
+            setattr(compact, KMER_PARAMS_ATTR, getattr(self, KMER_PARAMS_ATTR))
+        return compact
+
+    def _split_values(self, X: Any) -> np.ndarray:
+        """Float32 values of the split features, one dense row per sample."""
+        n_rows = X.shape[0]
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but the forest was fitted with "
+                f"{self.n_features_in_} features"
+            )
+        if not sparse.issparse(X):
+            dense = np.asarray(X, dtype=np.float32)
+            return np.ascontiguousarray(dense[:, self.used_features])
+
+        X = sparse.csr_matrix(X)
+        if not X.has_canonical_format:
+            X = X.copy()
+            X.sum_duplicates()
+        columns = self.local_column[X.indices]
+        kept = columns != LEAF
+        rows = np.repeat(np.arange(n_rows), np.diff(X.indptr))
+        values = np.zeros((n_rows, len(self.used_features)), dtype=np.float32)
+        values[rows[kept], columns[kept]] = X.data[kept].astype(np.float32)
+        return values
+
+    def apply(self, X: Any) -> np.ndarray:
+        """Leaf node reached by every row in every tree, shape (rows, trees)."""
+        return self._walk(self._split_values(X), self.roots)
+
+    def _walk(self, split_values: np.ndarray, roots: np.ndarray) -> np.ndarray:
+        """Leaves reached from ``roots`` by every row of ``split_values``."""
+        nodes = np.broadcast_to(roots, (split_values.shape[0], len(roots)))
+        rows = np.arange(split_values.shape[0])[:, np.newaxis]
+        for _ in range(self.max_depth):
+            internal = self.left[nodes] != LEAF
+            if not internal.any():
+                break
+            value = split_values[rows, self.local_feature[nodes]]
+            go_left = (value <= self.threshold[nodes]) | (
+                np.isnan(value) & self.missing_go_to_left[nodes]
+            )
+            nodes = np.where(
+                internal,
+                np.where(go_left, self.left[nodes], self.right[nodes]),
+                nodes,
+            )
+        return np.asarray(nodes)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        leaves = self.apply(X)
+        probabilities = np.zeros(
+            (leaves.shape[0], self.values.shape[1]), dtype=self.values.dtype
+        )
+        # Same accumulation order as sklearn: tree by tree, then one division.
+        for tree in range(leaves.shape[1]):
+            probabilities += self.values[leaves[:, tree]]
+        probabilities /= len(self.roots)
+        return probabilities
+
+    def predict_proba_anytime(
+        self, X: Any, block_size: int = 10, confidence: float | None = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Class probabilities from as few trees as needed, and the number of
+        trees each row used.
+
+        Trees are evaluated in blocks of ``block_size``, in estimator order. A
+        row stops once its leading class is ahead of the runner-up by more
+        votes than the remaining trees could add (each tree adds at most 1
+        to a class), so its predicted class is the full forest's. With
+        ``confidence``, a row also stops once the running mean probability of
+        its leading class reaches it. Rows that use every tree get exactly
+        ``predict_proba``; early-stopped rows get the mean over the trees
+        they used.
+        """
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        split_values = self._split_values(X)
+        n_rows, n_trees = split_values.shape[0], len(self.roots)
+        totals = np.zeros((n_rows, self.values.shape[1]))
+        trees_used = np.zeros(n_rows, dtype=np.int64)
+        active = np.arange(n_rows)
+        for start in range(0, n_trees, block_size):
+            roots = self.roots[start : start + block_size]
+            leaves = self._walk(split_values[active], roots)
+            block_totals = totals[active]
+            for tree in range(leaves.shape[1]):
+                block_totals += self.values[leaves[:, tree]]
+            totals[active] = block_totals
+            used = start + len(roots)
+            trees_used[active] = used
+
+            ranked = np.sort(block_totals, axis=1)
+            leader = ranked[:, -1]
+            runner_up = ranked[:, -2] if ranked.shape[1] > 1 else np.zeros_like(leader)
+            done = leader - runner_up > n_trees - used
+            if confidence is not None:
+                done |= leader / used >= confidence
+            active = active[~done]
+            if not active.size:
+                break
+        return totals / trees_used[:, np.newaxis], trees_used
+
+    def predict(self, X: Any) -> np.ndarray:
+        return np.asarray(self.classes_.take(np.argmax(self.predict_proba(X), axis=1)))
+
+
+def compile_forest(forest: Any) -> CompiledForest:
+    """
+    Flatten a fitted single-output forest classifier into a
+    :class:`CompiledForest`. Raises ValueError for anything else; compiled
+    forests are returned unchanged.
+    """
+    if isinstance(forest, CompiledForest):
+        return forest
+    estimators = getattr(forest, "estimators_", None)
+    if (
+        not estimators
+        or not all(hasattr(estimator, "tree_") for estimator in estimators)
+        or not hasattr(forest, "predict_proba")
+    ):
+        raise ValueError(f"Cannot compile {type(forest).__name__}: not a tree forest")
+    if getattr(forest, "n_outputs_", 1) != 1:
+        raise ValueError("Only single-output forests can be compiled")
+
+    n_classes = len(forest.classes_)
+    features, thresholds, lefts, rights, missing, values = [], [], [], [], [], []
+    roots = np.zeros(len(estimators), dtype=np.int64)
+    max_depth = 0
+    offset = 0
+    for index, estimator in enumerate(estimators):
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        roots[index] = offset
+        features.append(tree.feature)
+        thresholds.append(tree.threshold)
+        lefts.append(np.where(is_leaf, LEAF, tree.children_left + offset))
+        rights.append(np.where(is_leaf, LEAF, tree.children_right + offset))
+        missing.append(
+            getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, np.uint8))
+        )
+        leaf_values = np.array(tree.value[:, 0, :n_classes], dtype=np.float64)
+        if not _TREES_STORE_FRACTIONS:
+            normalizer = leaf_values.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+            leaf_values /= normalizer[:, np.newaxis]
+        values.append(leaf_values)
+        max_depth = max(max_depth, int(tree.max_depth))
+        offset += tree.node_count
+
+    compiled = CompiledForest(
+        feature=np.concatenate(features).astype(np.int64),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        left=np.concatenate(lefts).astype(np.int64),
+        right=np.concatenate(rights).astype(np.int64),
+        missing_go_to_left=np.concatenate(missing).astype(bool),
+        values=np.concatenate(values),
+        roots=roots,
+        max_depth=max_depth,
+        classes=np.asarray(forest.classes_),
+        n_features_in=int(forest.n_features_in_),
+    )
+    if hasattr(forest, KMER_PARAMS_ATTR):
+        setattr(compiled, KMER_PARAMS_ATTR, getattr(forest, KMER_PARAMS_ATTR))
+    return compiled
@@ -0,0 +1,197 @@
+"""
+Weighted ensemble of ``PredictClass`` models with shared featurization.
+
+Members whose vectorizers produce identical features (same type, settings,
+vocabulary and idf weights, e.g. the shipped RandomForest and SVM) form one
+group: a batch is featurised once per group, and every member then scores
+those features concurrently in a thread pool. sklearn's forest and libsvm
+inference and the NumPy engines release the GIL for most of their work.
+Member probabilities are averaged with normalised weights.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Literal, Sequence, Tuple
+
+import numpy as np
+
+from .predict_class import ModelName, Prediction, PredictClass
+
+ProbabilityMap = Dict[Literal["Host", "Virus"], float]
+
+
+def featurization_key(member: PredictClass) -> str:
+    """Digest of everything that determines ``member``'s input features."""
+    if member.model_name == "Evo2":
+        return f"evo2:{id(member.evo2_embedder)}"
+
+    vectorizer = member.vectorizer
+    parts: List[Any] = [type(vectorizer).__qualname__]
+    get_params = getattr(vectorizer, "get_params", None)
+    if get_params is not None:
+        parts.append(sorted(get_params().items()))
+    if member.kmer_tranformer is not None:
+        parts.append((member.kmer_tranformer.k, member.kmer_tranformer.canonical))
+    vocabulary = getattr(vectorizer, "vocabulary_", None)
+    if vocabulary is not None:
+        parts.append(sorted(vocabulary.items()))
+    for attribute in ("idf_", "column_offsets_"):
+        values = getattr(vectorizer, attribute, None)
+        if values is not None:
+            parts.append(np.asarray(values).tobytes())
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+class EnsemblePredictor:
+    """
+    Combine the probabilities of several ``PredictClass`` members.
+    Members are scored directly, bypassing any prediction cache they hold.
+
+    ``weights`` default to equal; they are normalised to sum to one. Exposes
+    the ``PredictClass`` prediction interface, with the label taken from the
+    combined probabilities (ties go to Host) and the confidence being its
+    combined probability.
+    """
+
+    model_name = "Ensemble"
+
+    def __init__(
+        self,
+        members: Sequence[PredictClass],
+        weights: Sequence[float] | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        if not members:
+            raise ValueError("An ensemble needs at least one member")
+        weights = [1.0] * len(members) if weights is None else list(weights)
+        if len(weights) != len(members):
+            raise ValueError(
+                f"Got {len(weights)} weights for {len(members)} ensemble members"
+            )
+        if any(weight < 0 for weight in weights) or sum(weights) <= 0:
+            raise ValueError(
+                "Ensemble weights must be non-negative with a positive sum"
+            )
+
+        self.members = list(members)
+        total = float(sum(weights))
+        self.weights = [weight / total for weight in weights]
+
+        # featurization key -> indices of the members sharing those features
+        self.groups: Dict[str, List[int]] = {}
+        for index, member in enumerate(self.members):
+            self.groups.setdefault(featurization_key(member), []).append(index)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(self.members),
+            thread_name_prefix="ensemble",
+        )
+
+    @classmethod
+    def from_model_names(
+        cls,
+        model_names: Sequence[ModelName],
+        weights: Sequence[float] | None = None,
+        backend: Literal["sklearn", "compiled"] = "sklearn",
+        max_workers: int | None = None,
+    ) -> "EnsemblePredictor":
+        members = [
+            PredictClass(model_name=name, backend=backend) for name in model_names
+        ]
+        return cls(members, weights=weights, max_workers=max_workers)
+
+    def close(self) -> None:
+        """Stop the scoring threads."""
+        self._executor.shutdown(wait=True)
+
+    def predict(self, sequence: str) -> Literal["Virus", "Host"]:
+        return self.predict_with_probabilities(sequence).label
+
+    def batch_predict(self, sequences: List[str]) -> List[Literal["Virus", "Host"]]:
+        return [
+            prediction.label
+            for prediction in self.batch_predict_with_probabilities(sequences)
+        ]
+
+    def predict_with_confidence(
+        self, sequence: str
+    ) -> Tuple[Literal["Virus", "Host"], float]:
+        return self.batch_predict_with_confidence([sequence])[0]
+
+    def batch_predict_with_confidence(
+        self, sequences: List[str]
+    ) -> List[Tuple[Literal["Virus", "Host"], float]]:
+        return [
+            (prediction.label, prediction.confidence)
+            for prediction in self.batch_predict_with_probabilities(sequences)
+        ]
+
+    def predict_probabilities(self, sequence: str) -> ProbabilityMap:
+        return self.predict_with_probabilities(sequence).probabilities
+
+    def batch_predict_probabilities(self, sequences: List[str]) -> List[ProbabilityMap]:
+        return [
+            prediction.probabilities
+            for prediction in self.batch_predict_with_probabilities(sequences)
+        ]
+
+    def predict_with_probabilities(self, sequence: str) -> Prediction:
+        return self.batch_predict_with_probabilities([sequence])[0]
+
+    def batch_predict_with_probabilities(
+        self, sequences: List[str]
+    ) -> List[Prediction]:
+        combined = self._combine(
+            self._score(lambda leader: leader._preprocess_batch(sequences))
+        )
+        leader = self.members[0]
+        return [leader._prediction_from_probabilities(row) for row in combined]
+
+    def predict_window_probabilities(
+        self, sequence: str, window: int, stride: int
+    ) -> List[Tuple[int, int, ProbabilityMap]]:
+        """Combined probabilities for every sliding window of ``sequence``."""
+        starts = np.empty(0, dtype=np.intp)
+
+        def window_features(leader: PredictClass) -> object:
+            nonlocal starts
+            starts, features = leader._window_features(sequence, window, stride)
+            return features
+
+        combined = self._combine(self._score(window_features))
+        return [
+            (int(start), min(int(start) + window, len(sequence)), probabilities)
+            for start, probabilities in zip(starts, combined)
+        ]
+
+    def _score(
+        self, featurize: Callable[[PredictClass], object]
+    ) -> List[List[ProbabilityMap]]:
+        """Per-member probability maps, featurising once per group."""
+        scores: List[List[ProbabilityMap]] = [[] for _ in self.members]
+        if len(self.members) == 1:
+            member = self.members[0]
+            scores[0] = member._single_pass_probability_maps(featurize(member))
+            return scores
+
+        futures = {}
+        for indices in self.groups.values():
+            features = featurize(self.members[indices[0]])
+            for index in indices:
+                futures[index] = self._executor.submit(
+                    self.members[index]._single_pass_probability_maps, features
+                )
+        for index, future in futures.items():
+            scores[index] = future.result()
+        return scores
+
+    def _combine(self, scores: List[List[ProbabilityMap]]) -> List[ProbabilityMap]:
+        combined: List[ProbabilityMap] = []
+        for rows in zip(*scores):
+            virus = sum(
+                weight * row["Virus"] for weight, row in zip(self.weights, rows)
+            )
+            host = sum(weight * row["Host"] for weight, row in zip(self.weights, rows))
+            combined.append({"Host": host, "Virus": virus})
+        return combined
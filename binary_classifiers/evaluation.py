@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Literal, Protocol, Sequence
+from typing import Any, Dict, List, Protocol, Sequence
 
 from sklearn.metrics import (  # type: ignore[import-untyped]
     accuracy_score,
@@ -15,7 +16,7 @@ from sklearn.metrics import (  # type: ignore[import-untyped]
 
 from metaseq.dataio import load_sequences
 
-from .predict_class import LABEL_MAP
+from .predict_class import LABEL_MAP, Prediction
 
 LABEL_TO_INT = {label: class_id for class_id, label in LABEL_MAP.items()}
 
@@ -28,11 +29,9 @@ class LabeledSequence:
 
 
 class EvaluationPredictor(Protocol):
-    def batch_predict(self, sequences: List[str]) -> List[Literal["Virus", "Host"]]: ...
-
-    def batch_predict_probabilities(
+    def batch_predict_with_probabilities(
         self, sequences: List[str]
-    ) -> List[Dict[Literal["Host", "Virus"], float]]: ...
+    ) -> List[Prediction]: ...
 
 
 def load_labeled_sequences(virus_file: str, host_file: str) -> List[LabeledSequence]:
@@ -51,6 +50,53 @@ def load_labeled_sequences(virus_file: str, host_file: str) -> List[LabeledSeque
     return labeled_sequences
 
 
+def measure_throughput(
+    predictor: EvaluationPredictor, sequences: Sequence[str], repeats: int = 3
+) -> Dict[str, float]:
+    """Best-of-``repeats`` wall time of one batch prediction over ``sequences``."""
+    batch = list(sequences)
+    best = float("inf")
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        predictor.batch_predict_with_probabilities(batch)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "sequences": len(batch),
+        "seconds": best,
+        "sequences_per_second": len(batch) / best if best > 0 else 0.0,
+    }
+
+
+def compare_predictions(
+    reference: Sequence[Prediction], candidate: Sequence[Prediction]
+) -> Dict[str, Any]:
+    """Label agreement and Virus-probability error of ``candidate`` against
+    ``reference`` predictions of the same sequences."""
+    if len(reference) != len(candidate):
+        raise ValueError(
+            f"Got {len(candidate)} predictions to compare with {len(reference)}"
+        )
+    if not reference:
+        raise ValueError("At least one prediction is required for comparison")
+
+    errors = [
+        abs(got.probabilities["Virus"] - want.probabilities["Virus"])
+        for want, got in zip(reference, candidate)
+    ]
+    disagreements = [
+        index
+        for index, (want, got) in enumerate(zip(reference, candidate))
+        if want.label != got.label
+    ]
+    return {
+        "sequences": len(reference),
+        "label_agreement": 1.0 - len(disagreements) / len(reference),
+        "disagreements": disagreements,
+        "max_abs_error": max(errors),
+        "mean_abs_error": sum(errors) / len(errors),
+    }
+
+
 def evaluate_predictor(
     predictor: EvaluationPredictor,
     labeled_sequences: Sequence[LabeledSequence],
@@ -60,11 +106,13 @@ def evaluate_predictor(
 
     sequences = [item.sequence for item in labeled_sequences]
     true_labels = [item.label for item in labeled_sequences]
-    predicted_labels = predictor.batch_predict(sequences)
+    predictions = predictor.batch_predict_with_probabilities(sequences)
+    predicted_labels = [prediction.label for prediction in predictions]
     predicted_label_ids = [LABEL_TO_INT[label] for label in predicted_labels]
-    probability_maps = predictor.batch_predict_probabilities(sequences)
-    virus_probabilities = [probabilities["Virus"] for probabilities in probability_maps]
-    confidences = [max(probabilities.values()) for probabilities in probability_maps]
+    virus_probabilities = [
+        prediction.probabilities["Virus"] for prediction in predictions
+    ]
+    confidences = [prediction.confidence for prediction in predictions]
 
     metrics: Dict[str, Any] = {
         "total_sequences": len(labeled_sequences),
@@ -0,0 +1,125 @@
+"""
+Supervised k-mer feature selection for vocabulary-based artifacts.
+
+A selector scores every k-mer column on the training data (chi2, mutual
+information or the weights of an L1 logistic regression) and keeps the
+``n_features`` best. ``restrict_vocabulary`` then rewrites the fitted
+vectorizer so it only emits those columns. ``PredictClass`` compiles the
+vocabulary into its ``KmerFeaturizer``, so at inference only the selected
+k-mers are counted and the model is evaluated on the narrower matrix.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Dict, Sequence
+
+import numpy as np
+from sklearn.feature_selection import (  # type: ignore[import-untyped]
+    SelectFromModel,
+    SelectKBest,
+    chi2,
+    mutual_info_classif,
+)
+from sklearn.linear_model import LogisticRegression  # type: ignore[import-untyped]
+
+SELECTION_METHODS = ("chi2", "mutual_info", "l1")
+# Recorded on a restricted vectorizer: method and column counts.
+SELECTION_ATTR = "baio_kmer_selection_"
+
+
+def build_selector(
+    method: str = "chi2",
+    n_features: int = 500,
+    C: float = 1.0,
+    random_state: int | None = None,
+) -> Any:
+    """
+    Unfitted sklearn selector keeping the ``n_features`` best k-mer columns.
+
+    ``"chi2"`` and ``"mutual_info"`` rank columns by their univariate score
+    against the labels; ``"l1"`` ranks them by the absolute weight of an
+    L1-regularised logistic regression with inverse strength ``C``.
+    """
+    if n_features < 1:
+        raise ValueError(f"n_features must be positive, got {n_features}")
+    if method == "chi2":
+        return SelectKBest(chi2, k=n_features)
+    if method == "mutual_info":
+        # The partial keeps the selector picklable.
+        score = partial(mutual_info_classif, random_state=random_state)
+        return SelectKBest(score, k=n_features)
+    if method == "l1":
+        return SelectFromModel(
+            LogisticRegression(
+                penalty="l1", solver="liblinear", C=C, random_state=random_state
+            ),
+            max_features=n_features,
+            threshold=-np.inf,
+        )
+    raise ValueError(
+        f"Unknown feature selection method: {method}. "
+        f"Expected one of {SELECTION_METHODS}"
+    )
+
+
+def select_columns(
+    X: Any, y: Any, method: str = "chi2", n_features: int = 500, **kwargs: Any
+) -> np.ndarray:
+    """Sorted indices of the columns of ``X`` the selector keeps."""
+    n_features = min(n_features, X.shape[1])
+    selector = build_selector(method, n_features, **kwargs).fit(X, y)
+    return np.asarray(selector.get_support(indices=True), dtype=np.intp)
+
+
+def restrict_vocabulary(
+    vectorizer: Any, columns: Sequence[int], method: str | None = None
+) -> Any:
+    """
+    Keep only ``columns`` of a fitted ``CountVectorizer``/``TfidfVectorizer``.
+
+    The kept tokens are renumbered in column order, so the vectorizer's
+    output equals ``X[:, sorted(columns)]`` of its previous output (before
+    any tf-idf row normalisation, which then spans the kept columns). idf
+    weights are sliced to match. The vectorizer is modified in place and
+    returned.
+    """
+    vocabulary: Dict[str, int] | None = getattr(vectorizer, "vocabulary_", None)
+    if vocabulary is None:
+        raise ValueError(
+            f"Cannot restrict {type(vectorizer).__name__}: it has no fitted vocabulary"
+        )
+    kept = np.unique(np.asarray(columns, dtype=np.intp))
+    if len(kept) == 0:
+        raise ValueError("At least one column must be kept")
+    if kept[0] < 0 or kept[-1] >= len(vocabulary):
+        raise ValueError(
+            f"Columns must lie in [0, {len(vocabulary)}), got {kept[0]}..{kept[-1]}"
+        )
+
+    tokens = sorted(vocabulary, key=vocabulary.__getitem__)
+    idf = (
+        getattr(vectorizer, "idf_", None)
+        if getattr(vectorizer, "use_idf", False)
+        else None
+    )
+    n_candidates = len(vocabulary)
+    vectorizer.vocabulary_ = {
+        tokens[column]: index for index, column in enumerate(kept)
+    }
+    if idf is not None:
+        vectorizer.idf_ = np.asarray(idf)[kept]
+        # TfidfVectorizer validates widths against its inner transformer.
+        inner = getattr(vectorizer, "_tfidf", None)
+        if inner is not None:
+            inner.n_features_in_ = len(kept)
+    setattr(
+        vectorizer,
+        SELECTION_ATTR,
+        {
+            "method": method,
+            "n_features": len(kept),
+            "n_candidates": n_candidates,
+        },
+    )
+    return vectorizer
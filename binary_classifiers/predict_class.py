@@ -1,41 +1,157 @@
 from __future__ import annotations
 
+import hashlib
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Literal, Sequence, Tuple
 
 import joblib  # type: ignore[import-untyped] # noqa: E402
-
+import numpy as np
+
+from .artifact_bundle import (
+    MANIFEST_FILE,
+    bundle_matches_sources,
+    bundle_path,
+    load_bundle_entry,
+    read_manifest,
+)
+from .artifacts import check_kmer_compatibility
+from .compiled_forest import CompiledForest, compile_forest
+from .compiled_svm import compile_svm
+from .prediction_cache import PredictionCache, cache_key
+from .transformers.kmer_encoding import window_starts
+from .transformers.kmer_featurizer import KmerFeaturizer
 from .transformers.kmers_transformer import (
     KmerTransformer,
+    MultiKmerTransformer,
 )  # noqa: E402
 
 LABEL_MAP = {0: "Host", 1: "Virus"}
-MODEL_FILE_MAP = {
+# Models served from k-mer artifacts, and every model PredictClass serves.
+# Each must have a MODEL_FILE_MAP entry; scripts take their choices from it.
+KmerModelName = Literal[
+    "RandomForest", "SVM", "FastSVM", "ApproxSVM", "NaiveBayes", "Student"
+]
+ModelName = Literal[KmerModelName, "Evo2"]
+MODEL_FILE_MAP: Dict[ModelName, Tuple[str, str | None]] = {
     "RandomForest": ("random_forest_best_model.pkl", "random_forest_vectorizer.pkl"),
     "SVM": (
         "support_vector_machine_best_model.pkl",
         "support_vector_machine_vectorizer.pkl",
     ),
+    # The SVM artifacts, served by the NumPy kernel engine in compiled_svm.
+    "FastSVM": (
+        "support_vector_machine_best_model.pkl",
+        "support_vector_machine_vectorizer.pkl",
+    ),
+    # Nystroem features + calibrated linear SVM (metaseq.models); produced by
+    # scripts/retrain_model.py, not shipped with the repository.
+    "ApproxSVM": ("approx_svm_best_model.pkl", "approx_svm_vectorizer.pkl"),
+    # Multinomial naive Bayes over full k-mer spectrum counts: a few 4**k
+    # vectors, loads in milliseconds. Also produced by retrain_model.py.
+    "NaiveBayes": ("naive_bayes_best_model.pkl", "naive_bayes_vectorizer.pkl"),
+    # Compact student distilled from RandomForest + SVM by
+    # ``python -m metaseq.train --distill`` (not shipped).
+    "Student": ("student_best_model.pkl", "student_vectorizer.pkl"),
     "Evo2": ("evo2_classifier.pkl", None),  # Evo2 uses its own embeddings
 }
+MODEL_NAMES: Tuple[str, ...] = tuple(MODEL_FILE_MAP)
+KMER_MODEL_NAMES: Tuple[str, ...] = tuple(
+    name for name, (_, vectorizer) in MODEL_FILE_MAP.items() if vectorizer is not None
+)
+# "compiled" swaps tree forests for the flat-array engine in compiled_forest;
+# models without a compiled engine keep running through sklearn.
+BACKENDS = ("sklearn", "compiled")
+# Model names whose artifacts always run on a compiled engine:
+# name -> (artifact bundle entry, compiler).
+COMPILED_MODELS: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    "FastSVM": ("compiled_svm", compile_svm),
+}
+# "float32" featurises into float32 CSR matrices (int32 indices) and runs
+# compiled engines on float32 arrays; "float64" is the reference path.
+PRECISIONS = ("float64", "float32")
+
+
+@dataclass(frozen=True)
+class Prediction:
+    """Label, its confidence and the full probability map of one sequence."""
+
+    label: Literal["Virus", "Host"]
+    confidence: float
+    probabilities: Dict[Literal["Host", "Virus"], float]
+    # Trees evaluated for this sequence by anytime forest inference.
+    trees_used: int | None = None
+
+
+def _artifact_version(*paths: Path) -> str:
+    """Cheap fingerprint of artifact files (name, size and mtime)."""
+    digest = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            digest.update(f"{path.name};".encode())
+            continue
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def _reads_float32(model: Any) -> bool:
+    """True for models that run on float32 features: compact compiled engines
+    and sklearn tree ensembles, which cast their input to float32 anyway."""
+    if hasattr(model, "compact"):
+        return True
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None or len(estimators) == 0:
+        return False
+    return all(hasattr(estimator, "tree_") for estimator in np.ravel(estimators))
 
 
 class PredictClass:
     def __init__(
-        self, model_name: Literal["RandomForest", "SVM", "Evo2"] = "RandomForest"
+        self,
+        model_name: ModelName = "RandomForest",
+        cache: PredictionCache | None = None,
+        backend: Literal["sklearn", "compiled"] = "sklearn",
+        precision: Literal["float64", "float32"] = "float64",
     ) -> None:
-        """Initialize the predictor class."""
+        """Initialize the predictor class.
+
+        ``cache`` optionally memoises probability maps per (model, artifact
+        version, sequence); it may be shared between predictors. ``backend``
+        selects the inference engine at load time (see ``BACKENDS``).
+        ``precision="float32"`` is the compact mode (see ``PRECISIONS``);
+        models that would upcast float32 input (e.g. sklearn's SVC) keep
+        float64 features. Labels may differ from the float64 path only for
+        near-ties; check with ``scripts/validate_precision.py``.
+        """
 
         self.model_name = model_name
         if self.model_name not in MODEL_FILE_MAP:
             raise ValueError(
                 f"Unsupported model_name '{self.model_name}'. Expected one of: {tuple(MODEL_FILE_MAP)}"
             )
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unsupported backend '{backend}'. Expected one of: {BACKENDS}"
+            )
+        self.backend = backend
+        if precision not in PRECISIONS:
+            raise ValueError(
+                f"Unsupported precision '{precision}'. Expected one of: {PRECISIONS}"
+            )
+        self.precision = precision
+        # Set at load time: whether features are produced as float32.
+        self.float32_features = False
 
         self.model: Any | None = None
         self.vectorizer: Any | None = None
         self.kmer_tranformer: KmerTransformer | None = None
         self.evo2_embedder: Any | None = None
+        self.featurizer: KmerFeaturizer | MultiKmerTransformer | None = None
+        self.cache = cache
+        self.artifact_version = ""
+        self._anytime_forest: CompiledForest | None = None
 
         if self.model_name == "Evo2":
             self._configure_evo2()
@@ -65,6 +181,8 @@ class PredictClass:
             return
 
         self.model = joblib.load(evo2_model_path)
+        self.artifact_version = _artifact_version(evo2_model_path)
+        self._apply_backend()
         print("Evo 2 embedder loaded successfully!")
 
     def _fallback_to_random_forest(self) -> None:
@@ -74,17 +192,75 @@ class PredictClass:
 
     def _load_kmer_pipeline(
         self,
-        model_name: Literal["RandomForest", "SVM"],
+        model_name: KmerModelName,
     ) -> None:
         base_dir = Path(__file__).resolve().parent
         model_file, vectorizer_file = MODEL_FILE_MAP[model_name]
-        self.model = joblib.load(base_dir / "models" / model_file)
-        self.kmer_tranformer = KmerTransformer()
-
         if vectorizer_file is None:
             raise ValueError(f"Expected vectorizer artifact for model '{model_name}'")
 
-        self.vectorizer = joblib.load(base_dir / "transformers" / vectorizer_file)
+        model_path = base_dir / "models" / model_file
+        vectorizer_path = base_dir / "transformers" / vectorizer_file
+        bundle = bundle_path(model_path)
+        featurizer: KmerFeaturizer | None = None
+        if bundle.is_dir() and bundle_matches_sources(
+            bundle, (model_path, vectorizer_path)
+        ):
+            # Large arrays are memory-mapped and shared between processes.
+            entries = read_manifest(bundle)["entries"]
+            model_entry = "model"
+            if model_name in COMPILED_MODELS:
+                model_entry = COMPILED_MODELS[model_name][0]
+            elif self.backend == "compiled":
+                model_entry = "compiled_model"
+            if model_entry not in entries:
+                model_entry = "model"
+            self.model = load_bundle_entry(bundle, model_entry)
+            self.vectorizer = load_bundle_entry(bundle, "vectorizer")
+            if "featurizer" in entries:
+                featurizer = load_bundle_entry(bundle, "featurizer")
+            self.artifact_version = _artifact_version(bundle / MANIFEST_FILE)
+        else:
+            if bundle.is_dir():
+                print(f"Ignoring stale artifact bundle {bundle}")
+            self.model = joblib.load(model_path)
+            self.vectorizer = joblib.load(vectorizer_path)
+            self.artifact_version = _artifact_version(model_path, vectorizer_path)
+
+        kmer_params = check_kmer_compatibility(self.model, self.vectorizer)
+        self._apply_backend()
+        if isinstance(self.vectorizer, MultiKmerTransformer):
+            # Multi-k spectra are counted straight from the sequences using
+            # the column offsets stored in the artifact.
+            self.featurizer = self.vectorizer
+            return
+
+        self.kmer_tranformer = KmerTransformer(
+            k=kmer_params["k"], canonical=kmer_params["canonical"]
+        )
+
+        # Compiled once per model load so requests skip k-mer strings and
+        # regex tokenisation; None means the vectorizer needs the text path.
+        self.featurizer = featurizer or KmerFeaturizer.from_vectorizer(
+            self.vectorizer,
+            self.kmer_tranformer.k,
+            canonical=self.kmer_tranformer.canonical,
+        )
+        if self.float32_features and self.featurizer is not None:
+            self.featurizer = self.featurizer.compact()
+
+    def _apply_backend(self) -> None:
+        if self.model_name in COMPILED_MODELS:
+            self.model = COMPILED_MODELS[self.model_name][1](self.model)
+        elif self.backend == "compiled":
+            try:
+                self.model = compile_forest(self.model)
+            except ValueError:
+                pass  # no compiled engine for this model type
+        if self.precision == "float32":
+            if hasattr(self.model, "compact"):
+                self.model = self._require_model().compact()
+            self.float32_features = _reads_float32(self.model)
 
     def _require_model(self) -> Any:
         if self.model is None:
@@ -116,14 +292,91 @@ class PredictClass:
     def predict_probabilities(
         self, sequence: str
     ) -> Dict[Literal["Host", "Virus"], float]:
-        features = self._preprocess(sequence)
-        return self._probability_mapping_for_features(features)
+        return self.batch_predict_probabilities([sequence])[0]
 
     def batch_predict_probabilities(
         self, sequences: List[str]
     ) -> List[Dict[Literal["Host", "Virus"], float]]:
-        features = self._preprocess_batch(sequences)
-        return self._batch_probability_mappings_for_features(features)
+        return self._single_pass_probability_maps(self._preprocess_batch(sequences))
+
+    def predict_with_probabilities(self, sequence: str) -> Prediction:
+        return self.batch_predict_with_probabilities([sequence])[0]
+
+    def batch_predict_with_probabilities(
+        self, sequences: List[str]
+    ) -> List[Prediction]:
+        """Label, confidence and probability map of every sequence.
+
+        Sequences are featurised once and scored with a single
+        ``predict_proba`` call (plus ``predict`` for models with a decision
+        function, whose probability maps are aligned with it row by row); the
+        label is the more probable class (ties go to Host) and the confidence
+        its probability. Models without ``predict_proba`` fall back to
+        ``predict`` with confidence 1.
+        Results are served from ``cache`` when one is configured.
+        """
+        return [
+            self._prediction_from_probabilities(probabilities)
+            for probabilities in self._cached_probability_maps(sequences)
+        ]
+
+    def batch_predict_anytime(
+        self,
+        sequences: List[str],
+        block_size: int = 10,
+        confidence: float | None = None,
+    ) -> List[Prediction]:
+        """Forest predictions that stop evaluating trees early.
+
+        See ``CompiledForest.predict_proba_anytime``: each sequence stops once
+        its label can no longer change, or its running confidence reaches
+        ``confidence``, and its Prediction records ``trees_used``. Sequences
+        that use every tree get the full forest's probabilities. Bypasses the
+        cache; raises ValueError for models that are not tree forests.
+        """
+        if self._anytime_forest is None:
+            self._anytime_forest = compile_forest(self._require_model())
+            if self.precision == "float32":
+                self._anytime_forest = self._anytime_forest.compact()
+        forest = self._anytime_forest
+        probabilities, trees_used = forest.predict_proba_anytime(
+            self._preprocess_batch(sequences), block_size, confidence
+        )
+        return [
+            replace(
+                self._prediction_from_probabilities(
+                    self._map_probabilities_to_labels(list(forest.classes_), row)
+                ),
+                trees_used=int(used),
+            )
+            for row, used in zip(probabilities, trees_used)
+        ]
+
+    def _cached_probability_maps(
+        self, sequences: List[str]
+    ) -> List[Dict[Literal["Host", "Virus"], float]]:
+        if self.cache is None:
+            return self._single_pass_probability_maps(self._preprocess_batch(sequences))
+
+        # Only featurise and score the sequences that are not cached yet.
+        keys = [self._cache_key(sequence) for sequence in sequences]
+        results: List[Dict[Literal["Host", "Virus"], float] | None] = [
+            self.cache.get(key) for key in keys
+        ]
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            features = self._preprocess_batch([sequences[index] for index in missing])
+            computed = self._single_pass_probability_maps(features)
+            for index, probabilities in zip(missing, computed):
+                self.cache.put(keys[index], dict(probabilities))
+                results[index] = probabilities
+        return [dict(result) for result in results if result is not None]
+
+    def _cache_key(self, sequence: str) -> str:
+        version = self.artifact_version
+        if self.precision != "float64":
+            version = f"{version}:{self.precision}"
+        return cache_key(self.model_name, version, sequence)
 
     def predict_with_confidence(
         self, sequence: str
@@ -146,17 +399,38 @@ class PredictClass:
             for prediction, confidence in zip(predictions, confidences)
         ]
 
+    def predict_window_probabilities(
+        self, sequence: str, window: int, stride: int
+    ) -> List[Tuple[int, int, Dict[Literal["Host", "Virus"], float]]]:
+        """Probabilities for every sliding window of ``sequence``.
+
+        Returns ``(start, end, probabilities)`` per window, in order. All
+        windows are scored as one batch; k-mer models featurise them with
+        incremental counts instead of recounting each window.
+        """
+        starts, features = self._window_features(sequence, window, stride)
+        probabilities = self._single_pass_probability_maps(features)
+        return [
+            (int(start), min(int(start) + window, len(sequence)), window_probabilities)
+            for start, window_probabilities in zip(starts, probabilities)
+        ]
+
+    def _window_features(
+        self, sequence: str, window: int, stride: int
+    ) -> Tuple[np.ndarray, object]:
+        """Window start offsets of ``sequence`` and the features of each window."""
+        starts = window_starts(len(sequence), window, stride)
+        if self.model_name != "Evo2" and isinstance(self.featurizer, KmerFeaturizer):
+            return starts, self.featurizer.transform_windows(sequence, window, stride)
+        return starts, self._preprocess_batch(
+            [sequence[start : start + window] for start in starts]
+        )
+
     def _preprocess(self, sequence: str) -> object:
         if self.model_name == "Evo2":
             return self._preprocess_with_evo2(sequence)
 
-        if self.kmer_tranformer is None or self.vectorizer is None:
-            raise RuntimeError(
-                f"Model '{self.model_name}' does not have a k-mer preprocessing pipeline"
-            )
-
-        kmers = self.kmer_tranformer.transform([sequence])
-        return self.vectorizer.transform(kmers)
+        return self._kmer_features([sequence])
 
     def _preprocess_batch(self, sequences: List[str]) -> object:
         if self.model_name == "Evo2":
@@ -168,13 +442,24 @@ class PredictClass:
                 raise RuntimeError("Evo 2 batch embedding generation failed")
             return embeddings
 
-        if self.kmer_tranformer is None or self.vectorizer is None:
+        return self._kmer_features(sequences)
+
+    def _kmer_features(self, sequences: List[str]) -> object:
+        if self.vectorizer is not None and self.featurizer is not None:
+            features = self.featurizer.transform(sequences)
+        elif self.kmer_tranformer is None or self.vectorizer is None:
             raise RuntimeError(
                 f"Model '{self.model_name}' does not have a k-mer preprocessing pipeline"
             )
+        else:
+            kmers = self.kmer_tranformer.transform(sequences)
+            features = self.vectorizer.transform(kmers)
 
-        kmers = self.kmer_tranformer.transform(sequences)
-        return self.vectorizer.transform(kmers)
+        if self.float32_features and features.dtype != np.float32:
+            # Vectorizers without a compact featurizer (multi-k spectra, the
+            # text path) are cast once here.
+            features = features.astype(np.float32)
+        return features
 
     def _prediction_to_label(self, prediction: Any) -> Literal["Virus", "Host"]:
         if isinstance(prediction, str):
@@ -227,34 +512,34 @@ class PredictClass:
         # Return the maximum probability from model
         return max(probabilities)
 
-    def _probability_mapping_for_features(
-        self, features: object
-    ) -> Dict[Literal["Host", "Virus"], float]:
-        model = self._require_model()
-        if not hasattr(model, "predict_proba"):
-            raise ValueError(
-                f"Model '{self.model_name}' does not expose predict_proba and cannot return probabilities"
-            )
-
-        probabilities = model.predict_proba(features)[0]
-        predicted_label = self._prediction_to_label(model.predict(features)[0])
-        return self._map_probabilities_to_labels(
-            classes=getattr(model, "classes_", []),
-            probabilities=probabilities,
-            predicted_label=predicted_label,
-        )
-
-    def _batch_probability_mappings_for_features(
+    def _single_pass_probability_maps(
         self, features: object
     ) -> List[Dict[Literal["Host", "Virus"], float]]:
         model = self._require_model()
         if not hasattr(model, "predict_proba"):
-            raise ValueError(
-                f"Model '{self.model_name}' does not expose predict_proba and cannot return probabilities"
-            )
+            return [
+                self._map_probabilities_to_labels(
+                    classes=["Host", "Virus"],
+                    probabilities=[float(label == "Host"), float(label == "Virus")],
+                )
+                for label in map(self._prediction_to_label, model.predict(features))
+            ]
 
         probabilities = model.predict_proba(features)
         model_classes = getattr(model, "classes_", [])
+        if not hasattr(model, "decision_function"):
+            # predict is the argmax of predict_proba, so the maps already
+            # agree with it.
+            return [
+                self._map_probabilities_to_labels(
+                    classes=model_classes, probabilities=row_probabilities
+                )
+                for row_probabilities in probabilities
+            ]
+
+        # predict follows the decision function (e.g. an SVM, whose Platt
+        # probabilities can disagree with it), so each row's map is aligned
+        # with that row's predicted label.
         predictions = model.predict(features)
         return [
             self._map_probabilities_to_labels(
@@ -265,6 +550,16 @@ class PredictClass:
             for prediction, row_probabilities in zip(predictions, probabilities)
         ]
 
+    def _prediction_from_probabilities(
+        self, probabilities: Dict[Literal["Host", "Virus"], float]
+    ) -> Prediction:
+        label: Literal["Virus", "Host"] = (
+            "Virus" if probabilities["Virus"] > probabilities["Host"] else "Host"
+        )
+        return Prediction(
+            label=label, confidence=probabilities[label], probabilities=probabilities
+        )
+
     def _map_probabilities_to_labels(
         self,
         classes: Sequence[Any],
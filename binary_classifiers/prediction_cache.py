@@ -0,0 +1,107 @@
+"""
+Content-addressed cache of prediction results.
+
+Entries are keyed by a hash of (model name, artifact version, normalised
+sequence), so re-submitted sequences skip featurisation and model evaluation,
+and retraining a model (a new artifact version) can never serve stale
+results. The cache is a bounded LRU with an optional time-to-live and is safe
+to share between threads and between ``PredictClass`` instances.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def normalize_sequence(sequence: str) -> str:
+    """Canonical form used for cache keys.
+
+    Case and surrounding whitespace never change k-mer features, so
+    ``"acgt\\n"`` and ``"ACGT"`` share an entry.
+    """
+    return sequence.strip().upper()
+
+
+def cache_key(model_name: str, artifact_version: str, sequence: str) -> str:
+    """Hash identifying a prediction for ``sequence`` by a specific model."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (model_name, artifact_version):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(normalize_sequence(sequence).encode("ascii", "replace"))
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with optional TTL and hit/miss counters."""
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None, counting a hit or a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. after models are reloaded); keeps counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, stored_at: float) -> bool:
+        return (
+            self.ttl_seconds is not None
+            and self._clock() - stored_at > self.ttl_seconds
+        )
@@ -0,0 +1,608 @@
+"""
+NumPy k-mer counting engine.
+
+Packs A/C/G/T into 2-bit codes and computes integer k-mer indices for a whole
+batch of sequences at once, so k-mer spectra can be built as sparse matrices
+without materialising k-mer strings. Spectra for several k (e.g. 4-, 5- and
+6-mers side by side) are counted from one rolling code per sequence.
+
+Sequences longer than ``DEFAULT_CHUNK_SIZE`` (assembled genomes and other
+long contigs) are streamed in fixed-size chunks into a dense count vector, so
+peak memory is O(chunk + 4**k) instead of O(sequence length). Sliding-window
+spectra of one sequence are built incrementally: each k-mer is added when it
+enters a window and dropped when it leaves, instead of recounting windows.
+
+When numba is installed the counting is delegated to the parallel kernel in
+``kmer_kernels``; both paths produce identical matrices.
+
+The semantics mirror ``KmerTransformer._get_kmers`` followed by a fitted
+``CountVectorizer``: ``N`` bases are removed before windowing (so the bases on
+either side of an ``N`` run are joined), and any window that contains another
+non-ACGT character (IUPAC codes, whitespace, ...) is dropped because it can
+never match a vocabulary entry.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache, partial
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse  # type: ignore[import-untyped]
+
+from . import kmer_kernels
+from .kmer_kernels import INVALID_BASE, SKIP_BASE
+
+NUCLEOTIDES = "ACGT"
+MAX_K = 31  # 2 bits per base must fit in a signed 64-bit code
+DEFAULT_CHUNK_SIZE = 1 << 22  # bases per chunk when streaming long sequences
+WINDOW_BLOCK_CELLS = 1 << 22  # dense (window x column) cells per window block
+
+BASE_CODES = np.full(256, INVALID_BASE, dtype=np.uint8)
+for _code, _base in enumerate(NUCLEOTIDES):
+    BASE_CODES[ord(_base)] = _code
+    BASE_CODES[ord(_base.lower())] = _code
+BASE_CODES[ord("N")] = SKIP_BASE
+BASE_CODES[ord("n")] = SKIP_BASE
+
+_COMPLEMENT = str.maketrans(NUCLEOTIDES, "TGCA")
+
+
+def _check_k(k: int) -> None:
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}, got {k}")
+
+
+def kmer_to_code(kmer: str) -> Optional[int]:
+    """Return the 2-bit integer code for ``kmer`` or None if it is not pure ACGT."""
+    code = 0
+    for base in kmer.upper():
+        index = NUCLEOTIDES.find(base)
+        if index < 0:
+            return None
+        code = (code << 2) | index
+    return code
+
+
+def code_to_kmer(code: int, k: int) -> str:
+    """Inverse of :func:`kmer_to_code` for a k-mer of length ``k``."""
+    bases = []
+    for _ in range(k):
+        bases.append(NUCLEOTIDES[code & 3])
+        code >>= 2
+    return "".join(reversed(bases))
+
+
+def canonical_kmer(kmer: str) -> str:
+    """Return the lexicographically smaller of ``kmer`` and its reverse complement.
+
+    For pure-ACGT k-mers lexicographic order equals 2-bit code order, so this
+    agrees with the canonical codes produced by the counting engine. k-mers
+    with other characters have no reverse complement and are returned as is.
+    """
+    if kmer.strip(NUCLEOTIDES):
+        return kmer
+    return min(kmer, kmer.translate(_COMPLEMENT)[::-1])
+
+
+def _reverse_complement_codes(codes: np.ndarray, k: int) -> np.ndarray:
+    reverse = np.zeros_like(codes)
+    for _ in range(k):
+        reverse = (reverse << 2) | (3 - (codes & 3))
+        codes = codes >> 2
+    return reverse
+
+
+@lru_cache(maxsize=None)
+def canonical_index(k: int) -> np.ndarray:
+    """Dense column index for canonical k-mers.
+
+    Maps every k-mer code to the column of its canonical form, so a k-mer and
+    its reverse complement share a column. Columns are ordered by canonical
+    code; there are ``(4**k + 4**(k // 2)) // 2`` of them for even ``k``.
+    """
+    _check_k(k)
+    codes = np.arange(4**k, dtype=np.int64)
+    canonical = np.minimum(codes, _reverse_complement_codes(codes, k))
+    _, inverse = np.unique(canonical, return_inverse=True)
+    index: np.ndarray = inverse.astype(np.int32)
+    index.setflags(write=False)
+    return index
+
+
+def n_canonical_kmers(k: int) -> int:
+    """Number of distinct canonical k-mers (columns of :func:`canonical_index`)."""
+    return int(canonical_index(k).max()) + 1
+
+
+def _sequence_bytes(sequence: str) -> np.ndarray:
+    # "replace" keeps one byte per character, so positions line up with the str.
+    return np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)
+
+
+def encode_sequence(sequence: str) -> np.ndarray:
+    """Encode a sequence as uint8 base codes (0-3 for ACGT, 4 otherwise).
+
+    ``N``/``n`` bases are dropped, matching ``KmerTransformer``.
+    """
+    bases = BASE_CODES[_sequence_bytes(sequence)]
+    encoded: np.ndarray = bases[bases != SKIP_BASE]
+    return encoded
+
+
+def _window_codes(
+    bases: np.ndarray, k: int, canonical: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling k-mer codes for every window start plus a validity mask.
+
+    With ``canonical`` each code is the minimum of the forward and
+    reverse-complement codes, computed in the same pass.
+    """
+    n_windows = len(bases) - k + 1
+    if n_windows <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+
+    invalid_prefix = np.zeros(len(bases) + 1, dtype=np.int64)
+    np.cumsum(bases == INVALID_BASE, out=invalid_prefix[1:])
+    valid = invalid_prefix[k:] == invalid_prefix[:-k]
+
+    codes = np.zeros(n_windows, dtype=np.int64)
+    for offset in range(k):
+        codes <<= 2
+        codes |= bases[offset : offset + n_windows]
+    if canonical:
+        reverse = np.zeros(n_windows, dtype=np.int64)
+        for offset in range(k):
+            window = bases[offset : offset + n_windows].astype(np.int64)
+            reverse |= (3 - window) << (2 * offset)
+        np.minimum(codes, reverse, out=codes)
+    return codes, valid
+
+
+def kmer_codes(sequence: str, k: int = 6, canonical: bool = False) -> np.ndarray:
+    """Return the codes of every valid overlapping k-mer of ``sequence`` in order."""
+    _check_k(k)
+    codes, valid = _window_codes(encode_sequence(sequence), k, canonical)
+    valid_codes: np.ndarray = codes[valid]
+    return valid_codes
+
+
+def batch_kmer_codes(
+    sequences: Sequence[str], k: int = 6, canonical: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute k-mer codes for a batch of sequences in one vectorised pass.
+
+    Returns ``(codes, rows)`` where ``rows[i]`` is the index of the sequence
+    that produced ``codes[i]``.
+    """
+    _check_k(k)
+    lengths = np.fromiter((len(seq) for seq in sequences), dtype=np.int64)
+    bases = BASE_CODES[_sequence_bytes("".join(sequences))]
+    rows = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+
+    keep = bases != SKIP_BASE
+    if not keep.all():
+        bases = bases[keep]
+        rows = rows[keep]
+
+    codes, valid = _window_codes(bases, k, canonical)
+    n_windows = len(codes)
+    if n_windows:
+        # Windows must not straddle two sequences of the batch.
+        valid &= rows[k - 1 :] == rows[:n_windows]
+    return codes[valid], rows[:n_windows][valid]
+
+
+def counts_to_csr(
+    columns: np.ndarray,
+    rows: np.ndarray,
+    n_rows: int,
+    n_columns: int,
+    dtype: Any = np.int64,
+) -> Any:
+    """Aggregate ``(row, column)`` occurrences into a CSR count matrix.
+
+    Column indices within each row come out sorted, like ``CountVectorizer``.
+    """
+    keys = rows.astype(np.int64) * n_columns + columns
+    unique_keys, counts = np.unique(keys, return_counts=True)
+    unique_rows = unique_keys // n_columns
+    index_dtype = np.int32 if max(n_columns, len(counts)) < 2**31 else np.int64
+    indices = (unique_keys - unique_rows * n_columns).astype(index_dtype)
+
+    indptr = np.zeros(n_rows + 1, dtype=index_dtype)
+    np.cumsum(np.bincount(unique_rows, minlength=n_rows), out=indptr[1:])
+    return sparse.csr_matrix(
+        (counts.astype(dtype), indices, indptr), shape=(n_rows, n_columns)
+    )
+
+
+def _iter_chunks(sequence: Union[str, Iterable[str]], chunk_size: int) -> Iterator[str]:
+    if isinstance(sequence, str):
+        for start in range(0, len(sequence), chunk_size):
+            yield sequence[start : start + chunk_size]
+    else:
+        yield from sequence
+
+
+def stream_kmer_counts(
+    sequence: Union[str, Iterable[str]],
+    k: int = 6,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    canonical: bool = False,
+    column_lookup: Optional[np.ndarray] = None,
+    n_columns: Optional[int] = None,
+) -> np.ndarray:
+    """Count the k-mers of one long sequence into a dense int64 vector.
+
+    ``sequence`` is a string, walked ``chunk_size`` bases at a time, or an
+    iterable of string pieces (e.g. FASTA lines) that are consumed as they
+    come. The last ``k - 1`` bases of each chunk are carried into the next so
+    k-mers spanning a boundary are counted exactly once. Columns follow
+    :func:`sparse_kmer_counts`; the result equals its single row.
+    """
+    _check_k(k)
+    if canonical and column_lookup is None:
+        column_lookup = canonical_index(k)
+        n_columns = n_columns or n_canonical_kmers(k)
+    if n_columns is None:
+        n_columns = 4**k
+
+    counts = np.zeros(n_columns, dtype=np.int64)
+    carry = np.empty(0, dtype=np.uint8)
+    for chunk in _iter_chunks(sequence, chunk_size):
+        bases = np.concatenate([carry, encode_sequence(chunk)])
+        codes, valid = _window_codes(bases, k, canonical)
+        codes = codes[valid]
+        if column_lookup is not None:
+            codes = column_lookup[codes]
+            codes = codes[codes >= 0]
+        counts += np.bincount(codes, minlength=n_columns)
+        carry = bases[len(bases) - min(len(bases), k - 1) :]
+    return counts
+
+
+def _count_batch(
+    sequences: Sequence[str],
+    k: int,
+    column_lookup: Optional[np.ndarray],
+    n_columns: int,
+    dtype: Any,
+    canonical: bool,
+) -> Any:
+    if kmer_kernels.NUMBA_AVAILABLE:
+        data, indices, indptr = kmer_kernels.count_kmers_csr(
+            sequences, k, BASE_CODES, column_lookup, canonical
+        )
+        index_dtype = np.int32 if max(n_columns, len(data)) < 2**31 else np.int64
+        return sparse.csr_matrix(
+            (
+                data.astype(dtype),
+                indices.astype(index_dtype),
+                indptr.astype(index_dtype),
+            ),
+            shape=(len(sequences), n_columns),
+        )
+
+    codes, rows = batch_kmer_codes(sequences, k, canonical)
+    if column_lookup is not None:
+        codes = column_lookup[codes]
+        known = codes >= 0
+        codes, rows = codes[known], rows[known]
+    return counts_to_csr(codes, rows, len(sequences), n_columns, dtype=dtype)
+
+
+def _stack_with_streamed_rows(
+    sequences: Sequence[str],
+    chunk_size: int,
+    count_batch: Any,
+    count_long: Any,
+    dtype: Any,
+) -> Any:
+    """Count short sequences in batches and stream those over ``chunk_size``.
+
+    Consecutive short sequences are batched up to ``chunk_size`` bases so the
+    batch engines also stay within the chunk memory bound.
+    """
+    blocks: List[Any] = []
+    pending: List[str] = []
+    pending_bases = 0
+    for sequence in sequences:
+        if len(sequence) > chunk_size or pending_bases + len(sequence) > chunk_size:
+            if pending:
+                blocks.append(count_batch(pending))
+                pending, pending_bases = [], 0
+        if len(sequence) > chunk_size:
+            blocks.append(sparse.csr_matrix(count_long(sequence)[np.newaxis, :]))
+        else:
+            pending.append(sequence)
+            pending_bases += len(sequence)
+    if pending:
+        blocks.append(count_batch(pending))
+    return sparse.vstack(blocks, format="csr", dtype=dtype)
+
+
+def sparse_kmer_counts(
+    sequences: Sequence[str],
+    k: int,
+    column_lookup: Optional[np.ndarray] = None,
+    n_columns: Optional[int] = None,
+    dtype: Any = np.int64,
+    canonical: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Any:
+    """Count k-mers of a batch into a CSR matrix.
+
+    Without ``column_lookup`` column ``j`` counts the k-mer with code ``j``
+    (or, with ``canonical``, the ``canonical_index`` column of its canonical
+    form); with it, codes are remapped through the table and negative entries
+    are dropped. Uses the numba kernel when available. Sequences longer than
+    ``chunk_size`` are counted with :func:`stream_kmer_counts`.
+    """
+    _check_k(k)
+    if canonical and column_lookup is None:
+        column_lookup = canonical_index(k)
+        n_columns = n_columns or n_canonical_kmers(k)
+    if n_columns is None:
+        n_columns = 4**k
+
+    if all(len(sequence) <= chunk_size for sequence in sequences):
+        return _count_batch(sequences, k, column_lookup, n_columns, dtype, canonical)
+    return _stack_with_streamed_rows(
+        sequences,
+        chunk_size,
+        partial(
+            _count_batch,
+            k=k,
+            column_lookup=column_lookup,
+            n_columns=n_columns,
+            dtype=dtype,
+            canonical=canonical,
+        ),
+        partial(
+            stream_kmer_counts,
+            k=k,
+            chunk_size=chunk_size,
+            canonical=canonical,
+            column_lookup=column_lookup,
+            n_columns=n_columns,
+        ),
+        dtype,
+    )
+
+
+def window_starts(length: int, window: int, stride: int) -> np.ndarray:
+    """Start offsets of the sliding windows over a sequence of ``length``.
+
+    Windows start every ``stride`` bases until one reaches the end; the last
+    window may be shorter than ``window``, and a sequence shorter than
+    ``window`` yields a single window covering all of it.
+    """
+    if window < 1 or stride < 1:
+        raise ValueError("window and stride must be positive")
+    n_windows = -(-max(length - window, 0) // stride) + 1
+    return np.arange(n_windows, dtype=np.int64) * stride
+
+
+def _block_events(
+    rows: np.ndarray, columns: np.ndarray, n_rows: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the (row, column) events that fall in windows ``0:n_rows``."""
+    in_block = (rows >= 0) & (rows < n_rows)
+    return rows[in_block], columns[in_block]
+
+
+def window_kmer_counts(
+    sequence: str,
+    k: int,
+    window: int,
+    stride: int,
+    column_lookup: Optional[np.ndarray] = None,
+    n_columns: Optional[int] = None,
+    dtype: Any = np.int64,
+    canonical: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Any:
+    """Count the k-mers of every sliding window of ``sequence``.
+
+    Row ``j`` equals ``sparse_kmer_counts([sequence[s:s + window]], ...)`` for
+    ``s = window_starts(len(sequence), window, stride)[j]``. The sequence is
+    encoded once and every k-mer contributes one +1 event at the first window
+    containing it and one -1 event after the last; window counts are the
+    running sum of those events. Windows are processed in blocks so memory
+    stays bounded by ``chunk_size`` bases plus ``WINDOW_BLOCK_CELLS``.
+    """
+    _check_k(k)
+    if canonical and column_lookup is None:
+        column_lookup = canonical_index(k)
+        n_columns = n_columns or n_canonical_kmers(k)
+    if n_columns is None:
+        n_columns = 4**k
+
+    starts = window_starts(len(sequence), window, stride)
+    n_windows = len(starts)
+    block = max(1, min(WINDOW_BLOCK_CELLS // n_columns, chunk_size // stride))
+    state = np.zeros(n_columns, dtype=np.int64)
+    blocks: List[Any] = []
+    for first in range(0, n_windows, block):
+        last = min(first + block, n_windows)
+        # Every k-mer entering a window of this block, or leaving one (i.e.
+        # starting in the window before it), lies inside this span.
+        span_start = max(first - 1, 0) * stride
+        span_end = min((last - 1) * stride + window, len(sequence))
+        raw = BASE_CODES[_sequence_bytes(sequence[span_start:span_end])]
+        positions = np.flatnonzero(raw != SKIP_BASE) + span_start
+        codes, valid = _window_codes(raw[raw != SKIP_BASE], k, canonical)
+        kmer_first = positions[: len(codes)][valid]
+        kmer_last = positions[k - 1 :][valid]
+        codes = codes[valid]
+        if column_lookup is not None:
+            codes = column_lookup[codes]
+            known = codes >= 0
+            codes, kmer_first, kmer_last = (
+                codes[known],
+                kmer_first[known],
+                kmer_last[known],
+            )
+
+        # Windows [enter, leave) contain the k-mer; k-mers spanning long N
+        # runs may fit in no window at all (enter >= leave).
+        enter = np.maximum(-(-(kmer_last + 1 - window) // stride), 0)
+        leave = np.minimum(kmer_first // stride, n_windows - 1) + 1
+        fits = enter < leave
+        n_rows = last - first
+        enter_rows, enter_columns = _block_events(
+            enter[fits] - first, codes[fits], n_rows
+        )
+        leave_rows, leave_columns = _block_events(
+            leave[fits] - first, codes[fits], n_rows
+        )
+        if kmer_kernels.NUMBA_AVAILABLE:
+            data, indices, indptr = kmer_kernels.window_counts_csr(
+                enter_rows, enter_columns, leave_rows, leave_columns, n_rows, state
+            )
+            blocks.append(
+                sparse.csr_matrix(
+                    (data.astype(dtype), indices, indptr), shape=(n_rows, n_columns)
+                )
+            )
+            continue
+
+        deltas = np.bincount(
+            enter_rows * n_columns + enter_columns, minlength=n_rows * n_columns
+        ) - np.bincount(
+            leave_rows * n_columns + leave_columns, minlength=n_rows * n_columns
+        )
+        counts = np.cumsum(deltas.reshape(n_rows, n_columns), axis=0) + state
+        state = counts[-1]
+        blocks.append(sparse.csr_matrix(counts.astype(dtype)))
+    return sparse.vstack(blocks, format="csr", dtype=dtype)
+
+
+def kmer_count_matrix(
+    sequences: Sequence[str], k: int = 6, canonical: bool = False
+) -> Any:
+    """Return a ``(len(sequences), 4**k)`` CSR matrix of k-mer counts.
+
+    Column ``j`` counts the k-mer whose 2-bit code is ``j`` (see
+    :func:`kmer_to_code`). With ``canonical`` the matrix has
+    ``n_canonical_kmers(k)`` columns laid out by :func:`canonical_index`.
+    """
+    return sparse_kmer_counts(sequences, k, canonical=canonical)
+
+
+def _check_ks(ks: Sequence[int]) -> Tuple[int, ...]:
+    checked = tuple(int(k) for k in ks)
+    if not checked:
+        raise ValueError("At least one k is required")
+    if len(set(checked)) != len(checked):
+        raise ValueError(f"k values must be distinct, got {checked}")
+    for k in checked:
+        _check_k(k)
+    return checked
+
+
+def spectrum_offsets(ks: Sequence[int], canonical: bool = False) -> np.ndarray:
+    """First column of each k's block in a multi-k spectrum, plus the total.
+
+    Blocks follow the order of ``ks``; block ``i`` spans
+    ``offsets[i]:offsets[i + 1]`` and is laid out like :func:`kmer_count_matrix`
+    for that k.
+    """
+    widths = [n_canonical_kmers(k) if canonical else 4**k for k in _check_ks(ks)]
+    offsets = np.zeros(len(widths) + 1, dtype=np.int64)
+    np.cumsum(widths, out=offsets[1:])
+    return offsets
+
+
+def _spectrum_lookup(ks: Tuple[int, ...], offsets: np.ndarray) -> np.ndarray:
+    """Concatenated code-to-column tables for a canonical spectrum."""
+    return np.concatenate(
+        [canonical_index(k).astype(np.int64) + offset for k, offset in zip(ks, offsets)]
+    )
+
+
+def spectrum_count_matrix(
+    sequences: Sequence[str],
+    ks: Sequence[int],
+    canonical: bool = False,
+    dtype: Any = np.int64,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Any:
+    """Return the concatenated k-mer count matrices of every k in ``ks``.
+
+    Equivalent to ``sparse.hstack`` of :func:`kmer_count_matrix` for each k,
+    but each sequence is scanned once: the code of the largest k is rolled and
+    the k-mer of each smaller k ending at the same base is its low bits.
+    Sequences longer than ``chunk_size`` are streamed one k at a time.
+    """
+    ks = _check_ks(ks)
+    if any(len(sequence) > chunk_size for sequence in sequences):
+        return _stack_with_streamed_rows(
+            sequences,
+            chunk_size,
+            lambda batch: spectrum_count_matrix(batch, ks, canonical, dtype),
+            lambda sequence: np.concatenate(
+                [stream_kmer_counts(sequence, k, chunk_size, canonical) for k in ks]
+            ),
+            dtype,
+        )
+
+    offsets = spectrum_offsets(ks, canonical)
+    n_columns = int(offsets[-1])
+    lookup = _spectrum_lookup(ks, offsets) if canonical else None
+
+    if kmer_kernels.NUMBA_AVAILABLE:
+        data, indices, indptr = kmer_kernels.count_spectrum_csr(
+            sequences, ks, BASE_CODES, offsets[:-1], lookup
+        )
+        index_dtype = np.int32 if max(n_columns, len(data)) < 2**31 else np.int64
+        return sparse.csr_matrix(
+            (
+                data.astype(dtype),
+                indices.astype(index_dtype),
+                indptr.astype(index_dtype),
+            ),
+            shape=(len(sequences), n_columns),
+        )
+
+    lengths = np.fromiter((len(seq) for seq in sequences), dtype=np.int64)
+    bases = BASE_CODES[_sequence_bytes("".join(sequences))]
+    rows = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+    keep = bases != SKIP_BASE
+    if not keep.all():
+        bases = bases[keep]
+        rows = rows[keep]
+
+    # codes[e] holds the last max(ks) bases ending at position e; windows that
+    # reach before the start of the batch read zeros and are masked below.
+    max_k = max(ks)
+    codes = np.zeros(len(bases), dtype=np.int64)
+    for lag in range(min(max_k, len(bases))):
+        codes[lag:] |= bases[: len(bases) - lag].astype(np.int64) << (2 * lag)
+    invalid_prefix = np.zeros(len(bases) + 1, dtype=np.int64)
+    np.cumsum(bases == INVALID_BASE, out=invalid_prefix[1:])
+
+    all_columns = []
+    all_rows = []
+    lookup_offset = 0
+    for index, k in enumerate(ks):
+        ends = np.arange(k - 1, len(bases))
+        valid = (invalid_prefix[ends + 1] == invalid_prefix[ends + 1 - k]) & (
+            rows[ends] == rows[ends + 1 - k]
+        )
+        ends = ends[valid]
+        k_codes = codes[ends] & ((1 << (2 * k)) - 1)
+        if lookup is not None:
+            all_columns.append(lookup[lookup_offset + k_codes])
+        else:
+            all_columns.append(k_codes + offsets[index])
+        all_rows.append(rows[ends])
+        lookup_offset += 4**k
+    return counts_to_csr(
+        np.concatenate(all_columns),
+        np.concatenate(all_rows),
+        len(sequences),
+        n_columns,
+        dtype=dtype,
+    )
@@ -0,0 +1,180 @@
+"""
+Direct vocabulary-index featurization for saved k-mer vectorizers.
+
+``KmerFeaturizer`` compiles a fitted ``CountVectorizer``/``TfidfVectorizer``
+vocabulary into a dense ``4**k`` table that maps a k-mer's 2-bit code straight
+to its feature column. Sequences are then featurised with the k-mer counting
+engine, skipping k-mer string building, regex tokenisation and per-token dict
+lookups.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+import numpy as np
+from sklearn.feature_extraction.text import (  # type: ignore[import-untyped]
+    CountVectorizer,
+    TfidfVectorizer,
+)
+from sklearn.preprocessing import normalize  # type: ignore[import-untyped]
+
+from .kmer_encoding import (
+    canonical_kmer,
+    counts_to_csr,
+    kmer_to_code,
+    sparse_kmer_counts,
+    window_kmer_counts,
+)
+
+NO_COLUMN = -1
+
+
+class KmerFeaturizer:
+    """
+    Map integer k-mer codes to the columns of a fitted vectorizer.
+
+    Produces the same matrix as ``vectorizer.transform(KmerTransformer(k,
+    canonical).transform(sequences))``, including binary counts, sublinear tf,
+    idf weighting and row normalisation for TF-IDF vectorizers. Canonical
+    featurizers look up the canonical code of each k-mer.
+    """
+
+    def __init__(
+        self,
+        column_lookup: np.ndarray,
+        n_features: int,
+        k: int,
+        dtype: Any = np.int64,
+        binary: bool = False,
+        idf: Optional[np.ndarray] = None,
+        sublinear_tf: bool = False,
+        norm: Optional[str] = None,
+        canonical: bool = False,
+    ) -> None:
+        if len(column_lookup) != 4**k:
+            raise ValueError(
+                f"Column lookup has {len(column_lookup)} entries, expected 4**{k}"
+            )
+        self.column_lookup = column_lookup
+        self.n_features = n_features
+        self.k = k
+        self.dtype = dtype
+        self.binary = binary
+        self.idf = idf
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.canonical = canonical
+
+    @classmethod
+    def from_vectorizer(
+        cls, vectorizer: Any, k: int, canonical: bool = False
+    ) -> Optional["KmerFeaturizer"]:
+        """
+        Compile a fitted vectorizer, or return None if its output cannot be
+        reproduced from pure-ACGT k-mer codes (custom analyzers, n-grams,
+        vocabulary entries with IUPAC codes, ...).
+        """
+        if not isinstance(vectorizer, CountVectorizer):
+            return None
+        vocabulary = getattr(vectorizer, "vocabulary_", None)
+        if not vocabulary:
+            return None
+
+        analyzer = vectorizer.build_analyzer()
+        column_lookup = np.full(4**k, NO_COLUMN, dtype=np.int32)
+        for token, column in vocabulary.items():
+            code = kmer_to_code(token) if len(token) == k else None
+            if code is None:
+                return None
+            # Only count the column if the vectorizer maps the upper-case
+            # k-mer emitted by KmerTransformer onto this exact token.
+            kmer = token.upper()
+            if canonical and canonical_kmer(kmer) != kmer:
+                continue
+            if analyzer(kmer) == [token]:
+                column_lookup[code] = column
+
+        idf = None
+        sublinear_tf = False
+        norm = None
+        if isinstance(vectorizer, TfidfVectorizer):
+            idf = np.asarray(vectorizer.idf_) if vectorizer.use_idf else None
+            sublinear_tf = vectorizer.sublinear_tf
+            norm = vectorizer.norm
+
+        return cls(
+            column_lookup=column_lookup,
+            n_features=len(vocabulary),
+            k=k,
+            dtype=vectorizer.dtype,
+            binary=vectorizer.binary,
+            idf=idf,
+            sublinear_tf=sublinear_tf,
+            norm=norm,
+            canonical=canonical,
+        )
+
+    def compact(self) -> "KmerFeaturizer":
+        """Copy producing float32 matrices (int32 indices, float32 data)."""
+        return KmerFeaturizer(
+            column_lookup=self.column_lookup,
+            n_features=self.n_features,
+            k=self.k,
+            dtype=np.float32,
+            binary=self.binary,
+            idf=None if self.idf is None else self.idf.astype(np.float32),
+            sublinear_tf=self.sublinear_tf,
+            norm=self.norm,
+            canonical=self.canonical,
+        )
+
+    def transform_codes(self, codes: np.ndarray, rows: np.ndarray, n_rows: int) -> Any:
+        """Build the feature matrix from ``(code, row)`` k-mer occurrences."""
+        columns = self.column_lookup[codes]
+        known = columns != NO_COLUMN
+        return self._weight(
+            counts_to_csr(
+                columns[known], rows[known], n_rows, self.n_features, dtype=self.dtype
+            )
+        )
+
+    def transform(self, sequences: Sequence[str]) -> Any:
+        """Featurise raw DNA sequences into a CSR matrix."""
+        counts = sparse_kmer_counts(
+            sequences,
+            self.k,
+            column_lookup=self.column_lookup,
+            n_columns=self.n_features,
+            dtype=self.dtype,
+            canonical=self.canonical,
+        )
+        return self._weight(counts)
+
+    def transform_windows(self, sequence: str, window: int, stride: int) -> Any:
+        """Featurise every sliding window of one sequence (see
+        ``kmer_encoding.window_starts``) with incremental k-mer counts."""
+        counts = window_kmer_counts(
+            sequence,
+            self.k,
+            window,
+            stride,
+            column_lookup=self.column_lookup,
+            n_columns=self.n_features,
+            dtype=self.dtype,
+            canonical=self.canonical,
+        )
+        return self._weight(counts)
+
+    def _weight(self, features: Any) -> Any:
+        """Apply the vectorizer's binary/tf/idf/norm steps to a count matrix."""
+        if self.binary:
+            features.data[:] = 1
+        if self.sublinear_tf:
+            np.log(features.data, features.data)
+            features.data += 1.0
+        if self.idf is not None:
+            features.data *= self.idf[features.indices]
+        if self.norm is not None:
+            features = normalize(features, norm=self.norm, copy=False)
+        return features
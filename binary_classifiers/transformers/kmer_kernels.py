@@ -0,0 +1,400 @@
+"""
+Optional numba-compiled k-mer counting kernel.
+
+Counts the k-mers of a batch of sequences in parallel across cores (one
+``prange`` iteration per sequence) and returns CSR arrays directly. When numba
+is not importable ``NUMBA_AVAILABLE`` is False and callers fall back to the
+pure-NumPy engine in ``kmer_encoding``.
+
+Kernels are called from several threads at once (request handlers, job
+workers, ensemble members). Numba's ``workqueue`` layer crashes the process
+on concurrent parallel launches, so unless the layer picked at the first
+launch is threadsafe, launches run one at a time.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    NUMBA_AVAILABLE = False
+    _prange: Any = range
+else:
+    NUMBA_AVAILABLE = True
+    _prange = numba.prange
+
+# Values of the base-code table understood by the kernel.
+SKIP_BASE = 5  # removed before windowing (N), neighbours are joined
+INVALID_BASE = 4  # breaks the current window (IUPAC codes, whitespace, ...)
+
+# Threading layers that allow parallel launches from concurrent threads.
+THREADSAFE_LAYERS = ("tbb", "omp")
+_launch_lock = threading.Lock()
+# Set after the first launch: whether launches may run concurrently.
+_concurrent_launches = False
+
+
+def _count_rows(
+    buffer: np.ndarray,
+    offsets: np.ndarray,
+    k: int,
+    base_codes: np.ndarray,
+    column_lookup: np.ndarray,
+    use_lookup: bool,
+    canonical: bool,
+    columns: np.ndarray,
+    row_found: np.ndarray,
+) -> None:
+    """Per sequence: roll k-mer codes and store the column of every k-mer at
+    the start of the sequence's slice of ``columns``.
+
+    The reverse-complement code is rolled alongside the forward one so
+    canonical codes cost no extra pass."""
+    mask = (1 << (2 * k)) - 1
+    top_shift = 2 * (k - 1)
+    for row in _prange(len(offsets) - 1):
+        start = offsets[row]
+        n_found = 0
+        code = 0
+        reverse = 0
+        run = 0
+        for position in range(start, offsets[row + 1]):
+            base = int(base_codes[buffer[position]])
+            if base == SKIP_BASE:
+                continue
+            if base == INVALID_BASE:
+                run = 0
+                code = 0
+                reverse = 0
+                continue
+            code = ((code << 2) | base) & mask
+            reverse = (reverse >> 2) | ((3 - base) << top_shift)
+            run += 1
+            if run >= k:
+                value = reverse if canonical and reverse < code else code
+                column = column_lookup[value] if use_lookup else value
+                if column >= 0:
+                    columns[start + n_found] = column
+                    n_found += 1
+        row_found[row] = n_found
+
+
+def _count_spectrum_rows(
+    buffer: np.ndarray,
+    offsets: np.ndarray,
+    ks: np.ndarray,
+    base_codes: np.ndarray,
+    column_offsets: np.ndarray,
+    column_lookup: np.ndarray,
+    lookup_offsets: np.ndarray,
+    use_lookup: bool,
+    columns: np.ndarray,
+    row_found: np.ndarray,
+) -> None:
+    """Like :func:`_count_rows` for several k at once.
+
+    A single code of the largest k is rolled per sequence; the k-mer of every
+    smaller k ending at the same base is its low ``2 * k`` bits. Columns of
+    the i-th k start at ``column_offsets[i]``; with ``use_lookup`` codes are
+    mapped through ``column_lookup[lookup_offsets[i] + code]`` instead and
+    negative entries are dropped."""
+    n_ks = len(ks)
+    max_k = ks.max()
+    mask = (1 << (2 * max_k)) - 1
+    for row in _prange(len(offsets) - 1):
+        start = offsets[row] * n_ks
+        n_found = 0
+        code = 0
+        run = 0
+        for position in range(offsets[row], offsets[row + 1]):
+            base = int(base_codes[buffer[position]])
+            if base == SKIP_BASE:
+                continue
+            if base == INVALID_BASE:
+                run = 0
+                code = 0
+                continue
+            code = ((code << 2) | base) & mask
+            run += 1
+            for index in range(n_ks):
+                k = ks[index]
+                if run < k:
+                    continue
+                value = code & ((1 << (2 * k)) - 1)
+                if use_lookup:
+                    column = column_lookup[lookup_offsets[index] + value]
+                else:
+                    column = column_offsets[index] + value
+                if column >= 0:
+                    columns[start + n_found] = column
+                    n_found += 1
+        row_found[row] = n_found
+
+
+def _collapse_rows(
+    starts: np.ndarray,
+    row_found: np.ndarray,
+    columns: np.ndarray,
+    counts: np.ndarray,
+    row_nnz: np.ndarray,
+) -> None:
+    """Sort each row's columns in place and collapse them to (column, count)
+    pairs at the start of the row's slice."""
+    for row in _prange(len(row_found)):
+        start = starts[row]
+        n_found = row_found[row]
+        found = columns[start : start + n_found]
+        found.sort()
+        n_unique = 0
+        for index in range(n_found):
+            if n_unique > 0 and found[index] == columns[start + n_unique - 1]:
+                counts[start + n_unique - 1] += 1
+            else:
+                columns[start + n_unique] = found[index]
+                counts[start + n_unique] = 1
+                n_unique += 1
+        row_nnz[row] = n_unique
+
+
+def _gather_rows(
+    starts: np.ndarray,
+    columns: np.ndarray,
+    counts: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    data: np.ndarray,
+) -> None:
+    for row in _prange(len(indptr) - 1):
+        source = starts[row]
+        for index in range(indptr[row], indptr[row + 1]):
+            indices[index] = columns[source]
+            data[index] = counts[source]
+            source += 1
+
+
+def _window_rows(
+    enter_rows: np.ndarray,
+    enter_columns: np.ndarray,
+    leave_rows: np.ndarray,
+    leave_columns: np.ndarray,
+    state: np.ndarray,
+    fill: bool,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    data: np.ndarray,
+) -> None:
+    """Apply row-sorted enter (+1) / leave (-1) events to the running window
+    counts in ``state`` and emit each window's non-zero counts.
+
+    With ``fill`` False only ``indptr`` is computed, so callers run it once to
+    size the output and once more, on a copy of the initial state, to fill it.
+    """
+    entered = 0
+    left = 0
+    nnz = 0
+    for row in range(len(indptr) - 1):
+        while entered < len(enter_rows) and enter_rows[entered] == row:
+            state[enter_columns[entered]] += 1
+            entered += 1
+        while left < len(leave_rows) and leave_rows[left] == row:
+            state[leave_columns[left]] -= 1
+            left += 1
+        for column in range(len(state)):
+            if state[column] != 0:
+                if fill:
+                    indices[nnz] = column
+                    data[nnz] = state[column]
+                nnz += 1
+        indptr[row + 1] = nnz
+
+
+def _one_at_a_time(kernel: Callable[..., None]) -> Callable[..., None]:
+    """Wrap a parallel kernel so its launches are serialised unless numba's
+    threading layer is threadsafe."""
+
+    def launch(*args: Any) -> None:
+        global _concurrent_launches
+        if _concurrent_launches:
+            kernel(*args)
+            return
+        with _launch_lock:
+            kernel(*args)
+            # The layer is only chosen at the first parallel launch.
+            _concurrent_launches = numba.threading_layer() in THREADSAFE_LAYERS
+
+    return launch
+
+
+if NUMBA_AVAILABLE:
+    _jit = numba.njit(parallel=True, cache=True, nogil=True)
+    _count_rows_compiled = _one_at_a_time(_jit(_count_rows))
+    _count_spectrum_rows_compiled = _one_at_a_time(_jit(_count_spectrum_rows))
+    _collapse_rows_compiled = _one_at_a_time(_jit(_collapse_rows))
+    _gather_rows_compiled = _one_at_a_time(_jit(_gather_rows))
+    _window_rows_compiled = numba.njit(cache=True, nogil=True)(_window_rows)
+
+
+def _concatenate(sequences: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    lengths = np.fromiter((len(seq) for seq in sequences), dtype=np.int64)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    buffer = np.frombuffer("".join(sequences).encode("ascii", "replace"), np.uint8)
+    return buffer, offsets
+
+
+def _to_csr(
+    starts: np.ndarray, row_found: np.ndarray, columns: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    counts = np.empty(len(columns), dtype=np.int64)
+    row_nnz = np.zeros(len(row_found), dtype=np.int64)
+    _collapse_rows_compiled(starts, row_found, columns, counts, row_nnz)
+
+    indptr = np.zeros(len(row_found) + 1, dtype=np.int64)
+    np.cumsum(row_nnz, out=indptr[1:])
+    nnz = int(indptr[-1])
+    indices = np.empty(nnz, dtype=np.int64)
+    data = np.empty(nnz, dtype=np.int64)
+    _gather_rows_compiled(starts, columns, counts, indptr, indices, data)
+    return data, indices, indptr
+
+
+def count_kmers_csr(
+    sequences: Sequence[str],
+    k: int,
+    base_codes: np.ndarray,
+    column_lookup: Any = None,
+    canonical: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count k-mers of every sequence with the compiled kernel.
+
+    ``column_lookup`` optionally maps k-mer codes to output columns (negative
+    entries are dropped). With ``canonical`` each k-mer is counted under the
+    smaller of its forward and reverse-complement codes. Returns
+    ``(data, indices, indptr)`` with indices sorted within each row.
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("numba is not installed; use the NumPy k-mer engine")
+
+    buffer, offsets = _concatenate(sequences)
+    use_lookup = column_lookup is not None
+    lookup = (
+        np.ascontiguousarray(column_lookup)
+        if use_lookup
+        else np.empty(0, dtype=np.int32)
+    )
+    columns = np.empty(len(buffer), dtype=np.int64)
+    row_found = np.zeros(len(offsets) - 1, dtype=np.int64)
+    _count_rows_compiled(
+        buffer,
+        offsets,
+        k,
+        base_codes,
+        lookup,
+        use_lookup,
+        canonical,
+        columns,
+        row_found,
+    )
+    return _to_csr(offsets[:-1], row_found, columns)
+
+
+def count_spectrum_csr(
+    sequences: Sequence[str],
+    ks: Sequence[int],
+    base_codes: np.ndarray,
+    column_offsets: np.ndarray,
+    column_lookup: Any = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count the k-mers of several ``ks`` in one pass with the compiled kernel.
+
+    Column layout as in :func:`_count_spectrum_rows`; ``column_lookup``, when
+    given, is the concatenation of one ``4**k`` table per k. Returns
+    ``(data, indices, indptr)`` with indices sorted within each row.
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("numba is not installed; use the NumPy k-mer engine")
+
+    buffer, offsets = _concatenate(sequences)
+    ks_array = np.asarray(ks, dtype=np.int64)
+    use_lookup = column_lookup is not None
+    lookup = (
+        np.ascontiguousarray(column_lookup)
+        if use_lookup
+        else np.empty(0, dtype=np.int32)
+    )
+    lookup_offsets = np.zeros(len(ks_array), dtype=np.int64)
+    np.cumsum(4 ** ks_array[:-1], out=lookup_offsets[1:])
+    columns = np.empty(len(buffer) * len(ks_array), dtype=np.int64)
+    row_found = np.zeros(len(offsets) - 1, dtype=np.int64)
+    _count_spectrum_rows_compiled(
+        buffer,
+        offsets,
+        ks_array,
+        base_codes,
+        np.asarray(column_offsets, dtype=np.int64),
+        lookup,
+        lookup_offsets,
+        use_lookup,
+        columns,
+        row_found,
+    )
+    return _to_csr(offsets[:-1] * len(ks_array), row_found, columns)
+
+
+def window_counts_csr(
+    enter_rows: np.ndarray,
+    enter_columns: np.ndarray,
+    leave_rows: np.ndarray,
+    leave_columns: np.ndarray,
+    n_rows: int,
+    state: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build window count rows from k-mer enter/leave events with the compiled
+    kernel. Event rows must be sorted and within ``0:n_rows``; ``state`` holds
+    the counts before the first row and is left at the counts of the last.
+    Returns ``(data, indices, indptr)`` with indices sorted within each row.
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("numba is not installed; use the NumPy k-mer engine")
+
+    events = (enter_rows, enter_columns, leave_rows, leave_columns)
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    empty = np.empty(0, dtype=np.int64)
+    initial = state.copy()
+    _window_rows_compiled(*events, state, False, indptr, empty, empty)
+
+    nnz = int(indptr[-1])
+    indices = np.empty(nnz, dtype=np.int64)
+    data = np.empty(nnz, dtype=np.int64)
+    state[:] = initial
+    _window_rows_compiled(*events, state, True, indptr, indices, data)
+    return data, indices, indptr
+
+
+def start_threads(threads: int | None = None) -> None:
+    """
+    Start numba's worker pool from the calling thread.
+
+    With the TBB threading layer, a pool first started from a non-main
+    thread (e.g. a background job worker) makes the interpreter hang at
+    exit. Servers that count k-mers off the main thread call this from the
+    main thread at startup. ``threads`` caps the kernels' parallelism for
+    the calling thread, e.g. in one of several worker processes. A no-op
+    without numba.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    base_codes = np.full(256, INVALID_BASE, dtype=np.uint8)
+    for code, base in enumerate(b"ACGT"):
+        base_codes[base] = code
+    count_kmers_csr(["ACGT"], 2, base_codes)
+    if threads is not None:
+        numba.set_num_threads(max(1, min(threads, numba.get_num_threads())))
@@ -1,15 +1,35 @@
-from typing import Union, List, Any
+from typing import Any, Dict, List, Sequence, Union
+import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin  # type: ignore[import-untyped]
 
+from .kmer_encoding import (
+    canonical_index,
+    canonical_kmer,
+    code_to_kmer,
+    kmer_count_matrix,
+    spectrum_count_matrix,
+    spectrum_offsets,
+)
+
 
 class KmerTransformer(BaseEstimator, TransformerMixin):
     """
     A scikit-learn compatible transformer for converting DNA sequences to k-mers.
+
+    With ``canonical=True`` every k-mer is replaced by the lexicographically
+    smaller of itself and its reverse complement, so reads from either strand
+    produce the same features.
     """
 
-    def __init__(self, k: int = 6) -> None:
+    def __init__(self, k: int = 6, canonical: bool = False) -> None:
         self.k = k
+        self.canonical = canonical
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Transformers pickled before ``canonical`` existed count k-mers as read.
+        state.setdefault("canonical", False)
+        super().__setstate__(state)
 
     def fit(self, X: Any, y: Any = None) -> "KmerTransformer":
         """Fit method (does nothing, but required for sklearn compatibility)"""
@@ -33,7 +53,84 @@ class KmerTransformer(BaseEstimator, TransformerMixin):
         else:
             return [self._get_kmers(seq) for seq in X]
 
+    def count_matrix(self, X: Union[pd.Series, List[str]]) -> Any:
+        """
+        Count k-mers directly into a sparse matrix, skipping the string step.
+
+        Parameters:
+        -----------
+        X : array-like or Series
+            DNA sequences to count
+
+        Returns:
+        --------
+        CSR matrix of shape (n_sequences, 4**k); column j counts the k-mer
+        whose 2-bit code is j. Canonical transformers return one column per
+        canonical k-mer instead (see ``kmer_encoding.canonical_index``).
+        """
+        return kmer_count_matrix(list(X), self.k, canonical=self.canonical)
+
     def _get_kmers(self, seq: str) -> str:
         """Convert a single sequence to k-mers"""
         seq = seq.upper().replace("N", "")  # clean ambiguous bases
-        return " ".join([seq[i : i + self.k] for i in range(len(seq) - self.k + 1)])
+        kmers = [seq[i : i + self.k] for i in range(len(seq) - self.k + 1)]
+        if self.canonical:
+            kmers = [canonical_kmer(kmer) for kmer in kmers]
+        return " ".join(kmers)
+
+
+class MultiKmerTransformer(BaseEstimator, TransformerMixin):
+    """
+    A scikit-learn compatible transformer for multi-k k-mer spectra.
+
+    Transforms DNA sequences straight into the concatenated sparse count
+    matrices of every k in ``ks`` (e.g. 4-, 5- and 6-mers), counted in one
+    pass per sequence. ``fit`` records the block layout in
+    ``column_offsets_`` so a pickled transformer carries it to inference.
+    """
+
+    def __init__(self, ks: Sequence[int] = (4, 5, 6), canonical: bool = False) -> None:
+        self.ks = ks
+        self.canonical = canonical
+
+    def fit(self, X: Any = None, y: Any = None) -> "MultiKmerTransformer":
+        """Record the column layout; the spectrum itself needs no fitting."""
+        self.column_offsets_ = spectrum_offsets(self.ks, self.canonical)
+        self.n_features_out_ = int(self.column_offsets_[-1])
+        return self
+
+    def transform(self, X: Union[pd.Series, List[str]]) -> Any:
+        """
+        Count the k-mer spectrum of each sequence.
+
+        Parameters:
+        -----------
+        X : array-like or Series
+            DNA sequences to transform
+
+        Returns:
+        --------
+        CSR matrix of shape (n_sequences, n_features_out_); the block of
+        ``ks[i]`` spans ``column_offsets_[i]:column_offsets_[i + 1]``.
+        """
+        if not hasattr(self, "column_offsets_"):
+            self.fit()
+        elif not np.array_equal(
+            self.column_offsets_, spectrum_offsets(self.ks, self.canonical)
+        ):
+            raise ValueError(
+                "Stored column offsets do not match the spectrum layout for "
+                f"ks={tuple(self.ks)}, canonical={self.canonical}"
+            )
+        return spectrum_count_matrix(list(X), self.ks, canonical=self.canonical)
+
+    def get_feature_names_out(self, input_features: Any = None) -> np.ndarray:
+        """k-mer string of every output column."""
+        names: List[str] = []
+        for k in self.ks:
+            if self.canonical:
+                codes = np.unique(canonical_index(k), return_index=True)[1]
+            else:
+                codes = np.arange(4**k)
+            names.extend(code_to_kmer(int(code), k) for code in codes)
+        return np.asarray(names, dtype=object)
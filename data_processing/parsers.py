@@ -1,7 +1,9 @@
 """FASTA and FASTQ file parsing utilities."""
 
-from typing import List, Tuple, Any
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+import itertools
 import logging
+import zlib
 
 logger = logging.getLogger(__name__)
 
@@ -81,3 +83,145 @@ def parse_uploaded_file(uploaded_file: Any) -> List[Tuple[str, str]]:
     except Exception as e:
         logger.error("Error parsing file %s: %s", getattr(uploaded_file, "name", ""), e)
         return []
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+# Largest decompressed chunk produced at a time.
+DECOMPRESSED_CHUNK_SIZE = 1 << 20
+
+
+def iter_decompressed(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Pass byte chunks through, gunzipping them if the data starts with the
+    gzip magic bytes. Concatenated gzip members (e.g. bgzip) are all read.
+
+    Args:
+        chunks: Raw file contents, in order
+
+    Returns:
+        Iterator over decompressed chunks
+
+    Raises:
+        ValueError: If the gzip data is corrupt or ends inside a member
+    """
+    remaining = iter(chunks)
+    head = b""
+    for chunk in remaining:
+        head += chunk
+        if len(head) >= len(GZIP_MAGIC):
+            break
+    if not head.startswith(GZIP_MAGIC):
+        if head:
+            yield head
+        yield from remaining
+        return
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    in_member = False
+    try:
+        for chunk in itertools.chain([head], remaining):
+            while chunk:
+                in_member = True
+                # Bounded output, so highly compressed input stays small.
+                yield decompressor.decompress(chunk, DECOMPRESSED_CHUNK_SIZE)
+                if decompressor.eof:
+                    # A member ended; the rest of the chunk starts the next one.
+                    chunk = decompressor.unused_data
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    in_member = False
+                else:
+                    chunk = decompressor.unconsumed_tail
+        # Output zlib still holds for input it has already consumed.
+        while in_member and not decompressor.eof:
+            data = decompressor.decompress(b"", DECOMPRESSED_CHUNK_SIZE)
+            if not data:
+                raise ValueError("Truncated gzip data")
+            yield data
+    except zlib.error as exc:
+        raise ValueError(f"Invalid gzip data: {exc}") from exc
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Split byte chunks into stripped text lines, holding at most one partial
+    line between chunks. Undecodable bytes become U+FFFD.
+    """
+    partial = b""
+    for chunk in chunks:
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        for line in lines:
+            yield line.decode("utf-8", "replace").strip()
+    if partial:
+        yield partial.decode("utf-8", "replace").strip()
+
+
+def iter_sequence_records(
+    chunks: Iterable[bytes], fmt: Optional[str] = None
+) -> Iterator[Tuple[str, str]]:
+    """
+    Parse FASTA or FASTQ records incrementally from byte chunks, which may be
+    gzip-compressed.
+
+    Records are yielded as soon as they are complete, so memory holds one
+    chunk and one record regardless of the file size. Sequences and ids are
+    read like ``parse_fasta_text`` and ``parse_fastq_content`` do.
+
+    Args:
+        chunks: Raw file contents, in order
+        fmt: "fasta" or "fastq"; detected from the first line if None
+
+    Returns:
+        Iterator over (sequence_id, sequence) tuples
+
+    Raises:
+        ValueError: If the format is unknown or cannot be detected
+    """
+    lines = iter_lines(iter_decompressed(chunks))
+    first = next((line for line in lines if line), None)
+    if first is None:
+        return
+    if fmt is None:
+        if first.startswith(">"):
+            fmt = "fasta"
+        elif first.startswith("@"):
+            fmt = "fastq"
+        else:
+            raise ValueError("Expected a FASTA ('>') or FASTQ ('@') header")
+
+    if fmt == "fasta":
+        yield from _iter_fasta(first, lines)
+    elif fmt == "fastq":
+        yield from _iter_fastq(first, lines)
+    else:
+        raise ValueError(f"Unknown sequence format: {fmt}")
+
+
+def _iter_fasta(first: str, lines: Iterator[str]) -> Iterator[Tuple[str, str]]:
+    if not first.startswith(">"):
+        raise ValueError("FASTA records must start with '>'")
+    current_id = first[1:]
+    parts: List[str] = []
+    for line in lines:
+        if line.startswith(">"):
+            yield current_id, "".join(parts)
+            current_id = line[1:]
+            parts = []
+        elif line:
+            parts.append(line.upper())
+    yield current_id, "".join(parts)
+
+
+def _iter_fastq(first: str, lines: Iterator[str]) -> Iterator[Tuple[str, str]]:
+    header: Optional[str] = first
+    while header is not None:
+        record = [header]
+        for line in lines:
+            record.append(line)
+            if len(record) == 4:
+                break
+        if len(record) < 4:
+            # Incomplete trailing read, dropped like parse_fastq_content does.
+            return
+        yield record[0][1:], record[1].upper()
+        header = next((line for line in lines if line), None)
@@ -11,6 +11,27 @@ export type ModelConfig = {
   batch_size: number
   enable_ood: boolean
   ood_threshold: number
+  window_size?: number | null
+  window_stride?: number | null
+  cascade?: boolean
+  cascade_margin?: number
+  forest_early_stopping?: boolean
+  forest_confidence?: number | null
+}
+
+export type WindowPrediction = {
+  start: number
+  end: number
+  virus_probability: number
+  host_probability: number
+}
+
+export type ViralRegion = {
+  start: number
+  end: number
+  window_count: number
+  mean_virus_probability: number
+  max_virus_probability: number
 }
 
 export type SequenceResult = {
@@ -28,6 +49,10 @@ export type SequenceResult = {
   ood_score?: number
   uncertain?: boolean
   threshold_used?: number
+  window_predictions?: WindowPrediction[] | null
+  viral_regions?: ViralRegion[] | null
+  decided_by?: string | null
+  trees_used?: number | null
 }
 
 export type ClassificationResponse = {
@@ -36,6 +61,7 @@ export type ClassificationResponse = {
   host_count: number
   novel_count: number
   uncertain_count: number
+  stage_counts?: Record<string, number>
   detailed_results: SequenceResult[]
   source: string
   timestamp: string
@@ -1,16 +1,52 @@
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Dict, Optional, Tuple
 from sklearn.base import BaseEstimator, TransformerMixin  # type: ignore[import-untyped]
-from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore[import-untyped]
+from sklearn.calibration import CalibratedClassifierCV  # type: ignore[import-untyped]
+from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer  # type: ignore[import-untyped]
+from sklearn.kernel_approximation import Nystroem, RBFSampler  # type: ignore[import-untyped]
 from sklearn.pipeline import Pipeline  # type: ignore[import-untyped]
-from sklearn.svm import SVC  # type: ignore[import-untyped]
-from sklearn.ensemble import RandomForestClassifier  # type: ignore[import-untyped]
+from sklearn.svm import SVC, LinearSVC  # type: ignore[import-untyped]
+from sklearn.ensemble import (  # type: ignore[import-untyped]
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+)
+from sklearn.linear_model import LogisticRegression  # type: ignore[import-untyped]
+from sklearn.naive_bayes import MultinomialNB  # type: ignore[import-untyped]
 from sklearn.neural_network import MLPClassifier  # type: ignore[import-untyped]
+from sklearn.preprocessing import Normalizer  # type: ignore[import-untyped]
 import joblib  # type: ignore[import-untyped]
 
+from binary_classifiers.feature_selection import build_selector
+from binary_classifiers.transformers.kmer_encoding import (
+    canonical_kmer,
+    kmer_count_matrix,
+)
+from binary_classifiers.transformers.kmers_transformer import MultiKmerTransformer
+
+# Pipeline parameters consumed by the k-mer step rather than the classifier.
+KMER_PARAMS = ("k", "canonical")
+# Pipeline parameters consumed by the optional k-mer selection step.
+SELECTION_PARAMS = ("select", "n_features")
+# Model names of the multinomial naive Bayes k-mer model.
+NAIVE_BAYES_MODELS = ("nb", "naive_bayes", "naivebayes", "multinomialnb")
+# Compact student model families for distillation (see build_student).
+STUDENT_MODELS = ("logistic", "gbt")
+# Model names of the kernel-approximation SVM family -> approximation.
+KERNEL_APPROXIMATIONS = {
+    "approx_svm": "nystroem",
+    "nystroem_svm": "nystroem",
+    "rff_svm": "rff",
+}
+
 
 class KmerTransformer(BaseEstimator, TransformerMixin):
-    def __init__(self, k: int = 6) -> None:
+    def __init__(self, k: int = 6, canonical: bool = False) -> None:
         self.k = k
+        self.canonical = canonical
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Transformers pickled before ``canonical`` existed count k-mers as read.
+        state.setdefault("canonical", False)
+        super().__setstate__(state)
 
     def fit(self, X: Any, y: Any = None) -> "KmerTransformer":
         return self
@@ -18,40 +54,175 @@ class KmerTransformer(BaseEstimator, TransformerMixin):
     def transform(self, X: List[str]) -> List[str]:
         return [self._kmers(s) for s in X]
 
+    def count_matrix(self, X: List[str]) -> Any:
+        """Sparse (n_sequences, 4**k) k-mer counts, numba-parallel when available."""
+        return kmer_count_matrix(list(X), self.k, canonical=self.canonical)
+
     def _kmers(self, seq: str) -> str:
         s = seq.upper().replace("N", "")
         k = self.k
         if len(s) < k:
             return ""
-        return " ".join(s[i : i + k] for i in range(len(s) - k + 1))
+        kmers = (s[i : i + k] for i in range(len(s) - k + 1))
+        if self.canonical:
+            kmers = (canonical_kmer(kmer) for kmer in kmers)
+        return " ".join(kmers)
+
+
+def build_kernel_approximation_svm(
+    approximation: str = "nystroem",
+    n_components: int = 300,
+    gamma: float = 1.0,
+    C: float = 1.0,
+    calibration_cv: int = 3,
+    random_state: Optional[int] = None,
+) -> Pipeline:
+    """RBF SVM approximation whose inference cost does not grow with the data.
+
+    Inputs are mapped to ``n_components`` approximate RBF kernel features,
+    either Nystroem landmarks or random Fourier features (``"rff"``). A
+    linear SVM is then fitted on them, and its scores are Platt-calibrated on
+    cross-validated predictions.
+    """
+    features: Any
+    if approximation == "nystroem":
+        features = Nystroem(
+            kernel="rbf",
+            gamma=gamma,
+            n_components=n_components,
+            random_state=random_state,
+        )
+    elif approximation == "rff":
+        features = RBFSampler(
+            gamma=gamma, n_components=n_components, random_state=random_state
+        )
+    else:
+        raise ValueError(f"Unknown kernel approximation: {approximation}")
+
+    linear = CalibratedClassifierCV(
+        LinearSVC(C=C, random_state=random_state),
+        method="sigmoid",
+        cv=calibration_cv,
+        ensemble=False,
+    )
+    return Pipeline([("features", features), ("linear", linear)])
 
 
 def build_pipeline(
     model_name: str, params: Optional[Dict[str, Any]] = None
 ) -> Pipeline:
     params = params or {}
-    k = int(params.get("k", 6))
-    vectorizer = TfidfVectorizer(analyzer="word", token_pattern=r"\S+", lowercase=False)
+    k = params.get("k", 6)
+    canonical = bool(params.get("canonical", False))
+    clf_params = {
+        name: v
+        for name, v in params.items()
+        if name not in KMER_PARAMS + SELECTION_PARAMS
+    }
+    kmers: Any
+    vectorizer: Any
+    if model_name.lower() in NAIVE_BAYES_MODELS:
+        # Raw counts over the full 4**k spectrum: the columns never change,
+        # so partial_fit can fold in batches with k-mers not seen before.
+        ks = k if isinstance(k, (list, tuple)) else (k,)
+        kmers = MultiKmerTransformer(ks=tuple(int(v) for v in ks), canonical=canonical)
+        vectorizer = "passthrough"
+    elif isinstance(k, (list, tuple)):
+        # Several k: count the concatenated spectrum in one pass per sequence.
+        kmers = MultiKmerTransformer(ks=tuple(int(v) for v in k), canonical=canonical)
+        vectorizer = TfidfTransformer()
+    else:
+        kmers = KmerTransformer(k=int(k), canonical=canonical)
+        vectorizer = TfidfVectorizer(
+            analyzer="word", token_pattern=r"\S+", lowercase=False
+        )
 
     if model_name.lower() in ["svm", "svc"]:
-        clf = SVC(probability=True, **{k: v for k, v in params.items() if k != "k"})
+        clf = SVC(probability=True, **clf_params)
     elif model_name.lower() in ["rf", "randomforest", "random_forest"]:
-        clf = RandomForestClassifier(**{k: v for k, v in params.items() if k != "k"})
+        clf = RandomForestClassifier(**clf_params)
     elif model_name.lower() in ["mlp", "mlpclassifier"]:
-        clf = MLPClassifier(**{k: v for k, v in params.items() if k != "k"})
+        clf = MLPClassifier(**clf_params)
+    elif model_name.lower() in NAIVE_BAYES_MODELS:
+        clf = MultinomialNB(**clf_params)
+    elif model_name.lower() in KERNEL_APPROXIMATIONS:
+        clf = build_kernel_approximation_svm(
+            KERNEL_APPROXIMATIONS[model_name.lower()], **clf_params
+        )
     else:
         raise ValueError(f"Unknown model: {model_name}")
 
-    pipe = Pipeline(
-        [
-            ("kmers", KmerTransformer(k=k)),
-            ("tfidf", vectorizer),
-            ("clf", clf),
-        ]
-    )
+    steps = [("kmers", kmers), ("tfidf", vectorizer)]
+    if params.get("select"):
+        # Keep the n_features most informative k-mer columns (chi2,
+        # mutual_info or l1); see binary_classifiers.feature_selection.
+        steps.append(
+            (
+                "select",
+                build_selector(params["select"], int(params.get("n_features", 500))),
+            )
+        )
+    steps.append(("clf", clf))
+    pipe = Pipeline(steps)
     return pipe
 
 
+def build_student(
+    name: str = "logistic", params: Optional[Dict[str, Any]] = None
+) -> Tuple[Any, MultiKmerTransformer]:
+    """Compact distillation student and its k-mer vectorizer.
+
+    The vectorizer counts the full spectrum of ``params["k"]`` (default 6),
+    so it needs no fitting and ``PredictClass`` serves the pair like any
+    multi-k artifact. ``"logistic"`` is an L1-regularised logistic regression
+    on L2-normalised counts, so only a few k-mers keep non-zero weights;
+    ``"gbt"`` is a shallow gradient-boosted tree set. Other ``params`` go to
+    the classifier.
+    """
+    params = dict(params or {})
+    k = params.pop("k", 6)
+    canonical = bool(params.pop("canonical", False))
+    ks = k if isinstance(k, (list, tuple)) else (k,)
+    vectorizer = MultiKmerTransformer(
+        ks=tuple(int(v) for v in ks), canonical=canonical
+    ).fit()
+
+    model: Any
+    if name == "logistic":
+        params.setdefault("penalty", "l1")
+        params.setdefault("solver", "liblinear")
+        params.setdefault("C", 10.0)
+        model = Pipeline(
+            [("normalize", Normalizer()), ("clf", LogisticRegression(**params))]
+        )
+    elif name == "gbt":
+        params.setdefault("max_depth", 3)
+        params.setdefault("n_estimators", 100)
+        model = Pipeline([("clf", GradientBoostingClassifier(**params))])
+    else:
+        raise ValueError(
+            f"Unknown student model: {name}. Expected one of {STUDENT_MODELS}"
+        )
+    return model, vectorizer
+
+
+def partial_fit_pipeline(
+    model: Pipeline, X: List[str], y: Any, classes: Any = None
+) -> Pipeline:
+    """Update a pipeline whose classifier supports ``partial_fit`` (e.g. the
+    naive Bayes model) with one more labeled batch of sequences.
+
+    ``classes`` must be given on the first call, as for sklearn estimators.
+    The feature steps are not refitted, so their columns must be fixed.
+    """
+    features: Any = X
+    for _, step in model.steps[:-1]:
+        if step is not None and step != "passthrough":
+            features = step.transform(features)
+    model.steps[-1][1].partial_fit(features, y, classes=classes)
+    return model
+
+
 def save_model(model: Pipeline, path: str) -> None:
     joblib.dump(model, path)
 
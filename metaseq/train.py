@@ -1,13 +1,19 @@
 from __future__ import annotations
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Callable, Sequence
 import os
 import json
+import random
+import time
+import numpy as np
 import yaml
 import pandas as pd
+from scipy import sparse  # type: ignore[import-untyped]
 from sklearn.model_selection import train_test_split  # type: ignore[import-untyped]
 from sklearn.metrics import classification_report  # type: ignore[import-untyped]
+from binary_classifiers.artifacts import tag_kmer_params
+from binary_classifiers.ensemble import EnsemblePredictor
 from .dataio import load_sequences
-from .models import build_pipeline, save_model
+from .models import build_pipeline, build_student, save_model
 
 
 def _ensure_dir(path: str) -> None:
@@ -82,6 +88,160 @@ def train_from_config(config_path: str) -> Dict[str, Any]:
     }
 
 
+def augment_reads(
+    sequences: Sequence[str],
+    copies: int = 1,
+    read_length: int = 150,
+    substitution_rate: float = 0.01,
+    random_state: Optional[int] = None,
+) -> List[str]:
+    """Synthetic reads for distillation: ``copies`` random windows of up to
+    ``read_length`` bases per sequence, with point substitutions at
+    ``substitution_rate``."""
+    rng = random.Random(random_state)
+    reads: List[str] = []
+    for sequence in sequences:
+        for _ in range(copies):
+            length = min(read_length, len(sequence))
+            start = rng.randint(0, len(sequence) - length)
+            read = list(sequence[start : start + length])
+            for index in range(length):
+                if rng.random() < substitution_rate:
+                    read[index] = rng.choice("ACGT".replace(read[index].upper(), ""))
+            reads.append("".join(read))
+    return reads
+
+
+def fit_soft_labels(model: Any, features: Any, soft_labels: np.ndarray) -> Any:
+    """Fit ``model`` to soft Virus probabilities.
+
+    Every row is presented once as Virus and once as Host, weighted by the
+    teacher's probability of that class, which makes the log-loss the
+    cross-entropy against the soft targets. ``model`` is a Pipeline whose
+    last step accepts ``sample_weight``.
+    """
+    n_rows = features.shape[0]
+    soft_labels = np.asarray(soft_labels, dtype=float)
+    stacked = sparse.vstack([features, features]).tocsr()
+    labels = np.concatenate([np.ones(n_rows, dtype=int), np.zeros(n_rows, dtype=int)])
+    weights = np.concatenate([soft_labels, 1.0 - soft_labels])
+    keep = weights > 0
+    step = model.steps[-1][0]
+    model.fit(stacked[keep], labels[keep], **{f"{step}__sample_weight": weights[keep]})
+    return model
+
+
+def _per_read_ms(predict_one: Callable[[str], Any], sequences: Sequence[str]) -> float:
+    """Mean wall time of scoring one read at a time, in milliseconds."""
+    start = time.perf_counter()
+    for sequence in sequences:
+        predict_one(sequence)
+    return (time.perf_counter() - start) * 1000 / max(len(sequences), 1)
+
+
+def distill_from_config(config_path: str) -> Dict[str, Any]:
+    """Compress the teacher artifacts into a compact student model.
+
+    The teachers (``PredictClass`` model names, averaged by an
+    ``EnsemblePredictor``) label the training split plus augmented reads with
+    soft Virus probabilities, and the student from ``build_student`` is fitted
+    to them. Both are compared on the validation split for accuracy, label
+    agreement and per-read latency. The student and its vectorizer are saved
+    in ``PredictClass`` layout.
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+
+    data_cfg = cfg.get("data", {})
+    distill_cfg = cfg.get("distill", {})
+    train_cfg = cfg.get("train", {})
+    out_cfg = cfg.get("output", {})
+
+    X, y = load_dataset(
+        csv_path=data_cfg.get("csv"),
+        seq_file=data_cfg.get("seq_file"),
+        label_map_json=data_cfg.get("label_map_json"),
+    )
+    test_size = float(train_cfg.get("test_size", 0.2))
+    random_state = int(train_cfg.get("random_state", 42))
+    stratify = y if bool(train_cfg.get("stratify", True)) and len(set(y)) > 1 else None
+    X_train, X_val, _, y_val = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=stratify
+    )
+
+    augment_cfg = distill_cfg.get("augment", {})
+    X_distill = list(X_train) + augment_reads(
+        X_train,
+        copies=int(augment_cfg.get("copies", 1)),
+        read_length=int(augment_cfg.get("read_length", 150)),
+        substitution_rate=float(augment_cfg.get("substitution_rate", 0.01)),
+        random_state=random_state,
+    )
+
+    teacher_names = distill_cfg.get("teachers", ["RandomForest", "SVM"])
+    teacher = EnsemblePredictor.from_model_names(teacher_names)
+    soft_labels = np.array(
+        [
+            p.probabilities["Virus"]
+            for p in teacher.batch_predict_with_probabilities(X_distill)
+        ]
+    )
+
+    student_cfg = distill_cfg.get("student", {})
+    student_name = student_cfg.get("name", "logistic")
+    student_params = dict(student_cfg.get("params", {}))
+    student, vectorizer = build_student(student_name, student_params)
+    fit_soft_labels(student, vectorizer.transform(X_distill), soft_labels)
+
+    teacher_val = teacher.batch_predict_with_probabilities(list(X_val))
+    teacher_virus = np.array([p.probabilities["Virus"] for p in teacher_val])
+    student_virus = student.predict_proba(vectorizer.transform(X_val))[:, 1]
+    teacher_labels = (teacher_virus > 0.5).astype(int)
+    student_labels = (student_virus > 0.5).astype(int)
+    truth = np.asarray(y_val)
+
+    latency_reads = list(X_val)[: int(distill_cfg.get("latency_reads", 200))]
+    teacher_ms = _per_read_ms(teacher.predict_with_probabilities, latency_reads)
+    student_ms = _per_read_ms(
+        lambda read: student.predict_proba(vectorizer.transform([read])),
+        latency_reads,
+    )
+    teacher.close()
+
+    k = student_params.get("k", 6)
+    for artifact in (student, vectorizer):
+        tag_kmer_params(artifact, k, bool(student_params.get("canonical", False)))
+    model_path = out_cfg.get(
+        "model_path", "binary_classifiers/models/student_best_model.pkl"
+    )
+    vectorizer_path = out_cfg.get(
+        "vectorizer_path", "binary_classifiers/transformers/student_vectorizer.pkl"
+    )
+    for artifact, path in ((student, model_path), (vectorizer, vectorizer_path)):
+        _ensure_dir(path)
+        save_model(artifact, path)
+
+    classifier = student.steps[-1][1]
+    coefficients = getattr(classifier, "coef_", None)
+    return {
+        "model_path": model_path,
+        "vectorizer_path": vectorizer_path,
+        "teachers": list(teacher_names),
+        "student": student_name,
+        "n_distill": len(X_distill),
+        "n_val": len(X_val),
+        "teacher_accuracy": float((teacher_labels == truth).mean()),
+        "student_accuracy": float((student_labels == truth).mean()),
+        "agreement": float((teacher_labels == student_labels).mean()),
+        "mean_abs_probability_gap": float(np.abs(teacher_virus - student_virus).mean()),
+        "teacher_per_read_ms": teacher_ms,
+        "student_per_read_ms": student_ms,
+        "student_nonzero_kmers": (
+            int(np.count_nonzero(coefficients)) if coefficients is not None else None
+        ),
+    }
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -89,7 +249,16 @@ if __name__ == "__main__":
         description="Train binary classifier from YAML config"
     )
     parser.add_argument("--config", required=True, help="Path to YAML config")
+    parser.add_argument(
+        "--distill",
+        action="store_true",
+        help="Distill the teacher artifacts into a student (see distill_from_config)",
+    )
     args = parser.parse_args()
 
-    stats = train_from_config(args.config)
+    stats = (
+        distill_from_config(args.config)
+        if args.distill
+        else train_from_config(args.config)
+    )
     print(json.dumps(stats, indent=2))
@@ -8,7 +8,10 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from binary_classifiers.predict_class import PredictClass  # noqa: E402
+from binary_classifiers.predict_class import (  # noqa: E402
+    KMER_MODEL_NAMES,
+    PredictClass,
+)
 
 
 def main():
@@ -17,7 +20,7 @@ def main():
     )
     parser.add_argument(
         "--model",
-        choices=["RandomForest", "SVM"],
+        choices=KMER_MODEL_NAMES,
         default="RandomForest",
         help="Model to use",
     )
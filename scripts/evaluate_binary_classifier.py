@@ -5,17 +5,23 @@ import argparse
 import json
 from pathlib import Path
 import sys
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from binary_classifiers.evaluation import (  # noqa: E402
+    LabeledSequence,
     evaluate_predictor,
     load_labeled_sequences,
+    measure_throughput,
+)
+from binary_classifiers.predict_class import (  # noqa: E402
+    KMER_MODEL_NAMES,
+    PredictClass,
 )
-from binary_classifiers.predict_class import PredictClass  # noqa: E402
 
 
 def parse_args() -> argparse.Namespace:
@@ -24,9 +30,16 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--model",
-        choices=["RandomForest", "SVM"],
-        default="RandomForest",
-        help="Saved model artifact to evaluate",
+        nargs="+",
+        choices=KMER_MODEL_NAMES,
+        default=["RandomForest"],
+        help="Saved model artifact(s) to evaluate; several are benchmarked side by side",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Timed passes over the sequences; throughput uses the fastest",
     )
     parser.add_argument(
         "--virus-file",
@@ -45,22 +58,68 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def evaluate_model(
+    model_name: str, labeled_sequences: List[LabeledSequence], repeats: int
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    predictor = PredictClass(model_name=model_name)  # type: ignore[arg-type]
+    load_seconds = time.perf_counter() - start
+
+    metrics = evaluate_predictor(predictor, labeled_sequences)
+    throughput = measure_throughput(
+        predictor, [item.sequence for item in labeled_sequences], repeats
+    )
+    return {
+        "metrics": metrics,
+        "throughput": {"load_seconds": load_seconds, **throughput},
+    }
+
+
 def build_report(args: argparse.Namespace) -> Dict[str, Any]:
     labeled_sequences = load_labeled_sequences(
         virus_file=args.virus_file,
         host_file=args.host_file,
     )
-    predictor = PredictClass(model_name=args.model)
-    metrics = evaluate_predictor(predictor, labeled_sequences)
+    results = {
+        model_name: evaluate_model(model_name, labeled_sequences, args.repeats)
+        for model_name in args.model
+    }
 
+    if len(results) == 1:
+        ((model_name, result),) = results.items()
+        return {
+            "model_name": model_name,
+            "virus_file": args.virus_file,
+            "host_file": args.host_file,
+            **result,
+        }
     return {
-        "model_name": args.model,
+        "model_names": list(results),
         "virus_file": args.virus_file,
         "host_file": args.host_file,
-        "metrics": metrics,
+        "models": results,
+        "comparison": compare_models(results),
     }
 
 
+def compare_models(results: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Accuracy and throughput per model, relative to the first one listed."""
+    baseline = next(iter(results.values()))
+    rows = []
+    for model_name, result in results.items():
+        rate = result["throughput"]["sequences_per_second"]
+        baseline_rate = baseline["throughput"]["sequences_per_second"]
+        rows.append(
+            {
+                "model_name": model_name,
+                "accuracy": result["metrics"]["accuracy"],
+                "sequences_per_second": rate,
+                "speedup": rate / baseline_rate if baseline_rate else None,
+            }
+        )
+    return rows
+
+
 def main() -> None:
     args = parse_args()
     report = build_report(args)
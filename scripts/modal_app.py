@@ -27,7 +27,11 @@ image = (
         "fastapi", "uvicorn[standard]", "pydantic", "sqlalchemy", "python-multipart"
     )
     .add_local_dir("backend/app", "/root/app")
-    .add_local_dir("binary_classifiers", "/root/binary_classifiers")
+    .add_local_dir("data_processing", "/root/data_processing")
+    # Copied into the image so the memory-mapped model bundles are built once
+    # at image build time and shared by all processes in a container.
+    .add_local_dir("binary_classifiers", "/root/binary_classifiers", copy=True)
+    .run_commands("cd /root && python -m binary_classifiers.artifact_bundle")
 )
 
 # ---------------------------------------------------------------------------
@@ -80,6 +84,7 @@ def fastapi_app():
     # Point SQLite DB to the persistent volume
     os.environ["DB_PATH"] = f"{DB_MOUNT_PATH}/app.db"
     os.environ["WEIGHTS_DIR"] = WEIGHTS_MOUNT_PATH
+    os.environ.setdefault("PRELOAD_MODELS", "RandomForest,SVM")
 
     from app.main import app as _app
 
@@ -10,16 +10,23 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from binary_classifiers.predict_class import PredictClass  # noqa: E402
+from binary_classifiers.predict_class import (  # noqa: E402
+    KMER_MODEL_NAMES,
+    KmerModelName,
+    PredictClass,
+)
 
 
 @lru_cache(maxsize=2)
-def _get_predictor(model_name: Literal["RandomForest", "SVM"]) -> PredictClass:
+def _get_predictor(
+    model_name: KmerModelName,
+) -> PredictClass:
     return PredictClass(model_name=model_name)
 
 
 def predict_class(
-    dna_sequence: str, model_name: Literal["RandomForest", "SVM"] = "SVM"
+    dna_sequence: str,
+    model_name: KmerModelName = "SVM",
 ) -> Literal["Virus", "Host"]:
     if not isinstance(dna_sequence, str):
         raise ValueError("Input must be a string.")
@@ -38,7 +45,7 @@ if __name__ == "__main__":
     parser.add_argument("sequence", help="DNA sequence to classify")
     parser.add_argument(
         "--model",
-        choices=["RandomForest", "SVM"],
+        choices=KMER_MODEL_NAMES,
         default="SVM",
         help="Classifier model to use",
     )
@@ -3,8 +3,12 @@
 Retrain binary classifier with COVID (Virus) and Human (Host) data.
 """
 
+import argparse  # noqa: E402
+import json  # noqa: E402
 import os  # noqa: E402
+import pickle  # noqa: E402
 import sys  # noqa: E402
+import time  # noqa: E402
 import warnings  # noqa: E402
 from pathlib import Path  # noqa: E402
 
@@ -19,15 +23,34 @@ from sklearn.ensemble import RandomForestClassifier  # noqa: E402
 from sklearn.feature_extraction.text import CountVectorizer  # noqa: E402
 from sklearn.metrics import accuracy_score, classification_report  # noqa: E402
 from sklearn.model_selection import train_test_split  # noqa: E402
+from sklearn.naive_bayes import MultinomialNB  # noqa: E402
 from sklearn.svm import SVC  # noqa: E402
 
+from binary_classifiers.artifacts import tag_kmer_params  # noqa: E402
+from binary_classifiers.feature_selection import (  # noqa: E402
+    SELECTION_METHODS,
+    restrict_vocabulary,
+    select_columns,
+)
 from binary_classifiers.transformers.kmers_transformer import (  # noqa: E402
     KmerTransformer,
+    MultiKmerTransformer,
 )
+from metaseq.models import build_kernel_approximation_svm  # noqa: E402
 
 warnings.filterwarnings("ignore")
 
 LABEL_MAP = {0: "Host", 1: "Virus"}
+# model_type -> (model file, vectorizer file), as listed in MODEL_FILE_MAP.
+ARTIFACT_FILES = {
+    "random_forest": ("random_forest_best_model.pkl", "random_forest_vectorizer.pkl"),
+    "svm": (
+        "support_vector_machine_best_model.pkl",
+        "support_vector_machine_vectorizer.pkl",
+    ),
+    "approx_svm": ("approx_svm_best_model.pkl", "approx_svm_vectorizer.pkl"),
+    "naive_bayes": ("naive_bayes_best_model.pkl", "naive_bayes_vectorizer.pkl"),
+}
 
 
 def load_training_data(data_dir: str = "data"):
@@ -55,19 +78,56 @@ def load_training_data(data_dir: str = "data"):
     return sequences, labels
 
 
-def train_model(sequences, labels, model_type="random_forest"):
-    """Train a binary classifier."""
-    kmer_transformer = KmerTransformer()
-    kmers = kmer_transformer.transform(sequences)
-
-    vectorizer = CountVectorizer()
-    X = vectorizer.fit_transform(kmers)
+def train_model(
+    sequences,
+    labels,
+    model_type="random_forest",
+    canonical=False,
+    ks=(6,),
+    select=None,
+    n_features=500,
+    verbose=True,
+):
+    """Train a binary classifier.
+
+    With ``canonical`` a k-mer and its reverse complement share one feature.
+    Several ``ks`` train on the concatenated multi-k spectrum, in which case
+    the fitted ``MultiKmerTransformer`` is saved as the vectorizer, as it
+    always is for ``naive_bayes``.
+
+    ``select`` (one of ``SELECTION_METHODS``) keeps the ``n_features`` most
+    informative k-mers, scored on the training split only, and trims the
+    vectorizer's vocabulary to them so inference never counts the others.
+    It needs the single-k ``CountVectorizer``.
+    """
+    if len(ks) > 1 or model_type == "naive_bayes":
+        # Naive Bayes always counts the full spectrum, whose columns are
+        # fixed, so update_naive_bayes can fold in new batches.
+        kmer_transformer = None
+        vectorizer = MultiKmerTransformer(ks=tuple(ks), canonical=canonical).fit()
+        X = vectorizer.transform(sequences)
+    else:
+        kmer_transformer = KmerTransformer(k=ks[0], canonical=canonical)
+        vectorizer = CountVectorizer()
+        X = vectorizer.fit_transform(kmer_transformer.transform(sequences))
     y = np.array(labels)
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42, stratify=y
     )
 
+    if select:
+        if kmer_transformer is None:
+            raise ValueError(
+                "Feature selection needs a vocabulary; use a single k and a "
+                "model other than naive_bayes"
+            )
+        columns = select_columns(X_train, y_train, select, n_features, random_state=42)
+        restrict_vocabulary(vectorizer, columns, method=select)
+        X_train, X_test = X_train[:, columns], X_test[:, columns]
+        if verbose:
+            print(f"Selected {len(columns)} of {X.shape[1]} k-mers ({select})")
+
     if model_type == "random_forest":
         model = RandomForestClassifier(
             n_estimators=100,
@@ -76,6 +136,12 @@ def train_model(sequences, labels, model_type="random_forest"):
             random_state=42,
             n_jobs=-1,
         )
+    elif model_type == "naive_bayes":
+        model = MultinomialNB(alpha=1.0)
+    elif model_type == "approx_svm":
+        model = build_kernel_approximation_svm(
+            "nystroem", gamma=scale_gamma(X_train), random_state=42
+        )
     else:
         model = SVC(kernel="rbf", C=1.0, probability=True, random_state=42)
 
@@ -84,29 +150,92 @@ def train_model(sequences, labels, model_type="random_forest"):
     y_pred = model.predict(X_test)
     accuracy = accuracy_score(y_test, y_pred)
 
-    print(f"\n=== {model_type.upper()} Model Results ===")
-    print(f"Accuracy: {accuracy:.4f}")
-    print("\nClassification Report:")
-    print(classification_report(y_test, y_pred, target_names=["Host", "Virus"]))
+    if verbose:
+        print(f"\n=== {model_type.upper()} Model Results ===")
+        print(f"Accuracy: {accuracy:.4f}")
+        print("\nClassification Report:")
+        print(classification_report(y_test, y_pred, target_names=["Host", "Virus"]))
+    model.test_accuracy_ = accuracy
 
     return model, vectorizer, kmer_transformer
 
 
-def save_model(model, vectorizer, model_type="random_forest"):
-    """Save trained model and vectorizer."""
-    base_dir = Path(__file__).parent / "binary_classifiers"
-    models_dir = base_dir / "models"
-    transformers_dir = base_dir / "transformers"
+def selection_report(
+    sequences,
+    labels,
+    model_type="random_forest",
+    select="chi2",
+    sizes=(100, 250, 500, 1000),
+    canonical=False,
+    k=6,
+):
+    """Accuracy vs speed of ``model_type`` for each selected k-mer count.
+
+    Every row trains a model on ``size`` selected k-mers (``None`` is the
+    full vocabulary) and reports its held-out accuracy, pickled model size
+    and the per-read time to featurise and score all ``sequences``.
+    """
+    rows = []
+    for size in (None, *sizes):
+        model, vectorizer, kmer_transformer = train_model(
+            sequences,
+            labels,
+            model_type,
+            canonical=canonical,
+            ks=(k,),
+            select=select if size else None,
+            n_features=size or 0,
+            verbose=False,
+        )
+        start = time.perf_counter()
+        model.predict_proba(vectorizer.transform(kmer_transformer.transform(sequences)))
+        elapsed = time.perf_counter() - start
+        rows.append(
+            {
+                "n_features": len(vectorizer.vocabulary_),
+                "accuracy": round(float(model.test_accuracy_), 4),
+                "model_bytes": len(pickle.dumps(model)),
+                "ms_per_read": round(1000 * elapsed / len(sequences), 4),
+            }
+        )
+    return {"model_type": model_type, "select": select, "rows": rows}
 
-    models_dir.mkdir(exist_ok=True)
-    transformers_dir.mkdir(exist_ok=True)
 
-    if model_type == "random_forest":
-        model_path = models_dir / "random_forest_best_model.pkl"
-        vectorizer_path = transformers_dir / "random_forest_vectorizer.pkl"
+def scale_gamma(X):
+    """RBF width SVC uses for ``gamma="scale"``: 1 / (n_features * X.var())."""
+    if hasattr(X, "multiply"):
+        variance = X.multiply(X).mean() - X.mean() ** 2
     else:
-        model_path = models_dir / "support_vector_machine_best_model.pkl"
-        vectorizer_path = transformers_dir / "support_vector_machine_vectorizer.pkl"
+        variance = np.asarray(X).var()
+    return 1.0 / (X.shape[1] * variance) if variance > 0 else 1.0
+
+
+def artifact_paths(model_type):
+    """Model and vectorizer paths of ``model_type`` under binary_classifiers/."""
+    base_dir = PROJECT_ROOT / "binary_classifiers"
+    model_file, vectorizer_file = ARTIFACT_FILES[model_type]
+    return base_dir / "models" / model_file, base_dir / "transformers" / vectorizer_file
+
+
+def update_naive_bayes(sequences, labels):
+    """Fold labeled sequences into the saved naive Bayes model with
+    ``partial_fit`` instead of retraining it from scratch."""
+    model_path, vectorizer_path = artifact_paths("naive_bayes")
+    model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
+    model.partial_fit(vectorizer.transform(sequences), np.array(labels))
+    joblib.dump(model, model_path)
+    print(f"\nAdded {len(sequences)} sequences to {model_path}")
+
+
+def save_model(model, vectorizer, ks, canonical=False, model_type="random_forest"):
+    """Save trained model and vectorizer tagged with their k-mer settings."""
+    model_path, vectorizer_path = artifact_paths(model_type)
+    model_path.parent.mkdir(exist_ok=True)
+    vectorizer_path.parent.mkdir(exist_ok=True)
+
+    for artifact in (model, vectorizer):
+        tag_kmer_params(artifact, ks if len(ks) > 1 else ks[0], canonical)
 
     joblib.dump(model, model_path)
     joblib.dump(vectorizer, vectorizer_path)
@@ -129,8 +258,10 @@ def test_model(model, vectorizer, kmer_transformer):
 
     print("\n=== Testing Model ===")
     for name, seq in test_sequences:
-        kmers = kmer_transformer.transform([seq])
-        features = vectorizer.transform(kmers)
+        if kmer_transformer is None:
+            features = vectorizer.transform([seq])
+        else:
+            features = vectorizer.transform(kmer_transformer.transform([seq]))
         pred = model.predict(features)[0]
         proba = model.predict_proba(features)[0]
         label = LABEL_MAP[pred]
@@ -138,30 +269,130 @@ def test_model(model, vectorizer, kmer_transformer):
         print(f"{name}: {label} (confidence: {confidence:.2%})")
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data-dir", default="data", help="Directory with the training FASTA files"
+    )
+    parser.add_argument(
+        "--k",
+        dest="ks",
+        type=int,
+        nargs="+",
+        default=[6],
+        help="k-mer size; several values train on the concatenated spectrum",
+    )
+    parser.add_argument(
+        "--canonical",
+        action="store_true",
+        help="Collapse each k-mer with its reverse complement (strand-agnostic)",
+    )
+    parser.add_argument(
+        "--select",
+        choices=SELECTION_METHODS,
+        help="Keep only the --n-features most informative k-mers (single k)",
+    )
+    parser.add_argument(
+        "--n-features",
+        type=int,
+        default=500,
+        help="Number of k-mers kept by --select",
+    )
+    parser.add_argument(
+        "--selection-report",
+        type=int,
+        nargs="+",
+        metavar="N",
+        help="Print accuracy vs speed for these --select sizes and exit",
+    )
+    parser.add_argument(
+        "--update-naive-bayes",
+        action="store_true",
+        help="Only fold the data into the saved naive Bayes model (partial_fit)",
+    )
+    args = parser.parse_args(argv)
+    if (args.select or args.selection_report) and len(args.ks) > 1:
+        parser.error("--select needs a single --k")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
     print("Loading training data...")
-    sequences, labels = load_training_data()
+    sequences, labels = load_training_data(args.data_dir)
 
     if len(sequences) == 0:
         print("Error: No training data found!")
         sys.exit(1)
 
+    if args.update_naive_bayes:
+        update_naive_bayes(sequences, labels)
+        return
+
+    if args.selection_report:
+        for model_type in ("random_forest", "svm"):
+            report = selection_report(
+                sequences,
+                labels,
+                model_type,
+                select=args.select or "chi2",
+                sizes=args.selection_report,
+                canonical=args.canonical,
+                k=args.ks[0],
+            )
+            print(json.dumps(report, indent=2))
+        return
+
     print(f"\nTotal sequences: {len(sequences)}")
     print(f"Virus (1): {sum(labels)}")
     print(f"Host (0): {len(labels) - sum(labels)}")
 
     print("\nTraining RandomForest model...")
     rf_model, rf_vectorizer, kmer_transformer = train_model(
-        sequences, labels, "random_forest"
+        sequences,
+        labels,
+        "random_forest",
+        canonical=args.canonical,
+        ks=args.ks,
+        select=args.select,
+        n_features=args.n_features,
     )
-    save_model(rf_model, rf_vectorizer, "random_forest")
+    save_model(rf_model, rf_vectorizer, args.ks, args.canonical, "random_forest")
     test_model(rf_model, rf_vectorizer, kmer_transformer)
 
     print("\nTraining SVM model...")
-    svm_model, svm_vectorizer, _ = train_model(sequences, labels, "svm")
-    save_model(svm_model, svm_vectorizer, "svm")
+    svm_model, svm_vectorizer, _ = train_model(
+        sequences,
+        labels,
+        "svm",
+        canonical=args.canonical,
+        ks=args.ks,
+        select=args.select,
+        n_features=args.n_features,
+    )
+    save_model(svm_model, svm_vectorizer, args.ks, args.canonical, "svm")
     test_model(svm_model, svm_vectorizer, kmer_transformer)
 
+    print("\nTraining kernel-approximation SVM model...")
+    approx_model, approx_vectorizer, _ = train_model(
+        sequences,
+        labels,
+        "approx_svm",
+        canonical=args.canonical,
+        ks=args.ks,
+        select=args.select,
+        n_features=args.n_features,
+    )
+    save_model(approx_model, approx_vectorizer, args.ks, args.canonical, "approx_svm")
+    test_model(approx_model, approx_vectorizer, kmer_transformer)
+
+    print("\nTraining naive Bayes model...")
+    nb_model, nb_vectorizer, _ = train_model(
+        sequences, labels, "naive_bayes", canonical=args.canonical, ks=args.ks
+    )
+    save_model(nb_model, nb_vectorizer, args.ks, args.canonical, "naive_bayes")
+    test_model(nb_model, nb_vectorizer, None)
+
     print("\nDone! Models retrained successfully.")
 
 
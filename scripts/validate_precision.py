@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Check the compact float32 inference path against the float64 reference.
+
+Every sequence of the held-out FASTA/FASTQ files is classified by both
+precisions. The report lists the label agreement, the Virus-probability
+error and the throughput of each. The exit status is 1 when agreement or
+error miss the given tolerances.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from binary_classifiers.evaluation import (  # noqa: E402
+    compare_predictions,
+    measure_throughput,
+)
+from binary_classifiers.predict_class import (  # noqa: E402
+    KMER_MODEL_NAMES,
+    PredictClass,
+)
+from metaseq.dataio import load_sequences  # noqa: E402
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "fasta", nargs="+", help="Held-out FASTA/FASTQ file(s) to classify"
+    )
+    parser.add_argument(
+        "--model",
+        nargs="+",
+        choices=KMER_MODEL_NAMES,
+        default=["RandomForest", "FastSVM"],
+        help="Saved model artifact(s) to validate",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["sklearn", "compiled"],
+        default="compiled",
+        help="Inference engine used for both precisions",
+    )
+    parser.add_argument(
+        "--min-agreement",
+        type=float,
+        default=0.999,
+        help="Lowest acceptable fraction of matching labels",
+    )
+    parser.add_argument(
+        "--max-error",
+        type=float,
+        default=1e-4,
+        help="Largest acceptable absolute Virus-probability difference",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Timed passes over the sequences; throughput uses the fastest",
+    )
+    parser.add_argument("--output", help="Optional JSON output path for the report")
+    return parser.parse_args(argv)
+
+
+def validate_model(
+    model_name: str, sequences: List[str], args: argparse.Namespace
+) -> Dict[str, Any]:
+    reference = PredictClass(model_name=model_name, backend=args.backend)  # type: ignore[arg-type]
+    compact = PredictClass(
+        model_name=model_name, backend=args.backend, precision="float32"  # type: ignore[arg-type]
+    )
+    comparison = compare_predictions(
+        reference.batch_predict_with_probabilities(sequences),
+        compact.batch_predict_with_probabilities(sequences),
+    )
+    comparison["passed"] = (
+        comparison["label_agreement"] >= args.min_agreement
+        and comparison["max_abs_error"] <= args.max_error
+    )
+    comparison["float32_features"] = compact.float32_features
+    comparison["throughput"] = {
+        "float64": measure_throughput(reference, sequences, args.repeats),
+        "float32": measure_throughput(compact, sequences, args.repeats),
+    }
+    return comparison
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = parse_args(argv)
+    sequences = [
+        sequence for path in args.fasta for _, sequence in load_sequences(path)
+    ]
+    if not sequences:
+        print("Error: no sequences found in the given files")
+        return 1
+
+    report = {
+        "files": args.fasta,
+        "backend": args.backend,
+        "models": {
+            model_name: validate_model(model_name, sequences, args)
+            for model_name in args.model
+        },
+    }
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(report_json + "\n", encoding="utf-8")
+    print(report_json)
+    return 0 if all(result["passed"] for result in report["models"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,47 @@
 from __future__ import annotations
 
+import random
+
+import pytest
+
 from binary_classifiers.evaluation import (
     LabeledSequence,
+    compare_predictions,
     evaluate_predictor,
     load_labeled_sequences,
+    measure_throughput,
 )
-from binary_classifiers.predict_class import PredictClass
+from binary_classifiers.predict_class import PredictClass, Prediction
 
 
 class _StubPredictor:
-    def batch_predict(self, sequences: list[str]) -> list[str]:
-        assert len(sequences) == 4
-        return ["Host", "Virus", "Host", "Host"]
-
-    def batch_predict_probabilities(
+    def batch_predict_with_probabilities(
         self, sequences: list[str]
-    ) -> list[dict[str, float]]:
+    ) -> list[Prediction]:
         assert len(sequences) == 4
         return [
-            {"Host": 0.9, "Virus": 0.1},
-            {"Host": 0.2, "Virus": 0.8},
-            {"Host": 0.65, "Virus": 0.35},
-            {"Host": 0.75, "Virus": 0.25},
+            Prediction("Host", 0.9, {"Host": 0.9, "Virus": 0.1}),
+            Prediction("Virus", 0.8, {"Host": 0.2, "Virus": 0.8}),
+            Prediction("Host", 0.65, {"Host": 0.65, "Virus": 0.35}),
+            Prediction("Host", 0.75, {"Host": 0.75, "Virus": 0.25}),
         ]
 
 
+class _CountingModel:
+    classes_ = [0, 1]
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def predict(self, features):
+        self.calls.append("predict")
+        raise AssertionError("single-pass API must not call predict")
+
+    def predict_proba(self, features):
+        self.calls.append("predict_proba")
+        return [[0.3, 0.7], [0.5, 0.5], [0.9, 0.1]]
+
+
 def test_load_labeled_sequences_assigns_expected_labels(tmp_path) -> None:
     host_path = tmp_path / "host.fasta"
     virus_path = tmp_path / "virus.fasta"
@@ -64,6 +81,29 @@ def test_evaluate_predictor_returns_metrics_and_errors() -> None:
     assert report["errors"][0]["predicted"] == "Host"
 
 
+def test_measure_throughput_reports_best_pass() -> None:
+    sequences = ["AAAA", "TTTT", "GGGG", "CCCC"]
+
+    report = measure_throughput(_StubPredictor(), sequences, repeats=2)
+
+    assert report["sequences"] == 4
+    assert report["seconds"] > 0
+    assert report["sequences_per_second"] == 4 / report["seconds"]
+
+
+def test_compare_predictions_reports_agreement_and_error() -> None:
+    reference = _StubPredictor().batch_predict_with_probabilities(["A"] * 4)
+    candidate = list(reference)
+    candidate[2] = Prediction("Virus", 0.55, {"Host": 0.45, "Virus": 0.55})
+
+    report = compare_predictions(reference, candidate)
+
+    assert report["label_agreement"] == 0.75
+    assert report["disagreements"] == [2]
+    assert abs(report["max_abs_error"] - 0.2) < 1e-12
+    assert abs(report["mean_abs_error"] - 0.05) < 1e-12
+
+
 def test_predict_class_probability_mapping_exposes_both_labels() -> None:
     predictor = PredictClass(model_name="RandomForest")
 
@@ -89,3 +129,66 @@ def test_svm_probability_mapping_aligns_with_prediction() -> None:
     assert max(virus_probabilities, key=virus_probabilities.get) == predictor.predict(
         "CAAGTGCTTTTGTGGAAACTGTGAAAGGTT"
     )
+
+
+def test_batch_predict_with_probabilities_scores_in_one_pass() -> None:
+    predictor = PredictClass(model_name="RandomForest")
+    model = _CountingModel()
+    predictor.model = model
+
+    predictions = predictor.batch_predict_with_probabilities(
+        ["ACGTACGTAC", "GGGCCCAAAT", "TTTTAAAACC"]
+    )
+
+    assert model.calls == ["predict_proba"]
+    assert [prediction.label for prediction in predictions] == [
+        "Virus",
+        "Host",
+        "Host",
+    ]
+    assert [prediction.confidence for prediction in predictions] == [0.7, 0.5, 0.9]
+    assert predictions[0].probabilities == {"Host": 0.3, "Virus": 0.7}
+
+
+def test_svm_single_pass_labels_follow_decision_function() -> None:
+    predictor = PredictClass(model_name="SVM")
+    sequences = ["ATGAAGGTGAAGGCCACCCTGCTGCTGTGC", "CAAGTGCTTTTGTGGAAACTGTGAAAGGTT"]
+
+    predictions = predictor.batch_predict_with_probabilities(sequences)
+
+    assert [p.label for p in predictions] == predictor.batch_predict(sequences)
+    for prediction in predictions:
+        assert prediction.confidence == max(prediction.probabilities.values())
+
+
+@pytest.mark.parametrize("model_name", ["SVM", "RandomForest"])
+def test_probability_maps_match_per_row_predict_and_predict_proba(
+    model_name,
+) -> None:
+    rng = random.Random(9)
+    sequences = [
+        "".join(rng.choice("ACGT") for _ in range(rng.randint(20, 300)))
+        for _ in range(300)
+    ]
+    predictor = PredictClass(model_name=model_name)
+    features = predictor._preprocess_batch(sequences)
+    model = predictor.model
+
+    # Each row's map is aligned with that row's predict() label.
+    expected = []
+    for prediction, row in zip(model.predict(features), model.predict_proba(features)):
+        probability_map = dict(
+            zip(map(predictor._prediction_to_label, model.classes_), map(float, row))
+        )
+        label = predictor._prediction_to_label(prediction)
+        if max(probability_map, key=probability_map.get) != label:
+            probability_map = {
+                "Host": probability_map["Virus"],
+                "Virus": probability_map["Host"],
+            }
+        expected.append(probability_map)
+
+    assert predictor.batch_predict_probabilities(sequences) == expected
+    assert [
+        p.probabilities for p in predictor.batch_predict_with_probabilities(sequences)
+    ] == expected
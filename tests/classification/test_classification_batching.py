@@ -0,0 +1,99 @@
+"""Tests for batched scoring in the classification service.
+
+See backend/app/services/classification.py.
+"""
+
+import random
+
+import pytest
+
+from backend.app.schemas.classification import ModelConfig, SequenceInput
+from backend.app.services import classification as service
+
+_rng = random.Random(21)
+SEQUENCES = [
+    SequenceInput(
+        id=f"read{index}",
+        sequence="".join(_rng.choice("ACGT") for _ in range(_rng.randint(20, 300))),
+    )
+    for index in range(10)
+]
+SEQUENCES.insert(3, SequenceInput(id="bad", sequence="ACGTXXACGT"))
+
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    calls = []
+    predictor = service.get_predictor("RandomForest")
+    original = predictor.batch_predict_with_probabilities
+
+    def counting(sequences):
+        calls.append(len(sequences))
+        return original(sequences)
+
+    monkeypatch.setattr(predictor, "batch_predict_with_probabilities", counting)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        ModelConfig(type="Random Forest"),
+        ModelConfig(type="SVM", window_size=50),
+        ModelConfig(cascade=True, cascade_margin=0.5),
+        ModelConfig(type="Random Forest", forest_early_stopping=True),
+    ],
+)
+def test_batched_results_match_per_sequence_results(config) -> None:
+    batched = service.run_classification(SEQUENCES, config, "test")
+
+    assert [r.sequence_id for r in batched.detailed_results] == [
+        seq.id for seq in SEQUENCES
+    ]
+    assert batched.detailed_results[3].prediction == "Invalid"
+    assert batched.detailed_results == [
+        service.classify_sequence(seq.id, seq.sequence, config) for seq in SEQUENCES
+    ]
+
+
+def test_run_classification_scores_one_chunk_per_model_call(model_calls) -> None:
+    config = ModelConfig(type="Random Forest", batch_size=4)
+
+    service.run_classification(SEQUENCES, config, "test")
+
+    # The invalid read is never scored.
+    assert model_calls == [4, 4, 2]
+
+
+def test_model_backend_defaults_to_sklearn_and_rejects_typos(monkeypatch) -> None:
+    monkeypatch.delenv("MODEL_BACKEND", raising=False)
+    assert service._env_choice("MODEL_BACKEND", ("sklearn", "compiled"), "sklearn") == (
+        "sklearn"
+    )
+
+    monkeypatch.setenv("MODEL_BACKEND", "skleran")
+    with pytest.raises(RuntimeError, match="MODEL_BACKEND must be one of"):
+        service._env_choice("MODEL_BACKEND", ("sklearn", "compiled"), "sklearn")
+
+
+def test_temperature_scaling_rescales_each_row_of_the_batch() -> None:
+    scaled = service._apply_temperature_scaling(
+        [
+            {"Host": 0.5, "Virus": 0.5},
+            {"Host": 0.2, "Virus": 0.8},
+            {"Host": 1.0, "Virus": 0.0},
+        ],
+        temperature=0.5,
+    )
+
+    # With T = 0.5 the odds are squared: 0.8 : 0.2 becomes 16 : 1.
+    assert scaled[0] == pytest.approx({"Host": 0.5, "Virus": 0.5})
+    assert scaled[1] == pytest.approx({"Host": 1 / 17, "Virus": 16 / 17})
+    assert scaled[2] == pytest.approx({"Host": 1.0, "Virus": 0.0})
+    assert service._apply_temperature_scaling([]) == []
+
+
+def test_predictor_cache_holds_every_model() -> None:
+    assert service.get_predictor.cache_parameters()["maxsize"] >= len(
+        service.get_args(service.ModelName)
+    )
@@ -0,0 +1,90 @@
+"""Tests for cascade, ensemble and anytime-forest modes in the classification
+service.
+
+See backend/app/services/classification.py.
+"""
+
+import pytest
+
+from backend.app.schemas.classification import ModelConfig, SequenceInput
+from backend.app.services import classification as service
+
+SEQUENCES = [
+    SequenceInput(id="virus", sequence="ATGCGTACGTTAGCCGATAGCTAGGCTAACGTTAGC" * 4),
+    SequenceInput(id="host", sequence="GGGCGGCGACCTCGCGGGTTTTCGCTATTTATGAAAAT" * 4),
+]
+
+
+@pytest.fixture
+def counters():
+    service.cascade_counters.clear()
+    yield service.cascade_counters
+    service.cascade_counters.clear()
+
+
+def test_cascade_keeps_confident_calls_on_first_stage(counters) -> None:
+    response = service.run_classification(
+        SEQUENCES, ModelConfig(cascade=True, cascade_margin=0.0), "test"
+    )
+
+    assert [r.decided_by for r in response.detailed_results] == ["RandomForest"] * 2
+    assert response.stage_counts == {"RandomForest": 2}
+    assert counters.stats() == {
+        "sequences": 2,
+        "escalated": 0,
+        "escalation_rate": 0.0,
+        "stages": {"RandomForest": {"scored": 2, "decided": 2}},
+    }
+
+
+def test_cascade_escalates_uncertain_calls(counters) -> None:
+    stages = service._cascade_stages()
+    response = service.run_classification(
+        SEQUENCES, ModelConfig(cascade=True, cascade_margin=1.0), "test"
+    )
+
+    # No margin reaches 1.0, so every sequence runs through every stage.
+    assert stages[:2] == ["RandomForest", "SVM"]
+    assert response.stage_counts == {stages[-1]: 2}
+    final = service.run_classification(SEQUENCES, ModelConfig(type=stages[-1]), "test")
+    assert [r.prediction for r in response.detailed_results] == [
+        r.prediction for r in final.detailed_results
+    ]
+    stats = counters.stats()
+    assert stats["escalated"] == 2
+    assert stats["stages"] == {
+        name: {"scored": 2, "decided": 2 if name == stages[-1] else 0}
+        for name in stages
+    }
+
+
+def test_single_model_results_record_their_model() -> None:
+    result = service.classify_sequence(
+        "seq", SEQUENCES[0].sequence, ModelConfig(type="SVM")
+    )
+
+    assert result.decided_by == "SVM"
+
+
+def test_ensemble_model_type_uses_shared_predictors() -> None:
+    result = service.classify_sequence(
+        "seq", SEQUENCES[0].sequence, ModelConfig(type="Ensemble (RF + SVM)")
+    )
+
+    assert result.decided_by == "Ensemble"
+    ensemble = service.get_predictor("Ensemble")
+    assert ensemble.members == [
+        service.get_predictor("RandomForest"),
+        service.get_predictor("SVM"),
+    ]
+
+
+def test_forest_early_stopping_reports_trees_used() -> None:
+    config = ModelConfig(type="Random Forest", forest_early_stopping=True)
+
+    result = service.classify_sequence("seq", SEQUENCES[0].sequence, config)
+    full = service.classify_sequence("seq", SEQUENCES[0].sequence, ModelConfig())
+
+    assert result.trees_used is not None and 1 <= result.trees_used <= 100
+    assert result.prediction == full.prediction
+    assert full.trees_used is None
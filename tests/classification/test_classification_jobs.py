@@ -0,0 +1,261 @@
+"""Tests for background classification jobs.
+
+See backend/app/services/classification_jobs.py.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.database import Base, get_db
+from backend.app.models import ClassificationJob, ClassificationJobResult
+from backend.app.schemas.classification import ModelConfig, SequenceInput
+from backend.app.services import classification_jobs
+from backend.app.services.classification import classify_sequence
+from backend.app.services.classification_jobs import JobRunner, get_job_runner
+
+_rng = random.Random(22)
+SEQUENCES = [
+    {
+        "id": f"read{index}",
+        "sequence": "".join(_rng.choice("ACGT") for _ in range(120)),
+    }
+    for index in range(7)
+]
+CONFIG = ModelConfig(type="Random Forest", batch_size=3)
+
+
+@pytest.fixture
+def job_db(tmp_path):
+    """File-backed SQLite sessions. Workers need their own connections, which
+    the shared in-memory ``test_db`` cannot give them."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def job_client(job_db):
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    def override_get_db():
+        db = job_db()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    # A server runs the lifespan on its main thread, TestClient on another;
+    # create the job runner (and numba's threads) on this one first.
+    get_job_runner()
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+def test_job_runs_in_background_and_pages_results(job_client) -> None:
+    submitted = job_client.post(
+        "/classifications/jobs",
+        json={"sequences": SEQUENCES, "config": CONFIG.model_dump()},
+    )
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+    get_job_runner().wait(job_id, timeout=60)
+
+    first = job_client.get(
+        f"/classifications/jobs/{job_id}", params={"limit": 5}
+    ).json()
+    second = job_client.get(
+        f"/classifications/jobs/{job_id}", params={"offset": first["next_offset"]}
+    ).json()
+
+    assert first["status"] == "completed"
+    assert first["completed_sequences"] == first["total_sequences"] == 7
+    assert first["next_offset"] == 5 and second["next_offset"] is None
+    results = first["results"] + second["results"]
+    assert results == [
+        classify_sequence(seq["id"], seq["sequence"], CONFIG).model_dump()
+        for seq in SEQUENCES
+    ]
+    assert sum(first["prediction_counts"].values()) == 7
+
+
+def test_unknown_job_and_empty_submission_are_rejected(job_client) -> None:
+    assert job_client.get("/classifications/jobs/missing").status_code == 404
+    assert (
+        job_client.post("/classifications/jobs", json={"sequences": []}).status_code
+        == 400
+    )
+
+
+def test_resume_continues_from_last_stored_batch(job_db, monkeypatch) -> None:
+    sequences = [SequenceInput(**seq) for seq in SEQUENCES]
+    db = job_db()
+    job = ClassificationJob(
+        id="interrupted",
+        status="running",
+        source="test",
+        config=CONFIG,
+        sequences=[[seq.id, seq.sequence] for seq in sequences],
+        total_sequences=len(sequences),
+        completed_sequences=3,
+        processing_time=0.0,
+    )
+    db.add(job)
+    db.add_all(
+        ClassificationJobResult(
+            job_id="interrupted",
+            position=index,
+            prediction=result.prediction,
+            result=result,
+        )
+        for index, result in enumerate(
+            classify_sequence(seq.id, seq.sequence, CONFIG) for seq in sequences[:3]
+        )
+    )
+    db.commit()
+    classified = []
+    original = classification_jobs.classify_sequences
+
+    def recording(batch, config):
+        classified.extend(seq_id for seq_id, _ in batch)
+        return original(batch, config)
+
+    monkeypatch.setattr(classification_jobs, "classify_sequences", recording)
+
+    runner = JobRunner(max_workers=1)
+    assert runner.resume(db.get_bind()) == ["interrupted"]
+    runner.wait("interrupted", timeout=60)
+
+    db.expire_all()
+    page = classification_jobs.get_job_page(db, "interrupted")
+    assert classified == [seq.id for seq in sequences[3:]]
+    assert page.status == "completed"
+    assert [r.sequence_id for r in page.results] == [seq.id for seq in sequences]
+    db.close()
+
+
+def test_failed_job_records_error(job_db, monkeypatch) -> None:
+    def failing(batch, config):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(classification_jobs, "classify_sequences", failing)
+    db = job_db()
+    runner = JobRunner(max_workers=1)
+
+    job = runner.submit(db, [SequenceInput(**SEQUENCES[0])], CONFIG, "test")
+    runner.wait(job.id, timeout=60)
+
+    db.expire_all()
+    page = classification_jobs.get_job_page(db, job.id)
+    assert page.status == "failed"
+    assert page.error == "RuntimeError: model unavailable"
+    db.close()
+
+
+def _stored_job(job_id, **columns):
+    return ClassificationJob(
+        id=job_id,
+        status="running",
+        source="test",
+        config=CONFIG,
+        sequences=[[seq["id"], seq["sequence"]] for seq in SEQUENCES],
+        total_sequences=len(SEQUENCES),
+        completed_sequences=0,
+        processing_time=0.0,
+        **columns,
+    )
+
+
+def test_only_jobs_with_an_expired_lease_are_resumed(job_db) -> None:
+    now = datetime.now(timezone.utc)
+    db = job_db()
+    db.add(_stored_job("leased", owner="other-worker", heartbeat_at=now))
+    db.add(
+        _stored_job(
+            "abandoned", owner="dead-worker", heartbeat_at=now - timedelta(hours=1)
+        )
+    )
+    db.commit()
+
+    runner = JobRunner(max_workers=1, lease_seconds=60)
+    assert runner.resume(db.get_bind()) == ["abandoned"]
+    runner.wait("abandoned", timeout=60)
+
+    db.expire_all()
+    leased, abandoned = db.get(ClassificationJob, "leased"), db.get(
+        ClassificationJob, "abandoned"
+    )
+    assert (leased.status, leased.owner, leased.completed_sequences) == (
+        "running",
+        "other-worker",
+        0,
+    )
+    assert (abandoned.status, abandoned.owner) == ("completed", None)
+    db.close()
+
+
+def test_a_claimed_job_is_not_run_by_a_second_runner(job_db, monkeypatch) -> None:
+    started, release = threading.Event(), threading.Event()
+    original = classification_jobs.classify_sequences
+
+    def blocking(batch, config):
+        started.set()
+        release.wait(timeout=60)
+        return original(batch, config)
+
+    monkeypatch.setattr(classification_jobs, "classify_sequences", blocking)
+    db = job_db()
+    first, second = JobRunner(max_workers=1), JobRunner(max_workers=1)
+
+    job = first.submit(db, [SequenceInput(**SEQUENCES[0])], CONFIG, "test")
+    assert started.wait(timeout=60)
+    assert second.resume(db.get_bind()) == []
+    assert not second._claim(db, job.id)
+    release.set()
+    first.wait(job.id, timeout=60)
+
+    db.expire_all()
+    page = classification_jobs.get_job_page(db, job.id)
+    assert page.status == "completed"
+    assert len(page.results) == 1
+    db.close()
+
+
+def test_expired_lease_is_taken_over_without_a_restart(job_db) -> None:
+    db = job_db()
+    db.add(
+        _stored_job(
+            "orphaned", owner="dead-worker", heartbeat_at=datetime.now(timezone.utc)
+        )
+    )
+    db.commit()
+    runner = JobRunner(max_workers=1, lease_seconds=0.5)
+
+    # The lease is still fresh at startup; the periodic scan picks it up.
+    assert runner.resume(db.get_bind()) == []
+    deadline = time.monotonic() + 60
+    job = db.get(ClassificationJob, "orphaned")
+    while job.status != "completed" and time.monotonic() < deadline:
+        time.sleep(0.1)
+        db.expire_all()
+        job = db.get(ClassificationJob, "orphaned")
+    runner.stop()
+
+    assert (job.status, job.owner, job.completed_sequences) == (
+        "completed",
+        None,
+        len(SEQUENCES),
+    )
+    db.close()
@@ -0,0 +1,94 @@
+"""Tests for process-pool classification.
+
+See backend/app/services/classification_pool.py.
+"""
+
+import random
+
+import pytest
+
+from backend.app.schemas.classification import ModelConfig, SequenceInput
+from backend.app.services import classification as service
+from backend.app.services.classification_pool import (
+    ClassificationPool,
+    decode_batch,
+    encode_batch,
+)
+
+_rng = random.Random(25)
+SEQUENCES = [
+    SequenceInput(
+        id=f"read{index}",
+        sequence="".join(_rng.choice("ACGT") for _ in range(_rng.randint(30, 200))),
+    )
+    for index in range(9)
+]
+SEQUENCES.insert(4, SequenceInput(id="bad", sequence="ACGTXXACGT"))
+CONFIG = ModelConfig(type="Random Forest", batch_size=2)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ClassificationPool(2, preload=["RandomForest"])
+    yield pool
+    pool.close()
+
+
+def test_batches_round_trip_through_the_encoding() -> None:
+    pairs = [("read1", "ACGT"), ("", ""), ("séquence", "NNACGT")]
+
+    batch = encode_batch(pairs)
+
+    assert batch.sequences == b"ACGTNNACGT"
+    assert batch.sequence_offsets.tolist() == [0, 4, 4, 10]
+    assert decode_batch(batch) == pairs
+
+
+def test_pool_results_match_in_process_results(pool, monkeypatch) -> None:
+    expected = service.run_classification(SEQUENCES, CONFIG, "test")
+
+    monkeypatch.setattr(service, "get_classification_pool", lambda: pool)
+    pooled = service.run_classification(SEQUENCES, CONFIG, "test")
+    batches = list(
+        service.iter_classification_batches(
+            ((seq.id, seq.sequence) for seq in SEQUENCES), CONFIG
+        )
+    )
+
+    assert pooled.detailed_results == expected.detailed_results
+    assert [len(batch) for batch in batches] == [2, 2, 2, 2, 2]
+    assert [result for batch in batches for result in batch] == (
+        expected.detailed_results
+    )
+
+
+def test_pool_reports_worker_cascade_counts(pool, monkeypatch) -> None:
+    config = ModelConfig(cascade=True, cascade_margin=0.1, batch_size=3)
+    service.cascade_counters.clear()
+    service.run_classification(SEQUENCES, config, "test")
+    expected = service.cascade_counters.drain()
+
+    monkeypatch.setattr(service, "get_classification_pool", lambda: pool)
+    service.run_classification(SEQUENCES, config, "test")
+
+    # Some reads escalate to the second stage and some do not.
+    assert len(expected[1]) == 2 and sum(expected[1].values()) == len(SEQUENCES) - 1
+    assert service.cascade_counters.drain() == expected
+
+
+def test_retired_pool_finishes_requests_in_flight() -> None:
+    pool = ClassificationPool(1)
+    batches = pool.map_batches(((seq.id, seq.sequence) for seq in SEQUENCES), CONFIG)
+    first = next(batches)
+
+    pool.retire()
+    rest = list(batches)
+
+    assert len(first) + sum(len(batch) for batch in rest) == len(SEQUENCES)
+    with pytest.raises(RuntimeError):
+        pool.classify([("read0", "ACGT" * 10)], CONFIG)
+
+
+def test_pool_needs_a_worker() -> None:
+    with pytest.raises(ValueError):
+        ClassificationPool(0)
@@ -37,6 +37,13 @@ class TestModelConfig:
         with pytest.raises(ValidationError):
             ModelConfig(ood_threshold=1.5)
 
+    def test_window_mode_is_off_by_default_and_validated(self) -> None:
+        assert ModelConfig().window_size is None
+        with pytest.raises(ValidationError):
+            ModelConfig(window_size=5)
+        with pytest.raises(ValidationError):
+            ModelConfig(window_size=100, window_stride=0)
+
 
 class TestSequenceInput:
     def test_valid(self) -> None:
@@ -0,0 +1,159 @@
+"""Tests for streamed classification responses.
+
+See backend/app/services/classification.py and the
+``/classifications/classify/stream`` and ``/classifications/classify/upload``
+routes.
+"""
+
+import gzip
+import json
+import random
+
+import pytest
+
+from backend.app.schemas.classification import (
+    ClassificationSummary,
+    ModelConfig,
+    SequenceInput,
+    SequenceResult,
+)
+from backend.app.services import classification as service
+
+_rng = random.Random(23)
+SEQUENCES = [
+    {
+        "id": f"read{index}",
+        "sequence": "".join(_rng.choice("ACGT") for _ in range(150)),
+    }
+    for index in range(5)
+]
+SEQUENCES.insert(2, {"id": "bad", "sequence": "ACGTXXACGT"})
+CONFIG = ModelConfig(type="Random Forest", batch_size=2)
+
+
+def _expected():
+    return service.run_classification(
+        [SequenceInput(**seq) for seq in SEQUENCES], CONFIG, "test"
+    )
+
+
+def _parse_sse(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append(
+            (event.removeprefix("event: "), json.loads(data.removeprefix("data: ")))
+        )
+    return events
+
+
+def test_ndjson_stream_matches_full_response(client) -> None:
+    response = client.post(
+        "/classifications/classify/stream",
+        json={"sequences": SEQUENCES, "config": CONFIG.model_dump(), "source": "test"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    expected = _expected()
+    assert [event["event"] for event in events] == ["result"] * len(SEQUENCES) + [
+        "summary"
+    ]
+    assert [
+        SequenceResult(**event["data"]) for event in events[:-1]
+    ] == expected.detailed_results
+
+    summary = ClassificationSummary(**events[-1]["data"])
+    assert summary.source == "test"
+    assert summary.total_sequences == expected.total_sequences
+    assert summary.virus_count == expected.virus_count
+    assert summary.host_count == expected.host_count
+
+
+def test_sse_stream(client) -> None:
+    response = client.post(
+        "/classifications/classify/stream?format=sse",
+        json={"sequences": SEQUENCES, "config": CONFIG.model_dump()},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(response.text)
+    assert [name for name, _ in events[:-1]] == ["result"] * len(SEQUENCES)
+    assert [data["sequence_id"] for _, data in events[:-1]] == [
+        seq["id"] for seq in SEQUENCES
+    ]
+    assert events[-1][0] == "summary"
+    assert events[-1][1]["total_sequences"] == len(SEQUENCES)
+
+
+def test_stream_rejects_empty_requests(client) -> None:
+    response = client.post("/classifications/classify/stream", json={"sequences": []})
+    assert response.status_code == 400
+
+
+def test_batches_are_classified_as_the_input_is_consumed() -> None:
+    consumed = []
+
+    def pairs():
+        for seq in SEQUENCES:
+            consumed.append(seq["id"])
+            yield seq["id"], seq["sequence"]
+
+    batches = service.iter_classification_batches(pairs(), CONFIG)
+    first = next(batches)
+
+    assert [result.sequence_id for result in first] == ["read0", "read1"]
+    assert consumed == ["read0", "read1"]
+    assert sum(len(batch) for batch in batches) == len(SEQUENCES) - 2
+
+
+def test_stream_ends_with_error_event(monkeypatch) -> None:
+    def failing(batch, config):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(service, "classify_sequences", failing)
+    chunks = list(
+        service.stream_classification(
+            [("read0", "ACGT" * 10)], CONFIG, "test", fmt="ndjson"
+        )
+    )
+
+    assert [json.loads(chunk) for chunk in chunks] == [
+        {"event": "error", "data": {"detail": "RuntimeError: model unavailable"}}
+    ]
+
+
+def _fasta():
+    return "".join(f">{seq['id']}\n{seq['sequence']}\n" for seq in SEQUENCES).encode()
+
+
+def test_upload_streams_the_same_results(client) -> None:
+    response = client.post(
+        "/classifications/classify/upload",
+        files={"file": ("reads.fasta.gz", gzip.compress(_fasta()))},
+        data={"config": CONFIG.model_dump_json()},
+    )
+    assert response.status_code == 200
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    expected = _expected()
+    assert [
+        SequenceResult(**event["data"]) for event in events[:-1]
+    ] == expected.detailed_results
+    assert events[-1]["event"] == "summary"
+    assert events[-1]["data"]["source"] == "reads.fasta.gz"
+
+
+@pytest.mark.parametrize(
+    "files, data",
+    [
+        ({"file": ("empty.fasta", b"")}, {}),
+        ({"file": ("notes.txt", b"just some text")}, {}),
+        ({"file": ("reads.fasta", b">seq1\nACGT")}, {"config": '{"batch_size": 0}'}),
+    ],
+)
+def test_upload_rejects_bad_input(client, files, data) -> None:
+    response = client.post("/classifications/classify/upload", files=files, data=data)
+    assert response.status_code == 400
@@ -0,0 +1,57 @@
+"""Tests for sliding-window classification in the classification service.
+
+See backend/app/services/classification.py.
+"""
+
+from backend.app.schemas.classification import ModelConfig, WindowPrediction
+from backend.app.services.classification import (
+    _merge_viral_windows,
+    classify_sequence,
+)
+
+
+def _window(start: int, end: int, virus: float) -> WindowPrediction:
+    return WindowPrediction(
+        start=start, end=end, virus_probability=virus, host_probability=1 - virus
+    )
+
+
+def test_merge_viral_windows_joins_overlapping_calls() -> None:
+    windows = [
+        _window(0, 100, 0.9),
+        _window(50, 150, 0.7),
+        _window(100, 200, 0.2),
+        _window(150, 250, 0.8),
+        _window(300, 400, 0.95),
+    ]
+
+    regions = _merge_viral_windows(windows, threshold=0.6)
+
+    # 150-250 touches the end of the 0-150 region, so it extends it.
+    assert [(r.start, r.end, r.window_count) for r in regions] == [
+        (0, 250, 3),
+        (300, 400, 1),
+    ]
+    assert regions[0].mean_virus_probability == 0.8
+    assert regions[0].max_virus_probability == 0.9
+
+
+def test_classify_sequence_reports_windows_only_when_enabled() -> None:
+    sequence = "ATGCGTACGTTAGCCGATAGCTAGGCTAACGTTAGC" * 30
+
+    plain = classify_sequence("seq", sequence, ModelConfig())
+    windowed = classify_sequence(
+        "seq", sequence, ModelConfig(window_size=300, window_stride=200)
+    )
+
+    assert plain.window_predictions is None
+    assert windowed.prediction == plain.prediction
+    assert windowed.window_predictions is not None
+    assert [(w.start, w.end) for w in windowed.window_predictions] == [
+        (0, 300),
+        (200, 500),
+        (400, 700),
+        (600, 900),
+        (800, 1080),
+    ]
+    assert windowed.viral_regions is not None
@@ -89,23 +89,15 @@ def test_predict_class_private_guards_raise_for_missing_runtime() -> None:
         predictor._preprocess("ACGT")
 
 
-def test_predict_class_probability_helpers_cover_error_and_swap_paths() -> None:
+def test_predict_class_probability_helpers_cover_fallback_and_error_paths() -> None:
     predictor = object.__new__(PredictClass)
     predictor.model_name = "RandomForest"
     predictor.model = _NoProbaModel()
 
-    with pytest.raises(ValueError, match="does not expose predict_proba"):
-        predictor._probability_mapping_for_features([[1.0, 2.0]])
-
-    with pytest.raises(ValueError, match="does not expose predict_proba"):
-        predictor._batch_probability_mappings_for_features([[1.0, 2.0]])
-
-    swapped = predictor._map_probabilities_to_labels(
-        classes=[0, 1],
-        probabilities=[0.1, 0.9],
-        predicted_label="Host",
-    )
-    assert swapped == {"Host": 0.9, "Virus": 0.1}
+    # Models without predict_proba report their label with probability one.
+    assert predictor._single_pass_probability_maps([[1.0, 2.0]]) == [
+        {"Host": 1.0, "Virus": 0.0}
+    ]
 
     with pytest.raises(ValueError, match="does not align"):
         predictor._map_probabilities_to_labels(classes=[0], probabilities=[0.2, 0.8])
@@ -0,0 +1,78 @@
+"""Tests for the prediction cache and its use in PredictClass.
+
+See binary_classifiers/prediction_cache.py.
+"""
+
+from binary_classifiers.predict_class import PredictClass
+from binary_classifiers.prediction_cache import PredictionCache, cache_key
+
+SEQUENCES = [
+    "ATGCGTACGTTAGCCGATAGCTAGGCTAACGTTAGCATGCGT",
+    "GGGCGGCGACCTCGCGGGTTTTCGCTATTTATGAAAATTTTCC",
+]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries() -> None:
+    clock = _Clock()
+    cache = PredictionCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats() == {
+        "size": 1,
+        "max_entries": 2,
+        "ttl_seconds": 10,
+        "hits": 1,
+        "misses": 2,
+        "evictions": 2,
+        "hit_rate": 1 / 3,
+    }
+
+
+def test_cache_key_normalises_sequence_and_includes_model_version() -> None:
+    key = cache_key("RandomForest", "v1", "ACGT")
+
+    assert cache_key("RandomForest", "v1", " acgt\n") == key
+    assert cache_key("RandomForest", "v2", "ACGT") != key
+    assert cache_key("SVM", "v1", "ACGT") != key
+
+
+def test_predict_class_serves_repeated_sequences_from_cache() -> None:
+    cache = PredictionCache()
+    predictor = PredictClass(model_name="RandomForest", cache=cache)
+    uncached = PredictClass(model_name="RandomForest")
+
+    first = predictor.predict_with_probabilities(SEQUENCES[0])
+    first.probabilities["Virus"] = -1.0  # callers get copies, not the cached map
+    batch = predictor.batch_predict_with_probabilities(SEQUENCES)
+
+    assert batch == uncached.batch_predict_with_probabilities(SEQUENCES)
+    assert predictor.predict_with_probabilities(SEQUENCES[0].lower()) == batch[0]
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+    assert predictor.artifact_version
+
+
+def test_reload_predictors_clears_shared_cache(monkeypatch) -> None:
+    from backend.app.services import classification as service
+
+    cache = PredictionCache()
+    monkeypatch.setattr(service, "prediction_cache", cache)
+    cache.put("key", {"Host": 0.5, "Virus": 0.5})
+
+    service.reload_predictors()
+
+    assert len(cache) == 0
@@ -113,6 +113,7 @@ def client(test_db):
 
     from backend.app.main import app
     from backend.app.database import get_db
+    from backend.app.services.classification_jobs import get_job_runner
 
     def override_get_db():
         db = test_db()
@@ -122,6 +123,9 @@ def client(test_db):
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    # A server runs the lifespan on its main thread, TestClient on another;
+    # create the job runner (and numba's threads) on this one first.
+    get_job_runner()
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
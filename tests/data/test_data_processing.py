@@ -1,7 +1,10 @@
 """Tests for data parsing utilities."""
 
+import gzip
+
 import pytest
 from data_processing.parsers import (
+    iter_sequence_records,
     parse_fasta_text,
     parse_fastq_content,
     parse_uploaded_file,
@@ -130,6 +133,59 @@ class TestUploadedFileParsing:
         assert parse_uploaded_file(uploaded) == []
 
 
+def _chunked(data, size):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+class TestIncrementalParsing:
+    """Test chunked FASTA/FASTQ parsing."""
+
+    FASTA = b">seq1 first\nATCGAT\ncgatcg\n\n>seq2\r\nGCTAGCTA\r\n>seq3\n"
+    FASTQ = b"@read1\nATCGATCG\n+\nIIIIIIII\n@read2\ngctagcta\n+\n@@@@@@@@\n@read3\nAC"
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 1024])
+    def test_fasta_matches_parse_fasta_text(self, size):
+        """Records do not depend on where chunks split the input."""
+        records = list(iter_sequence_records(_chunked(self.FASTA, size)))
+        assert records == parse_fasta_text(self.FASTA.decode().replace("\r", ""))
+        assert records[0] == ("seq1 first", "ATCGATCGATCG")
+
+    @pytest.mark.parametrize("size", [1, 5, 1024])
+    def test_fastq_matches_parse_fastq_content(self, size):
+        records = list(iter_sequence_records(_chunked(self.FASTQ, size)))
+        assert records == parse_fastq_content(self.FASTQ.decode())
+        assert records == [("read1", "ATCGATCG"), ("read2", "GCTAGCTA")]
+
+    def test_gzip_members_are_decompressed(self):
+        """Concatenated gzip members (as written by bgzip) are all read."""
+        data = gzip.compress(self.FASTA[:30]) + gzip.compress(self.FASTA[30:])
+        records = list(iter_sequence_records(_chunked(data, 16)))
+        assert records == list(iter_sequence_records([self.FASTA]))
+
+    def test_records_are_yielded_before_the_input_ends(self):
+        consumed = []
+
+        def chunks():
+            for chunk in _chunked(self.FASTA, 8):
+                consumed.append(chunk)
+                yield chunk
+
+        records = iter_sequence_records(chunks())
+        assert next(records)[0] == "seq1 first"
+        assert len(consumed) < len(list(_chunked(self.FASTA, 8)))
+
+    def test_empty_input_has_no_records(self):
+        assert list(iter_sequence_records([b"", b"\n\n"])) == []
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"ATCG\n", gzip.compress(b">seq1\nACGT\n")[:-10], b"\x1f\x8bnot gzip"],
+    )
+    def test_unparseable_input_raises(self, data):
+        with pytest.raises(ValueError):
+            list(iter_sequence_records([data]))
+
+
 class TestValidation:
     """Test input validation functions."""
 
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+
+from binary_classifiers import predict_class as predict_module
+from binary_classifiers.artifact_bundle import (
+    MANIFEST_FILE,
+    build_model_bundle,
+    load_bundle_entry,
+    save_bundle,
+)
+from binary_classifiers.compiled_forest import CompiledForest
+from binary_classifiers.compiled_svm import CompiledSVM
+from binary_classifiers.predict_class import MODEL_FILE_MAP, PredictClass
+
+BASE_DIR = Path(predict_module.__file__).resolve().parent
+SEQUENCES = [
+    "ATGCGTACGTTAGCCGATAGCTAGGCTAACGTTAGCATGCGT" * 3,
+    "GGGCGGCGACCTCGCGGGTTTTCGCTATTTATGAAAATTTTCC" * 2,
+    "ACGTNNACGT",
+]
+
+
+def _sources(model_name: str) -> tuple[Path, Path]:
+    model_file, vectorizer_file = MODEL_FILE_MAP[model_name]
+    return BASE_DIR / "models" / model_file, BASE_DIR / "transformers" / vectorizer_file
+
+
+@pytest.fixture
+def bundles(tmp_path, monkeypatch) -> Path:
+    for model_name in ("RandomForest", "SVM"):
+        model_path, vectorizer_path = _sources(model_name)
+        build_model_bundle(
+            joblib.load(model_path),
+            joblib.load(vectorizer_path),
+            tmp_path / f"{model_path.stem}.bundle",
+            sources=(model_path, vectorizer_path),
+        )
+    monkeypatch.setattr(
+        predict_module, "bundle_path", lambda path: tmp_path / f"{path.stem}.bundle"
+    )
+    return tmp_path
+
+
+def test_bundle_memory_maps_large_arrays_only(tmp_path) -> None:
+    entry = {"large": np.arange(1000), "small": np.arange(3), "labels": ["a"]}
+
+    save_bundle(tmp_path / "demo.bundle", {"entry": entry})
+    loaded = load_bundle_entry(tmp_path / "demo.bundle", "entry")
+
+    assert isinstance(loaded["large"], np.memmap)
+    assert not loaded["large"].flags.writeable
+    assert not isinstance(loaded["small"], np.memmap)
+    assert np.array_equal(loaded["large"], entry["large"])
+    assert loaded["labels"] == ["a"]
+
+
+def test_predict_class_serves_bundled_artifacts(bundles) -> None:
+    svm = PredictClass(model_name="SVM")
+    forest = PredictClass(model_name="RandomForest", backend="compiled")
+
+    assert isinstance(svm.model.support_vectors_.data, np.memmap)
+    assert isinstance(forest.model, CompiledForest)
+    assert isinstance(forest.model.threshold, np.memmap)
+    assert isinstance(forest.featurizer.column_lookup, np.memmap)
+    fast_svm = PredictClass(model_name="FastSVM")
+    assert isinstance(fast_svm.model, CompiledSVM)
+    assert isinstance(fast_svm.model.support_vectors_.data, np.memmap)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(predict_module, "bundle_path", lambda path: Path("/missing"))
+        for bundled in (svm, forest):
+            reference = PredictClass(model_name=bundled.model_name)
+            assert bundled.batch_predict_with_probabilities(
+                SEQUENCES
+            ) == reference.batch_predict_with_probabilities(SEQUENCES)
+
+
+def test_predict_class_ignores_stale_bundle(bundles) -> None:
+    model_path, _ = _sources("SVM")
+    manifest_path = bundles / f"{model_path.stem}.bundle" / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text())
+    manifest["sources"][model_path.name] = "retrained"
+    manifest_path.write_text(json.dumps(manifest))
+
+    predictor = PredictClass(model_name="SVM")
+
+    assert not isinstance(predictor.model.support_vectors_.data, np.memmap)
+
+
+def test_preload_predictors_loads_named_models(monkeypatch) -> None:
+    from backend.app.services import classification as service
+
+    predicted = []
+    monkeypatch.setattr(
+        predict_module.PredictClass,
+        "batch_predict",
+        lambda self, seqs: predicted.append(seqs),
+    )
+    service.get_predictor.cache_clear()
+    service.preload_predictors(["RandomForest"])
+
+    assert service.get_predictor.cache_info().currsize == 1
+    # Nothing runs before a fork unless asked to.
+    assert predicted == []
+    service.preload_predictors(["RandomForest"], warm_up=True)
+    assert predicted == [["ACGT" * 8]]
+    with pytest.raises(ValueError, match="PRELOAD_MODELS"):
+        service.preload_predictors(["Transformer"])
+    service.get_predictor.cache_clear()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.svm import SVC
+
+from binary_classifiers.compiled_forest import CompiledForest, compile_forest
+from binary_classifiers.predict_class import PredictClass
+
+_rng = random.Random(4)
+QUERY = [
+    "".join(_rng.choice("ACGTN") for _ in range(_rng.randint(0, 400)))
+    for _ in range(200)
+]
+
+
+def _sparse_dataset() -> tuple[sparse.csr_matrix, np.ndarray]:
+    rng = np.random.default_rng(0)
+    features = sparse.random(600, 80, density=0.1, format="csr", random_state=1)
+    return features * 10, rng.integers(0, 3, 600)
+
+
+@pytest.mark.parametrize(
+    "forest",
+    [
+        RandomForestClassifier(n_estimators=25, random_state=0, n_jobs=1),
+        RandomForestClassifier(
+            n_estimators=10, max_depth=4, class_weight="balanced", random_state=0
+        ),
+        ExtraTreesClassifier(n_estimators=15, min_samples_leaf=3, random_state=0),
+    ],
+)
+def test_compiled_forest_is_bit_identical_to_sklearn(forest) -> None:
+    features, labels = _sparse_dataset()
+    forest.fit(features, labels)
+
+    compiled = compile_forest(forest)
+
+    expected = forest.predict_proba(features)
+    assert np.array_equal(compiled.predict_proba(features), expected)
+    assert np.array_equal(compiled.predict_proba(features.toarray()), expected)
+    assert np.array_equal(compiled.predict(features), forest.predict(features))
+    assert np.array_equal(
+        compiled.apply(features) - compiled.roots, forest.apply(features)
+    )
+
+
+def test_compile_forest_rejects_other_models() -> None:
+    features, labels = _sparse_dataset()
+
+    with pytest.raises(ValueError, match="not a tree forest"):
+        compile_forest(SVC().fit(features, labels))
+
+    with pytest.raises(ValueError, match="features"):
+        compile_forest(
+            RandomForestClassifier(n_estimators=2).fit(features, labels)
+        ).predict_proba(features[:, :10])
+
+
+def test_anytime_forest_keeps_labels_and_full_probabilities() -> None:
+    features, labels = _sparse_dataset()
+    features = features[:, :40]
+    forest = RandomForestClassifier(n_estimators=30, random_state=0)
+    compiled = compile_forest(forest.fit(features, labels % 2))
+    expected = compiled.predict_proba(features)
+
+    probabilities, trees_used = compiled.predict_proba_anytime(features, block_size=5)
+
+    finished = trees_used == compiled.n_estimators
+    assert np.array_equal(probabilities[finished], expected[finished])
+    assert np.array_equal(probabilities.argmax(axis=1), expected.argmax(axis=1))
+    assert (~finished).any()
+    assert set(trees_used) <= set(range(5, 31, 5))
+    assert compile_forest(compiled) is compiled
+
+
+def test_anytime_forest_stops_at_confidence() -> None:
+    features, labels = _sparse_dataset()
+    compiled = compile_forest(
+        RandomForestClassifier(n_estimators=20, random_state=0).fit(features, labels)
+    )
+
+    _, strict = compiled.predict_proba_anytime(features, block_size=4)
+    probabilities, relaxed = compiled.predict_proba_anytime(
+        features, block_size=4, confidence=0.5
+    )
+
+    assert (relaxed <= strict).all() and relaxed.mean() < strict.mean()
+    stopped = relaxed < compiled.n_estimators
+    assert (probabilities[stopped].max(axis=1) >= 0.5).all()
+    with pytest.raises(ValueError, match="block_size"):
+        compiled.predict_proba_anytime(features, block_size=0)
+
+
+def test_predict_class_anytime_reports_trees_used() -> None:
+    predictor = PredictClass(model_name="RandomForest")
+    full = predictor.batch_predict_with_probabilities(QUERY)
+
+    anytime = predictor.batch_predict_anytime(QUERY, block_size=10)
+
+    assert [p.label for p in anytime] == [p.label for p in full]
+    for early, reference in zip(anytime, full):
+        assert early.trees_used is not None and 10 <= early.trees_used <= 100
+        if early.trees_used == 100:
+            assert early.probabilities == reference.probabilities
+    with pytest.raises(ValueError, match="not a tree forest"):
+        PredictClass(model_name="SVM").batch_predict_anytime(QUERY)
+
+
+def test_predict_class_compiled_backend_matches_sklearn_backend() -> None:
+    reference = PredictClass(model_name="RandomForest")
+    reference.model.n_jobs = 1  # sklearn's serial accumulation order
+    compiled = PredictClass(model_name="RandomForest", backend="compiled")
+
+    assert isinstance(compiled.model, CompiledForest)
+    assert compiled.batch_predict_with_probabilities(
+        QUERY
+    ) == reference.batch_predict_with_probabilities(QUERY)
+    assert compiled.batch_predict(QUERY) == reference.batch_predict(QUERY)
+
+
+def test_predict_class_backend_is_validated_and_skipped_for_svm() -> None:
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        PredictClass(model_name="RandomForest", backend="onnx")  # type: ignore[arg-type]
+
+    assert isinstance(PredictClass(model_name="SVM", backend="compiled").model, SVC)
+
+
+def test_compact_forest_routes_identically() -> None:
+    features, labels = _sparse_dataset()
+    forest = RandomForestClassifier(n_estimators=25, random_state=0).fit(
+        features, labels
+    )
+    compiled = compile_forest(forest)
+
+    compact = compiled.compact()
+
+    assert compact.threshold.dtype == np.float32 and compact.left.dtype == np.int32
+    assert compact.compact() is compact
+    assert np.array_equal(compact.apply(features), compiled.apply(features))
+    assert np.allclose(
+        compact.predict_proba(features), compiled.predict_proba(features), atol=1e-6
+    )
+
+
+def test_predict_class_float32_precision_matches_float64() -> None:
+    reference = PredictClass(model_name="RandomForest", backend="compiled")
+    compact = PredictClass(
+        model_name="RandomForest", backend="compiled", precision="float32"
+    )
+
+    assert compact.model.is_compact and compact.float32_features
+    assert compact._preprocess_batch(QUERY).dtype == np.float32
+    for got, want in zip(
+        compact.batch_predict_with_probabilities(QUERY),
+        reference.batch_predict_with_probabilities(QUERY),
+    ):
+        assert got.label == want.label
+        assert abs(got.probabilities["Virus"] - want.probabilities["Virus"]) < 1e-6
+    # sklearn's SVC would upcast float32 input, so it keeps float64 features.
+    svm = PredictClass(model_name="SVM", precision="float32")
+    assert not svm.float32_features
+    with pytest.raises(ValueError, match="Unsupported precision"):
+        PredictClass(model_name="SVM", precision="float16")  # type: ignore[arg-type]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.svm import SVC
+
+from binary_classifiers.compiled_svm import CompiledSVM, compile_svm
+from binary_classifiers.predict_class import PredictClass
+
+_rng = random.Random(6)
+QUERY = [
+    "".join(_rng.choice("ACGTN") for _ in range(_rng.randint(0, 600)))
+    for _ in range(150)
+]
+
+
+def _sparse_dataset(n_classes: int = 2) -> tuple[sparse.csr_matrix, np.ndarray]:
+    rng = np.random.default_rng(0)
+    features = sparse.random(400, 50, density=0.2, format="csr", random_state=2)
+    return features * 3, rng.integers(0, n_classes, 400)
+
+
+@pytest.mark.parametrize("kernel", ["rbf", "linear", "poly", "sigmoid"])
+def test_compiled_svm_matches_sklearn(kernel) -> None:
+    features, labels = _sparse_dataset()
+    model = SVC(kernel=kernel, gamma=0.1, probability=True, random_state=0)
+    model.fit(features, labels)
+
+    compiled = compile_svm(model)
+
+    expected = model.predict_proba(features)
+    assert np.abs(compiled.predict_proba(features) - expected).max() < 1e-9
+    assert np.abs(compiled.predict_proba(features.toarray()) - expected).max() < 1e-9
+    assert np.allclose(
+        compiled.decision_function(features), model.decision_function(features)
+    )
+    assert np.array_equal(compiled.predict(features), model.predict(features))
+
+
+def test_compile_svm_rejects_unsupported_models() -> None:
+    features, labels = _sparse_dataset()
+
+    with pytest.raises(ValueError, match="not a fitted SVM"):
+        compile_svm(RandomForestClassifier(n_estimators=2).fit(features, labels))
+    with pytest.raises(ValueError, match="probability=True"):
+        compile_svm(SVC().fit(features, labels))
+    with pytest.raises(ValueError, match="binary"):
+        compile_svm(SVC(probability=True).fit(*_sparse_dataset(n_classes=3)))
+
+
+def test_fast_svm_model_name_matches_svm() -> None:
+    fast = PredictClass(model_name="FastSVM")
+    reference = PredictClass(model_name="SVM")
+
+    assert isinstance(fast.model, CompiledSVM)
+    assert fast.batch_predict(QUERY) == reference.batch_predict(QUERY)
+    for got, want in zip(
+        fast.batch_predict_with_probabilities(QUERY),
+        reference.batch_predict_with_probabilities(QUERY),
+    ):
+        assert got.label == want.label
+        assert abs(got.probabilities["Virus"] - want.probabilities["Virus"]) < 1e-9
+
+
+def test_compact_svm_probabilities_match_float64() -> None:
+    features, labels = _sparse_dataset()
+    model = SVC(gamma=0.1, probability=True, random_state=0).fit(features, labels)
+    compiled = compile_svm(model)
+
+    compact = compiled.compact()
+
+    assert compact.support_vectors_.dtype == np.float32
+    assert np.array_equal(compact.predict(features), compiled.predict(features))
+    assert (
+        np.abs(compact.predict_proba(features) - compiled.predict_proba(features)).max()
+        < 1e-5
+    )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from binary_classifiers.ensemble import EnsemblePredictor, featurization_key
+from binary_classifiers.predict_class import PredictClass
+
+SEQUENCES = [
+    "ATGCGTACGTTAGCCGATAGCTAGGCTAACGTTAGCATGCGT" * 3,
+    "GGGCGGCGACCTCGCGGGTTTTCGCTATTTATGAAAATTTTCC" * 2,
+    "ACGTNNACGT",
+]
+
+
+@pytest.fixture(scope="module")
+def members() -> list[PredictClass]:
+    return [PredictClass(model_name="RandomForest"), PredictClass(model_name="SVM")]
+
+
+def test_ensemble_featurizes_shared_vocabulary_once(members, monkeypatch) -> None:
+    ensemble = EnsemblePredictor(members)
+    calls = []
+    for member in members:
+        original = member._preprocess_batch
+        monkeypatch.setattr(
+            member,
+            "_preprocess_batch",
+            lambda sequences, original=original: calls.append(1) or original(sequences),
+        )
+
+    ensemble.batch_predict_with_probabilities(SEQUENCES)
+
+    assert featurization_key(members[0]) == featurization_key(members[1])
+    assert len(ensemble.groups) == 1
+    assert len(calls) == 1
+    ensemble.close()
+
+
+def test_ensemble_combines_weighted_probabilities(members) -> None:
+    ensemble = EnsemblePredictor(members, weights=[3, 1])
+    forest, svm = (
+        member.batch_predict_with_probabilities(SEQUENCES) for member in members
+    )
+
+    predictions = ensemble.batch_predict_with_probabilities(SEQUENCES)
+
+    for combined, rf, sv in zip(predictions, forest, svm):
+        virus = 0.75 * rf.probabilities["Virus"] + 0.25 * sv.probabilities["Virus"]
+        assert combined.probabilities["Virus"] == pytest.approx(virus)
+        assert combined.label == ("Virus" if virus > 0.5 else "Host")
+    assert ensemble.batch_predict_with_confidence(SEQUENCES) == [
+        (prediction.label, prediction.confidence) for prediction in predictions
+    ]
+    ensemble.close()
+
+
+def test_ensemble_window_probabilities_match_members(members) -> None:
+    ensemble = EnsemblePredictor(members)
+    sequence = SEQUENCES[0] * 4
+
+    windows = ensemble.predict_window_probabilities(sequence, 100, 60)
+    member_windows = [
+        member.predict_window_probabilities(sequence, 100, 60) for member in members
+    ]
+
+    assert [(start, end) for start, end, _ in windows] == [
+        (start, end) for start, end, _ in member_windows[0]
+    ]
+    for (_, _, combined), (_, _, rf), (_, _, sv) in zip(windows, *member_windows):
+        assert combined["Virus"] == pytest.approx((rf["Virus"] + sv["Virus"]) / 2)
+    ensemble.close()
+
+
+def test_ensemble_rejects_invalid_weights(members) -> None:
+    with pytest.raises(ValueError, match="weights for 2"):
+        EnsemblePredictor(members, weights=[1.0])
+    with pytest.raises(ValueError, match="non-negative"):
+        EnsemblePredictor(members, weights=[1.0, -1.0])
+    with pytest.raises(ValueError, match="at least one"):
+        EnsemblePredictor([])
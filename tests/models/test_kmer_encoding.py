@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from binary_classifiers.transformers import kmer_kernels
+from binary_classifiers.transformers.kmer_encoding import (
+    batch_kmer_codes,
+    code_to_kmer,
+    kmer_codes,
+    kmer_count_matrix,
+    kmer_to_code,
+    sparse_kmer_counts,
+    spectrum_count_matrix,
+    spectrum_offsets,
+    stream_kmer_counts,
+    window_kmer_counts,
+    window_starts,
+)
+from binary_classifiers.transformers.kmers_transformer import KmerTransformer
+
+
+def _random_sequences(count: int, alphabet: str = "ACGTNRYacgtn") -> list[str]:
+    rng = random.Random(7)
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+        for _ in range(count)
+    ]
+
+
+def test_kmer_code_round_trip() -> None:
+    assert kmer_to_code("AAA") == 0
+    assert kmer_to_code("acgt") == 0b00011011
+    assert kmer_to_code("ACNT") is None
+    assert code_to_kmer(0b00011011, 4) == "ACGT"
+
+
+def test_kmer_codes_drop_n_and_break_on_iupac() -> None:
+    # N is removed before windowing (bases are joined); R breaks the window.
+    assert [code_to_kmer(c, 3) for c in kmer_codes("ACNGTRACG", k=3)] == [
+        "ACG",
+        "CGT",
+        "ACG",
+    ]
+
+
+def test_batch_codes_do_not_cross_sequence_boundaries() -> None:
+    codes, rows = batch_kmer_codes(["ACG", "T", "GTA"], k=3)
+
+    assert [code_to_kmer(c, 3) for c in codes] == ["ACG", "GTA"]
+    assert rows.tolist() == [0, 2]
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def engine(request, monkeypatch) -> str:
+    if request.param == "numba" and not kmer_kernels.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    if request.param == "numpy":
+        monkeypatch.setattr(kmer_kernels, "NUMBA_AVAILABLE", False)
+    return request.param
+
+
+def test_count_matrix_matches_count_vectorizer_output(engine: str) -> None:
+    sequences = _random_sequences(200)
+    transformer = KmerTransformer(k=4)
+    vectorizer = CountVectorizer(
+        vocabulary=[code_to_kmer(code, 4).lower() for code in range(4**4)]
+    )
+    expected = vectorizer.transform(transformer.transform(sequences))
+
+    actual = kmer_count_matrix(sequences, k=4)
+
+    assert actual.shape == expected.shape
+    assert actual.dtype == expected.dtype
+    assert (actual != expected).nnz == 0
+    assert np.array_equal(actual.indices, expected.indices)
+    assert (transformer.count_matrix(sequences) != expected).nnz == 0
+
+
+def test_column_lookup_remaps_and_drops_codes(engine: str) -> None:
+    lookup = np.full(4**2, -1, dtype=np.int32)
+    lookup[kmer_to_code("AC")] = 1
+    lookup[kmer_to_code("GT")] = 0
+
+    counts = sparse_kmer_counts(
+        ["ACGTAC", "TTNAC", "ARC"], k=2, column_lookup=lookup, n_columns=2
+    )
+
+    assert counts.toarray().tolist() == [[1, 2], [0, 1], [0, 0]]
+
+
+@pytest.mark.parametrize("canonical", [False, True])
+def test_spectrum_matches_stacked_single_k_matrices(engine: str, canonical) -> None:
+    sequences = _random_sequences(200)
+    expected = sparse.hstack(
+        [kmer_count_matrix(sequences, k, canonical=canonical) for k in (2, 4, 3)]
+    ).tocsr()
+
+    actual = spectrum_count_matrix(sequences, (2, 4, 3), canonical=canonical)
+
+    assert actual.shape[1] == spectrum_offsets((2, 4, 3), canonical)[-1]
+    assert (actual != expected).nnz == 0
+    assert np.array_equal(actual.indices, expected.indices)
+
+
+def test_counts_from_several_threads_match_serial_counts(engine: str) -> None:
+    batches = [_random_sequences(50 + index) for index in range(8)]
+    expected = [spectrum_count_matrix(batch, (2, 3, 4)) for batch in batches]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        actual = list(
+            executor.map(lambda batch: spectrum_count_matrix(batch, (2, 3, 4)), batches)
+        )
+
+    assert all((a != e).nnz == 0 for a, e in zip(actual, expected))
+
+
+def test_launches_are_serialised_unless_the_layer_is_threadsafe(monkeypatch) -> None:
+    if not kmer_kernels.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(kmer_kernels.numba, "threading_layer", lambda: "workqueue")
+    monkeypatch.setattr(kmer_kernels, "_concurrent_launches", False)
+    lock = threading.Lock()
+    running, most_running = [0], [0]
+
+    def kernel() -> None:
+        with lock:
+            running[0] += 1
+            most_running[0] = max(most_running[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    launch = kmer_kernels._one_at_a_time(kernel)
+    threads = [threading.Thread(target=launch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert most_running[0] == 1
+    assert not kmer_kernels._concurrent_launches
+
+
+@pytest.mark.parametrize("sequences", [["ACGT"], ["AC", "G"], ["NNA", ""], []])
+@pytest.mark.parametrize("canonical", [False, True])
+def test_spectrum_of_inputs_shorter_than_k(monkeypatch, sequences, canonical) -> None:
+    expected = sparse.hstack(
+        [kmer_count_matrix(sequences, k, canonical=canonical) for k in (4, 5, 6)]
+    ).tocsr()
+    compiled = spectrum_count_matrix(sequences, (4, 5, 6), canonical=canonical)
+    monkeypatch.setattr(kmer_kernels, "NUMBA_AVAILABLE", False)
+
+    fallback = spectrum_count_matrix(sequences, (4, 5, 6), canonical=canonical)
+
+    assert fallback.shape == compiled.shape == expected.shape
+    assert (compiled != expected).nnz == 0
+    assert (fallback != expected).nnz == 0
+
+
+def test_spectrum_rejects_repeated_k() -> None:
+    with pytest.raises(ValueError, match="distinct"):
+        spectrum_offsets((4, 4))
+
+
+@pytest.mark.parametrize("canonical", [False, True])
+def test_long_sequences_are_streamed_in_chunks(engine: str, canonical) -> None:
+    sequences = _random_sequences(100)
+    expected = sparse_kmer_counts(sequences, 4, canonical=canonical)
+
+    # Tiny chunks force most rows through the streaming counter, with N runs,
+    # IUPAC codes and k-mers straddling chunk boundaries.
+    for chunk_size in (1, 3, 50):
+        actual = sparse_kmer_counts(
+            sequences, 4, canonical=canonical, chunk_size=chunk_size
+        )
+        assert actual.dtype == expected.dtype
+        assert (actual != expected).nnz == 0
+
+    spectrum = spectrum_count_matrix(sequences, (2, 4), canonical, chunk_size=5)
+    assert (spectrum != spectrum_count_matrix(sequences, (2, 4), canonical)).nnz == 0
+
+
+def test_stream_counts_accept_sequence_pieces() -> None:
+    pieces = ["ACG", "TNA", "C", "", "GTR", "ACGT"]
+
+    counts = stream_kmer_counts(iter(pieces), k=3)
+
+    expected = kmer_count_matrix(["".join(pieces)], k=3).toarray()[0]
+    assert counts.dtype == np.int64
+    assert np.array_equal(counts, expected)
+
+
+def test_window_starts_cover_the_sequence() -> None:
+    assert window_starts(10, window=4, stride=3).tolist() == [0, 3, 6]
+    assert window_starts(11, window=4, stride=3).tolist() == [0, 3, 6, 9]
+    assert window_starts(3, window=4, stride=3).tolist() == [0]
+
+
+@pytest.mark.parametrize("canonical", [False, True])
+def test_window_counts_match_recounting_each_window(engine: str, canonical) -> None:
+    sequence = "".join(_random_sequences(20))
+    starts = window_starts(len(sequence), window=37, stride=11)
+    expected = sparse_kmer_counts(
+        [sequence[start : start + 37] for start in starts], 3, canonical=canonical
+    )
+
+    # A small chunk size splits the windows into several blocks.
+    actual = window_kmer_counts(
+        sequence, 3, window=37, stride=11, canonical=canonical, chunk_size=100
+    )
+
+    assert actual.shape == expected.shape
+    assert (actual != expected).nnz == 0
+    assert np.array_equal(actual.indices, expected.indices)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from binary_classifiers.artifacts import check_kmer_compatibility, tag_kmer_params
+from binary_classifiers.predict_class import PredictClass
+from binary_classifiers.transformers.kmer_featurizer import KmerFeaturizer
+from binary_classifiers.transformers.kmers_transformer import (
+    KmerTransformer,
+    MultiKmerTransformer,
+)
+
+
+def _random_sequences(count: int, alphabet: str, seed: int = 3) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        for _ in range(count)
+    ]
+
+
+TRAIN = _random_sequences(40, "ACGT", seed=1)
+QUERY = _random_sequences(150, "ACGTNRYacgtn", seed=2) + ["", "ACG"]
+
+
+@pytest.mark.parametrize(
+    "vectorizer",
+    [
+        CountVectorizer(),
+        CountVectorizer(binary=True),
+        TfidfVectorizer(analyzer="word", token_pattern=r"\S+", lowercase=False),
+        TfidfVectorizer(sublinear_tf=True, norm="l1", use_idf=False),
+    ],
+)
+def test_featurizer_matches_vectorizer_transform(vectorizer) -> None:
+    transformer = KmerTransformer(k=4)
+    vectorizer.fit(transformer.transform(TRAIN))
+
+    featurizer = KmerFeaturizer.from_vectorizer(vectorizer, k=4)
+    assert featurizer is not None
+
+    expected = vectorizer.transform(transformer.transform(QUERY))
+    actual = featurizer.transform(QUERY)
+
+    assert actual.shape == expected.shape
+    assert actual.dtype == expected.dtype
+    assert np.array_equal(actual.indptr, expected.indptr)
+    assert np.array_equal(actual.indices, expected.indices)
+    assert np.array_equal(actual.data, expected.data)
+
+
+def test_canonical_featurizer_matches_canonical_text_path() -> None:
+    transformer = KmerTransformer(k=4, canonical=True)
+    vectorizer = CountVectorizer().fit(transformer.transform(TRAIN))
+
+    featurizer = KmerFeaturizer.from_vectorizer(vectorizer, k=4, canonical=True)
+    assert featurizer is not None
+
+    expected = vectorizer.transform(transformer.transform(QUERY))
+    actual = featurizer.transform(QUERY)
+
+    assert np.array_equal(actual.indptr, expected.indptr)
+    assert np.array_equal(actual.indices, expected.indices)
+    assert np.array_equal(actual.data, expected.data)
+
+
+def test_compatibility_check_rejects_mismatched_kmer_settings() -> None:
+    canonical = CountVectorizer().fit(
+        KmerTransformer(k=4, canonical=True).transform(TRAIN)
+    )
+    plain = CountVectorizer().fit(KmerTransformer(k=4).transform(TRAIN))
+
+    class Model:
+        n_features_in_ = len(canonical.vocabulary_)
+
+    model = Model()
+    tag_kmer_params(model, k=4, canonical=True)
+    tag_kmer_params(canonical, k=4, canonical=True)
+    tag_kmer_params(plain, k=4, canonical=False)
+
+    assert check_kmer_compatibility(model, canonical) == {"k": 4, "canonical": True}
+    with pytest.raises(ValueError, match="k-mer settings"):
+        check_kmer_compatibility(model, plain)
+
+    # A vectorizer mislabelled as canonical is caught by its vocabulary.
+    tag_kmer_params(plain, k=4, canonical=True)
+    with pytest.raises(ValueError, match="non-canonical"):
+        check_kmer_compatibility(model, plain)
+
+
+def test_featurizer_rejects_vocabularies_it_cannot_reproduce() -> None:
+    transformer = KmerTransformer(k=4)
+    iupac = CountVectorizer().fit(transformer.transform(["ACGTRACGTA"]))
+    bigrams = CountVectorizer(ngram_range=(1, 2)).fit(
+        transformer.transform(["ACGTACGTA"])
+    )
+
+    assert KmerFeaturizer.from_vectorizer(iupac, k=4) is None
+    assert KmerFeaturizer.from_vectorizer(bigrams, k=4) is None
+    assert KmerFeaturizer.from_vectorizer(object(), k=4) is None
+
+
+def test_predict_class_compiles_featurizer_for_saved_vectorizer() -> None:
+    predictor = PredictClass(model_name="RandomForest")
+    assert predictor.featurizer is not None
+    assert predictor.kmer_tranformer is not None
+
+    kmers = predictor.kmer_tranformer.transform(QUERY)
+    expected = predictor.vectorizer.transform(kmers)
+
+    assert (predictor._preprocess_batch(QUERY) != expected).nnz == 0
+
+
+def test_predict_class_window_probabilities_match_window_batch() -> None:
+    predictor = PredictClass(model_name="RandomForest")
+    sequence = "".join(_random_sequences(30, "ACGTN", seed=5))
+
+    windows = predictor.predict_window_probabilities(sequence, window=200, stride=75)
+
+    starts = [start for start, _, _ in windows]
+    assert starts == list(range(0, len(sequence) - 200 + 75, 75))[: len(starts)]
+    assert windows[-1][1] == len(sequence)
+    expected = predictor.batch_predict_with_probabilities(
+        [sequence[start : start + 200] for start in starts]
+    )
+    assert [probabilities for _, _, probabilities in windows] == [
+        prediction.probabilities for prediction in expected
+    ]
+
+
+def test_predict_class_uses_stored_spectrum_layout(monkeypatch) -> None:
+    spectrum = MultiKmerTransformer(ks=(3, 4)).fit()
+    X = spectrum.transform(TRAIN)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(
+        X, [index % 2 for index in range(len(TRAIN))]
+    )
+    for artifact in (model, spectrum):
+        tag_kmer_params(artifact, k=[3, 4])
+    artifacts = iter([model, spectrum])
+    monkeypatch.setattr(
+        "binary_classifiers.predict_class.joblib.load", lambda path: next(artifacts)
+    )
+
+    predictor = PredictClass(model_name="RandomForest")
+
+    assert predictor.featurizer is spectrum
+    assert predictor.batch_predict(QUERY) == [
+        "Virus" if label else "Host"
+        for label in model.predict(spectrum.transform(QUERY))
+    ]
+
+    spectrum.column_offsets_ = spectrum.column_offsets_ + 1
+    with pytest.raises(ValueError, match="column offsets"):
+        check_kmer_compatibility(model, spectrum)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pickle
+
 import pandas as pd
 
 from binary_classifiers.transformers.kmers_transformer import KmerTransformer
@@ -13,3 +15,13 @@ def test_kmer_transformer_handles_series_and_fit_returns_self() -> None:
     result = transformer.transform(pd.Series(["ATGN"]))
 
     assert result.tolist() == ["ATG"]
+
+
+def test_kmer_transformer_pickled_before_canonical_still_transforms() -> None:
+    old = KmerTransformer(k=3)
+    del old.canonical  # as pickled before the ``canonical`` parameter existed
+    restored = pickle.loads(pickle.dumps(old))
+
+    assert restored.canonical is False
+    assert restored.get_params() == {"k": 3, "canonical": False}
+    assert restored.transform(["ATGC"]) == ["ATG TGC"]
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import json
+import random
 
+import joblib
+import numpy as np
 import pytest
 import yaml
 
+from binary_classifiers.artifacts import check_kmer_compatibility
 from metaseq import train
+from metaseq.models import build_student
 
 
 def test_ensure_dir_creates_parent_directory(tmp_path) -> None:
@@ -131,3 +136,71 @@ def test_train_from_config_runs_pipeline_and_saves_model(monkeypatch, tmp_path)
     assert stats["n_train"] == 2
     assert stats["n_val"] == 2
     assert stats["report"]["accuracy"] == 0.5
+
+
+def test_augment_reads_windows_and_mutates() -> None:
+    sequences = ["A" * 300, "C" * 40]
+
+    reads = train.augment_reads(
+        sequences, copies=3, read_length=100, substitution_rate=0.1, random_state=0
+    )
+
+    assert [len(read) for read in reads] == [100] * 3 + [40] * 3
+    assert all(read.count("A") < 100 for read in reads[:3])
+    assert reads == train.augment_reads(
+        sequences, copies=3, read_length=100, substitution_rate=0.1, random_state=0
+    )
+
+
+def test_fit_soft_labels_follows_teacher_probabilities() -> None:
+    student, vectorizer = build_student("logistic", {"k": 2, "C": 100.0})
+    sequences = ["ACACACACAC", "GTGTGTGTGT", "AAAAAAAAAA", "CCCCCCCCCC"]
+    soft = np.array([0.9, 0.8, 0.2, 0.1])
+
+    train.fit_soft_labels(student, vectorizer.transform(sequences), soft)
+
+    predicted = student.predict_proba(vectorizer.transform(sequences))[:, 1]
+    assert np.argsort(predicted).tolist() == np.argsort(soft).tolist()
+    assert np.abs(predicted - soft).max() < 0.1
+
+
+def test_distill_from_config_saves_servable_student(tmp_path) -> None:
+    rng = random.Random(0)
+    rows = [
+        ("".join(rng.choice("ACGT") for _ in range(200)), label)
+        for label in (0, 1)
+        for _ in range(20)
+    ]
+    csv_path = tmp_path / "train.csv"
+    csv_path.write_text(
+        "sequence,label\n" + "".join(f"{s},{label}\n" for s, label in rows),
+        encoding="utf-8",
+    )
+    config_path = tmp_path / "distill.yml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "data": {"csv": str(csv_path)},
+                "distill": {
+                    "student": {"name": "gbt", "params": {"k": 3, "n_estimators": 5}},
+                    "augment": {"copies": 1, "read_length": 120},
+                    "latency_reads": 3,
+                },
+                "train": {"test_size": 0.25},
+                "output": {
+                    "model_path": str(tmp_path / "student.pkl"),
+                    "vectorizer_path": str(tmp_path / "student_vectorizer.pkl"),
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    stats = train.distill_from_config(str(config_path))
+
+    assert stats["n_distill"] == 60 and stats["n_val"] == 10
+    assert 0.0 <= stats["agreement"] <= 1.0
+    assert stats["student_per_read_ms"] > 0 and stats["teacher_per_read_ms"] > 0
+    model = joblib.load(stats["model_path"])
+    vectorizer = joblib.load(stats["vectorizer_path"])
+    assert check_kmer_compatibility(model, vectorizer) == {"k": 3, "canonical": False}
@@ -1,4 +1,21 @@
-from metaseq.models import build_pipeline
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from binary_classifiers.artifacts import tag_kmer_params
+from binary_classifiers.feature_selection import restrict_vocabulary, select_columns
+from binary_classifiers.predict_class import MODEL_FILE_MAP, PredictClass
+from binary_classifiers.transformers.kmer_encoding import kmer_to_code
+from binary_classifiers.transformers.kmers_transformer import MultiKmerTransformer
+from metaseq.models import (
+    KmerTransformer,
+    build_kernel_approximation_svm,
+    build_pipeline,
+    partial_fit_pipeline,
+)
 
 TOY_X = [
     "ACGTACGTACGT",
@@ -27,3 +44,147 @@ def test_rf_pipeline():
 
 def test_mlp_pipeline():
     _fit_and_predict("mlp")
+
+
+def test_naive_bayes_pipeline():
+    _fit_and_predict("naive_bayes")
+
+
+@pytest.mark.parametrize("name", ["approx_svm", "rff_svm"])
+def test_kernel_approximation_svm_pipeline(name):
+    model = build_pipeline(
+        name, {"k": 3, "n_components": 4, "calibration_cv": 2, "random_state": 0}
+    )
+    model.fit(TOY_X, TOY_Y)
+
+    probabilities = model.predict_proba(TOY_X)
+    assert probabilities.shape == (len(TOY_X), 2)
+    assert np.allclose(probabilities.sum(axis=1), 1.0)
+    assert len(model.predict(TOY_X)) == len(TOY_X)
+
+
+def test_kernel_approximation_svm_rejects_unknown_approximation():
+    with pytest.raises(ValueError, match="kernel approximation"):
+        build_kernel_approximation_svm("fastfood")
+
+
+def test_naive_bayes_partial_fit_matches_full_fit():
+    full = build_pipeline("naive_bayes", {"k": 3}).fit(TOY_X, TOY_Y)
+    incremental = build_pipeline("nb", {"k": 3})
+
+    partial_fit_pipeline(incremental, TOY_X[:2], TOY_Y[:2], classes=[0, 1])
+    partial_fit_pipeline(incremental, TOY_X[2:], TOY_Y[2:])
+
+    assert full.steps[-1][1].feature_log_prob_.shape == (2, 4**3)
+    assert np.array_equal(
+        incremental.steps[-1][1].feature_count_, full.steps[-1][1].feature_count_
+    )
+    assert np.allclose(incremental.predict_proba(TOY_X), full.predict_proba(TOY_X))
+
+
+def test_predict_class_serves_naive_bayes_artifact(tmp_path, monkeypatch):
+    vectorizer = MultiKmerTransformer(ks=(6,)).fit()
+    model = MultinomialNB().fit(vectorizer.transform(TOY_X * 3), TOY_Y * 3)
+    paths = (tmp_path / "nb_model.pkl", tmp_path / "nb_vectorizer.pkl")
+    for artifact, path in zip((model, vectorizer), paths):
+        tag_kmer_params(artifact, 6)
+        joblib.dump(artifact, path)
+    monkeypatch.setitem(MODEL_FILE_MAP, "NaiveBayes", tuple(map(str, paths)))
+
+    predictor = PredictClass(model_name="NaiveBayes")
+
+    assert paths[0].stat().st_size < 200_000
+    assert predictor.batch_predict(TOY_X) == ["Virus", "Host", "Virus", "Host"]
+
+
+def test_kmer_transformer_count_matrix_matches_text_path():
+    transformer = KmerTransformer(k=3)
+    vectorizer = CountVectorizer(analyzer=str.split).fit(transformer.transform(TOY_X))
+    expected = vectorizer.transform(transformer.transform(TOY_X)).toarray()
+
+    columns = [kmer_to_code(kmer) for kmer in vectorizer.get_feature_names_out()]
+    counts = transformer.count_matrix(TOY_X).toarray()
+
+    assert (counts[:, columns] == expected).all()
+
+
+def test_kmer_transformer_pickled_before_canonical_still_transforms(tmp_path):
+    old = KmerTransformer(k=3)
+    del old.canonical  # as pickled before the ``canonical`` parameter existed
+    joblib.dump(old, tmp_path / "kmers.pkl")
+    restored = joblib.load(tmp_path / "kmers.pkl")
+
+    assert restored.canonical is False
+    assert restored.transform(["ATGC"]) == ["ATG TGC"]
+
+
+def test_canonical_pipeline_shares_reverse_complement_features():
+    pipe = build_pipeline("rf", {"k": 4, "canonical": True, "n_estimators": 5})
+    X = ["AAAACCCCGGGGTTTT", "TTTTGGGGCCCCAAAA", "ACGTACGTAAAA", "GATTACAGATTACA"]
+    pipe.fit(X, [0, 1, 0, 1])
+
+    vocabulary = pipe.named_steps["tfidf"].vocabulary_
+    assert "AAAA" in vocabulary and "TTTT" not in vocabulary
+    assert pipe.named_steps["clf"].n_estimators == 5
+
+
+def test_multi_k_pipeline_uses_spectrum_features():
+    pipe = build_pipeline("rf", {"k": [2, 3], "n_estimators": 5})
+    pipe.fit(TOY_X, TOY_Y)
+
+    assert pipe.named_steps["kmers"].column_offsets_.tolist() == [0, 16, 80]
+    assert pipe.named_steps["clf"].n_features_in_ == 80
+    assert len(pipe.predict(TOY_X)) == len(TOY_X)
+
+
+@pytest.mark.parametrize("method", ["chi2", "mutual_info", "l1"])
+def test_pipeline_selection_step_keeps_n_features(method):
+    pipe = build_pipeline(
+        "rf", {"k": 3, "select": method, "n_features": 5, "n_estimators": 5}
+    )
+    pipe.fit(TOY_X * 2, TOY_Y * 2)
+
+    assert pipe.named_steps["select"].get_support().sum() == 5
+    assert pipe.named_steps["clf"].n_features_in_ == 5
+    assert len(pipe.predict(TOY_X)) == len(TOY_X)
+
+
+@pytest.mark.parametrize("vectorizer", [CountVectorizer(), TfidfVectorizer(norm=None)])
+def test_restrict_vocabulary_matches_column_slice(vectorizer):
+    documents = KmerTransformer(k=3).transform(TOY_X)
+    vectorizer.fit(documents)
+    full = vectorizer.transform(documents).toarray()
+    columns = select_columns(full, TOY_Y, "chi2", n_features=4)
+
+    restrict_vocabulary(vectorizer, columns, method="chi2")
+
+    assert len(vectorizer.vocabulary_) == 4
+    assert np.allclose(vectorizer.transform(documents).toarray(), full[:, columns])
+    with pytest.raises(ValueError, match="Columns must lie"):
+        restrict_vocabulary(vectorizer, [10])
+
+
+def test_predict_class_counts_only_selected_kmers(tmp_path, monkeypatch):
+    transformer = KmerTransformer(k=6)
+    documents = transformer.transform(TOY_X * 3)
+    vectorizer = CountVectorizer().fit(documents)
+    X = vectorizer.transform(documents)
+    columns = select_columns(X, TOY_Y * 3, "chi2", n_features=6)
+    restrict_vocabulary(vectorizer, columns, method="chi2")
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(
+        X[:, columns], TOY_Y * 3
+    )
+    paths = (tmp_path / "rf_model.pkl", tmp_path / "rf_vectorizer.pkl")
+    for artifact, path in zip((model, vectorizer), paths):
+        tag_kmer_params(artifact, 6)
+        joblib.dump(artifact, path)
+    monkeypatch.setitem(MODEL_FILE_MAP, "RandomForest", tuple(map(str, paths)))
+
+    predictor = PredictClass(model_name="RandomForest")
+
+    assert predictor.featurizer.n_features == 6
+    assert (predictor.featurizer.column_lookup >= 0).sum() == 6
+    expected = model.predict_proba(vectorizer.transform(transformer.transform(TOY_X)))
+    got = [p.probabilities for p in predictor.batch_predict_with_probabilities(TOY_X)]
+    for row, probabilities in zip(expected, got):
+        assert probabilities["Virus"] == pytest.approx(row[1])